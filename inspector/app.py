@@ -2,7 +2,9 @@ from textual.app import App, ComposeResult
 from textual.containers import Container
 
 from inspector.config import ConnectionConfig
-from inspector.db.database import DatabaseProvider, QueryRow
+from inspector.db.database import DatabaseProvider
+from inspector.tui.screens.activity_monitor import ActivityMonitorScreen
+from inspector.tui.screens.pool_stats import PoolStatsScreen
 from inspector.tui.screens.schema_browser import SchemaBrowserScreen
 
 
@@ -16,7 +18,7 @@ class PgInspectorApp(App[None]):
         width: 30%;
         min-width: 20;
         height: 100%;
-        border-right: solid primary;
+        border-right: solid $primary;
     }
     #content-panel {
         width: 1fr;
@@ -36,6 +38,11 @@ class PgInspectorApp(App[None]):
     }
     """
 
+    BINDINGS = [
+        ("f2", "pool_stats", "Pool"),
+        ("f3", "activity", "Activity"),
+    ]
+
     def __init__(
         self,
         config: ConnectionConfig,
@@ -48,7 +55,6 @@ class PgInspectorApp(App[None]):
         self._current_table: str | None = None
         self._query_text: str = ""
         self._result_columns: list[str] = []
-        self._result_rows: list[QueryRow] = []
 
     @property
     def config(self) -> ConnectionConfig:
@@ -61,5 +67,13 @@ class PgInspectorApp(App[None]):
             )
         )
 
+    def action_pool_stats(self) -> None:
+        if not isinstance(self.screen, PoolStatsScreen):
+            self.push_screen(PoolStatsScreen(self._database_provider))
+
+    def action_activity(self) -> None:
+        if not isinstance(self.screen, ActivityMonitorScreen):
+            self.push_screen(ActivityMonitorScreen(self._database_provider))
+
     def compose(self) -> ComposeResult:
         yield Container()
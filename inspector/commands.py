@@ -0,0 +1,102 @@
+from pathlib import Path
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from inspector.config import ConnectionConfig
+from inspector.db.catalog_cache import CatalogCacheStore
+from inspector.db.connection import SessionProvider
+from inspector.db.database import DatabaseProvider
+from inspector.db.export import ExportError, ExportResult
+from inspector.db.formats import ExportFormat, RangeSplit, RowFormat
+from inspector.db.metadata import MetadataProvider
+
+# Errors reported as a one-line message instead of a traceback.
+COMMAND_ERRORS = (ExportError, ValueError, OSError, SQLAlchemyError)
+
+
+def _get_catalog_cache_store(config: ConnectionConfig) -> CatalogCacheStore | None:
+    if not config.metadata_cache:
+        return None
+    directory = Path(config.metadata_cache_dir) if config.metadata_cache_dir else None
+    return CatalogCacheStore(directory)
+
+
+async def run_tui(config: ConnectionConfig) -> None:
+    # Textual is only needed for the interactive UI; headless commands skip it.
+    from inspector.app import PgInspectorApp
+
+    session_provider = SessionProvider(config=config)
+    database_provider = DatabaseProvider(
+        session_provider,
+        MetadataProvider(catalog_snapshot=config.catalog_snapshot),
+    )
+    await session_provider.create_engine(config)
+    cache_store = _get_catalog_cache_store(config)
+    try:
+        if cache_store is not None:
+            try:
+                await database_provider.restore_catalog(cache_store)
+            except (OSError, SQLAlchemyError):
+                cache_store = None
+        inspector_app = PgInspectorApp(config, database_provider)
+        await inspector_app.run_async()
+        if cache_store is not None:
+            try:
+                await database_provider.persist_catalog(cache_store)
+            except (OSError, SQLAlchemyError):
+                pass
+    finally:
+        await session_provider.close_engine()
+
+
+def split_table_name(name: str) -> tuple[str, str]:
+    schema_name, dot, table_name = name.partition(".")
+    if not dot:
+        return "public", name
+    return schema_name, table_name
+
+
+async def run_export(
+    config: ConnectionConfig,
+    table: str | None,
+    sql: str | None,
+    export_format: ExportFormat,
+    output: str,
+    split: RangeSplit = "key",
+    merge: bool = True,
+) -> ExportResult:
+    session_provider = SessionProvider(config=config)
+    database_provider = DatabaseProvider(session_provider)
+    await session_provider.create_engine(config)
+    try:
+        if sql is not None:
+            return await database_provider.export_query(sql, export_format, output)
+        assert table is not None
+        schema_name, table_name = split_table_name(table)
+        if config.export_jobs > 1 or not merge:
+            return await database_provider.export_table_parallel(
+                schema_name, table_name, export_format, output, split=split, merge=merge
+            )
+        return await database_provider.export_table(
+            schema_name, table_name, export_format, output
+        )
+    finally:
+        await session_provider.close_engine()
+
+
+async def run_query(
+    config: ConnectionConfig,
+    sql: str,
+    row_format: RowFormat,
+    max_rows: int | None,
+    header: bool,
+) -> ExportResult:
+    session_provider = SessionProvider(config=config)
+    database_provider = DatabaseProvider(session_provider)
+    await session_provider.create_engine(config)
+    try:
+        return await database_provider.write_query(
+            sql, row_format, "-", max_rows=max_rows, header=header
+        )
+    finally:
+        await session_provider.close_engine()
@@ -14,10 +14,165 @@ class PgInspectorSettings(BaseSettings):
         description="PostgreSQL connection URL",
         validation_alias="DATABASE_URL",
     )
+    stream_batch_size: int = Field(
+        default=500,
+        description="Rows fetched per server-side cursor batch",
+        validation_alias="INSPECTOR_STREAM_BATCH_SIZE",
+    )
+    max_result_rows: int | None = Field(
+        default=100_000,
+        description="Row ceiling for streamed query results",
+        validation_alias="INSPECTOR_MAX_RESULT_ROWS",
+    )
+    max_result_bytes: int | None = Field(
+        default=256 * 1024 * 1024,
+        description="Approximate byte ceiling for streamed query results",
+        validation_alias="INSPECTOR_MAX_RESULT_BYTES",
+    )
+    catalog_snapshot: bool = Field(
+        default=False,
+        description="Load the whole catalog in bulk on first metadata access",
+        validation_alias="INSPECTOR_CATALOG_SNAPSHOT",
+    )
+    statement_timeout_ms: int | None = Field(
+        default=None,
+        description="Per-session statement_timeout in milliseconds",
+        validation_alias="INSPECTOR_STATEMENT_TIMEOUT_MS",
+    )
+    lock_timeout_ms: int | None = Field(
+        default=None,
+        description="Per-session lock_timeout in milliseconds",
+        validation_alias="INSPECTOR_LOCK_TIMEOUT_MS",
+    )
+    metadata_cache: bool = Field(
+        default=True,
+        description="Persist catalog metadata between runs",
+        validation_alias="INSPECTOR_METADATA_CACHE",
+    )
+    metadata_cache_dir: str | None = Field(
+        default=None,
+        description="Directory for the persisted metadata cache",
+        validation_alias="INSPECTOR_METADATA_CACHE_DIR",
+    )
+    pool_size: int = Field(
+        default=4,
+        description="Connections kept open in the pool",
+        validation_alias="INSPECTOR_POOL_SIZE",
+    )
+    max_overflow: int = Field(
+        default=8,
+        description="Extra connections opened beyond pool_size under load",
+        validation_alias="INSPECTOR_MAX_OVERFLOW",
+    )
+    pool_timeout_s: float = Field(
+        default=30.0,
+        description="Seconds to wait for a free pooled connection",
+        validation_alias="INSPECTOR_POOL_TIMEOUT",
+    )
+    pool_recycle_s: int | None = Field(
+        default=1800,
+        description="Replace pooled connections older than this many seconds",
+        validation_alias="INSPECTOR_POOL_RECYCLE",
+    )
+    pool_pre_ping_idle_s: float | None = Field(
+        default=60.0,
+        description="Ping pooled connections idle for longer than this many seconds",
+        validation_alias="INSPECTOR_POOL_PRE_PING_IDLE",
+    )
+    pool_warmup: int = Field(
+        default=0,
+        description="Connections opened eagerly when the engine is created",
+        validation_alias="INSPECTOR_POOL_WARMUP",
+    )
+    export_jobs: int = Field(
+        default=1,
+        description="Connections used to export a table in parallel ranges",
+        validation_alias="INSPECTOR_EXPORT_JOBS",
+    )
+    query_cache_ttl_s: float | None = Field(
+        default=None,
+        description="Seconds to reuse query runner results; unset disables the cache",
+        validation_alias="INSPECTOR_QUERY_CACHE_TTL",
+    )
+    query_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Approximate byte ceiling for cached query results",
+        validation_alias="INSPECTOR_QUERY_CACHE_BYTES",
+    )
+    activity_interval_s: float = Field(
+        default=2.0,
+        description="Seconds between polls in the activity monitor",
+        validation_alias="INSPECTOR_ACTIVITY_INTERVAL",
+    )
 
 
 class ConnectionConfig(BaseModel):
     url: str = Field(..., description="PostgreSQL connection URL")
+    stream_batch_size: int = Field(
+        default=500, gt=0, description="Rows fetched per server-side cursor batch"
+    )
+    max_result_rows: int | None = Field(
+        default=100_000, gt=0, description="Row ceiling for streamed query results"
+    )
+    max_result_bytes: int | None = Field(
+        default=256 * 1024 * 1024,
+        gt=0,
+        description="Approximate byte ceiling for streamed query results",
+    )
+    catalog_snapshot: bool = Field(
+        default=False,
+        description="Load the whole catalog in bulk on first metadata access",
+    )
+    statement_timeout_ms: int | None = Field(
+        default=None, ge=0, description="Per-session statement_timeout in milliseconds"
+    )
+    lock_timeout_ms: int | None = Field(
+        default=None, ge=0, description="Per-session lock_timeout in milliseconds"
+    )
+    metadata_cache: bool = Field(
+        default=True, description="Persist catalog metadata between runs"
+    )
+    metadata_cache_dir: str | None = Field(
+        default=None, description="Directory for the persisted metadata cache"
+    )
+    pool_size: int = Field(default=4, gt=0, description="Connections kept open in the pool")
+    max_overflow: int = Field(
+        default=8, ge=0, description="Extra connections opened beyond pool_size under load"
+    )
+    pool_timeout_s: float = Field(
+        default=30.0, gt=0, description="Seconds to wait for a free pooled connection"
+    )
+    pool_recycle_s: int | None = Field(
+        default=1800,
+        gt=0,
+        description="Replace pooled connections older than this many seconds",
+    )
+    pool_pre_ping_idle_s: float | None = Field(
+        default=60.0,
+        ge=0,
+        description="Ping pooled connections idle for longer than this many seconds",
+    )
+    pool_warmup: int = Field(
+        default=0, ge=0, description="Connections opened eagerly when the engine is created"
+    )
+    export_jobs: int = Field(
+        default=1,
+        gt=0,
+        description="Connections used to export a table in parallel ranges",
+    )
+    query_cache_ttl_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds to reuse query runner results; unset disables the cache",
+    )
+    query_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        gt=0,
+        description="Approximate byte ceiling for cached query results",
+    )
+    activity_interval_s: float = Field(
+        default=2.0, gt=0, description="Seconds between polls in the activity monitor"
+    )
 
     @field_validator("url")
     @classmethod
@@ -1,22 +1,64 @@
-from inspector.db.connection import (
-    SessionProvider,
-)
-from inspector.db.database import DatabaseProvider, QueryResult, QueryRow, run_query
-from inspector.db.metadata import (
-    ColumnInfo,
-    MetadataProvider,
-    SchemaInfo,
-    TableInfo,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from inspector.db.connection import (
+        PoolStats,
+        SessionProvider,
+    )
+    from inspector.db.database import DatabaseProvider, QueryStream, run_query
+    from inspector.db.metadata import (
+        ColumnInfo,
+        MetadataProvider,
+        SchemaInfo,
+        TableInfo,
+    )
+    from inspector.db.object_index import CatalogObject, ObjectIndex
+    from inspector.db.paging import TablePager
+    from inspector.db.result import QueryResult, QueryRow
+
+# Submodules load on first attribute access, so importing a light module such
+# as inspector.db.formats does not pull in SQLAlchemy.
+_EXPORTS = {
+    "CatalogObject": "inspector.db.object_index",
+    "ColumnInfo": "inspector.db.metadata",
+    "DatabaseProvider": "inspector.db.database",
+    "MetadataProvider": "inspector.db.metadata",
+    "ObjectIndex": "inspector.db.object_index",
+    "PoolStats": "inspector.db.connection",
+    "QueryResult": "inspector.db.result",
+    "QueryRow": "inspector.db.result",
+    "QueryStream": "inspector.db.database",
+    "SessionProvider": "inspector.db.connection",
+    "SchemaInfo": "inspector.db.metadata",
+    "TableInfo": "inspector.db.metadata",
+    "TablePager": "inspector.db.paging",
+    "run_query": "inspector.db.database",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "CatalogObject",
     "ColumnInfo",
     "DatabaseProvider",
     "MetadataProvider",
+    "ObjectIndex",
+    "PoolStats",
     "QueryResult",
     "QueryRow",
+    "QueryStream",
     "SessionProvider",
     "SchemaInfo",
     "TableInfo",
+    "TablePager",
     "run_query",
 ]
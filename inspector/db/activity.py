@@ -0,0 +1,148 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Mapping
+from typing import Any, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+DEFAULT_ACTIVITY_INTERVAL_S = 2.0
+ACTIVITY_MAX_ROWS = 500
+ACTIVITY_QUERY_CHARS = 200
+ACTIVITY_STATEMENT_TIMEOUT_MS = 2000
+# Share of wall time the monitor may spend waiting on its own polls.
+MAX_POLL_DUTY = 0.1
+
+_LOCAL_TIMEOUT_SQL = "SELECT set_config('statement_timeout', :timeout, true)"
+
+_ACTIVITY_SQL = """
+SELECT a.pid,
+       a.usename AS username,
+       a.application_name,
+       host(a.client_addr) AS client,
+       a.state,
+       concat_ws(':', a.wait_event_type, a.wait_event) AS wait,
+       EXTRACT(EPOCH FROM now() - a.xact_start)::float8 AS xact_seconds,
+       EXTRACT(EPOCH FROM now() - a.query_start)::float8 AS query_seconds,
+       CASE WHEN a.wait_event_type = 'Lock' THEN pg_blocking_pids(a.pid) END
+           AS blocked_by,
+       coalesce(l.held, 0) AS locks_held,
+       coalesce(l.waiting, 0) AS locks_waiting,
+       left(a.query, :query_chars) AS query
+FROM pg_stat_activity a
+LEFT JOIN (
+    SELECT pid,
+           count(*) FILTER (WHERE granted) AS held,
+           count(*) FILTER (WHERE NOT granted) AS waiting
+    FROM pg_locks
+    GROUP BY pid
+) l ON l.pid = a.pid
+WHERE a.backend_type = 'client backend' AND a.pid <> pg_backend_pid()
+ORDER BY a.state = 'idle', a.xact_start NULLS LAST, a.pid
+LIMIT :limit
+"""
+
+
+class Backend(NamedTuple):
+    pid: int
+    username: str
+    application: str
+    client: str
+    state: str
+    wait: str
+    xact_seconds: float | None
+    query_seconds: float | None
+    blocked_by: tuple[int, ...]
+    locks_held: int
+    locks_waiting: int
+    query: str
+
+
+class ActivitySnapshot(NamedTuple):
+    backends: dict[int, Backend]
+    # Seconds the poll took, measured on the client.
+    elapsed: float
+    # More backends exist than the row cap allowed.
+    truncated: bool
+
+    def blocked_counts(self) -> dict[int, int]:
+        return blocked_counts(self.backends)
+
+
+def backend_from_row(row: Mapping[str, Any]) -> Backend:
+    return Backend(
+        pid=int(row["pid"]),
+        username=row["username"] or "",
+        application=row["application_name"] or "",
+        client=row["client"] or "",
+        state=row["state"] or "",
+        wait=row["wait"] or "",
+        xact_seconds=row["xact_seconds"],
+        query_seconds=row["query_seconds"],
+        blocked_by=tuple(row["blocked_by"] or ()),
+        locks_held=int(row["locks_held"]),
+        locks_waiting=int(row["locks_waiting"]),
+        query=" ".join((row["query"] or "").split()),
+    )
+
+
+# Pids in a cycle (a deadlock the server has not resolved yet) count each other once.
+def blocked_counts(backends: Mapping[int, Backend]) -> dict[int, int]:
+    waiters: dict[int, set[int]] = {}
+    for backend in backends.values():
+        for blocker in backend.blocked_by:
+            waiters.setdefault(blocker, set()).add(backend.pid)
+    counts: dict[int, int] = {}
+    for root in waiters:
+        seen: set[int] = set()
+        pending = list(waiters[root])
+        while pending:
+            pid = pending.pop()
+            if pid in seen or pid == root:
+                continue
+            seen.add(pid)
+            pending.extend(waiters.get(pid, ()))
+        counts[root] = len(seen)
+    return counts
+
+
+def next_poll_delay(interval: float, elapsed: float) -> float:
+    return max(interval, elapsed / MAX_POLL_DUTY - elapsed)
+
+
+async def poll_activity(
+    connection: AsyncConnection,
+    max_rows: int = ACTIVITY_MAX_ROWS,
+    query_chars: int = ACTIVITY_QUERY_CHARS,
+) -> ActivitySnapshot:
+    started = time.perf_counter()
+    result = await connection.execute(
+        text(_ACTIVITY_SQL), {"limit": max_rows + 1, "query_chars": query_chars}
+    )
+    rows = result.mappings().all()
+    backends = {
+        backend.pid: backend for backend in map(backend_from_row, rows[:max_rows])
+    }
+    return ActivitySnapshot(
+        backends=backends,
+        elapsed=time.perf_counter() - started,
+        truncated=len(rows) > max_rows,
+    )
+
+
+# Each poll is its own short transaction with a local statement_timeout, so nothing is
+# held open between polls.
+async def monitor_activity(
+    connection: AsyncConnection,
+    interval: float = DEFAULT_ACTIVITY_INTERVAL_S,
+    statement_timeout_ms: int = ACTIVITY_STATEMENT_TIMEOUT_MS,
+    max_rows: int = ACTIVITY_MAX_ROWS,
+) -> AsyncIterator[ActivitySnapshot]:
+    while True:
+        async with connection.begin():
+            await connection.execute(
+                text(_LOCAL_TIMEOUT_SQL), {"timeout": f"{statement_timeout_ms}ms"}
+            )
+            snapshot = await poll_activity(connection, max_rows)
+        yield snapshot
+        await asyncio.sleep(next_poll_delay(interval, snapshot.elapsed))
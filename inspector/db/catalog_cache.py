@@ -0,0 +1,223 @@
+import hashlib
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inspector.db.metadata import (
+    ColumnInfo,
+    MetadataProvider,
+    SchemaInfo,
+    TableConstraints,
+    TableInfo,
+)
+
+CACHE_FORMAT_VERSION = 4
+
+_FINGERPRINT_SQL = """
+SELECT n.nspname AS schema_name,
+       md5(coalesce(string_agg(
+           c.oid::text || ':' || c.xmin::text || ':' || coalesce(att.sig, '')
+               || ':' || coalesce(idx.sig, '') || ':' || coalesce(con.sig, ''),
+           ',' ORDER BY c.oid
+       ), '')) AS fingerprint
+FROM pg_namespace n
+LEFT JOIN pg_class c ON c.relnamespace = n.oid AND c.relkind IN ('r', 'p')
+LEFT JOIN LATERAL (
+    SELECT sum(a.xmin::text::bigint)::text AS sig
+    FROM pg_attribute a
+    WHERE a.attrelid = c.oid AND a.attnum > 0
+) att ON true
+LEFT JOIN LATERAL (
+    SELECT sum(i.xmin::text::bigint)::text AS sig
+    FROM pg_index i
+    WHERE i.indrelid = c.oid
+) idx ON true
+LEFT JOIN LATERAL (
+    SELECT sum(k.xmin::text::bigint)::text AS sig
+    FROM pg_constraint k
+    WHERE k.conrelid = c.oid
+) con ON true
+WHERE n.nspname !~ '^pg_(toast|temp_)'
+GROUP BY n.nspname
+ORDER BY n.nspname
+"""
+
+# VACUUM and ANALYZE update these in place and data growth changes them
+# without touching any row the fingerprint covers, so they are not persisted
+# and are re-read for restored schemas instead.
+_VOLATILE_TABLE_FIELDS = ("estimated_rows", "total_bytes", "last_analyzed")
+
+_RELATION_STATS_SQL = """
+SELECT n.nspname AS schema_name,
+       c.relname AS table_name,
+       CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END
+           AS estimated_rows,
+       pg_total_relation_size(c.oid) AS total_bytes,
+       GREATEST(s.last_analyze, s.last_autoanalyze) AS last_analyzed
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+WHERE c.relkind IN ('r', 'p')
+  AND n.nspname = ANY(CAST(:schema_names AS text[]))
+"""
+
+
+class SchemaSnapshot(BaseModel):
+    fingerprint: str = Field(..., description="Catalog fingerprint of the schema")
+    tables: list[TableInfo] = Field(default_factory=list)
+    columns: dict[str, list[ColumnInfo]] = Field(
+        default_factory=dict, description="Columns keyed by table name"
+    )
+    constraints: dict[str, TableConstraints] = Field(
+        default_factory=dict, description="Indexes and foreign keys keyed by table name"
+    )
+
+
+class CatalogSnapshot(BaseModel):
+    version: int = Field(default=CACHE_FORMAT_VERSION)
+    schemas: dict[str, SchemaSnapshot] = Field(default_factory=dict)
+
+    def schema_infos(self) -> list[SchemaInfo]:
+        return [SchemaInfo(name=name) for name in self.schemas]
+
+
+def connection_cache_key(url: str) -> str:
+    parsed = make_url(url)
+    rendered = URL.create(
+        parsed.drivername,
+        host=parsed.host,
+        port=parsed.port,
+        database=parsed.database,
+        query=parsed.query,
+    ).render_as_string(hide_password=False)
+    return hashlib.sha256(rendered.encode("utf-8")).hexdigest()[:32]
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "pg-inspector"
+
+
+async def fetch_catalog_fingerprints(session: AsyncSession) -> dict[str, str]:
+    result = await session.execute(text(_FINGERPRINT_SQL))
+    return {r["schema_name"]: r["fingerprint"] for r in result.mappings().all()}
+
+
+async def fetch_relation_stats(
+    session: AsyncSession, schema_names: list[str]
+) -> dict[tuple[str, str], dict[str, Any]]:
+    result = await session.execute(
+        text(_RELATION_STATS_SQL), {"schema_names": schema_names}
+    )
+    return {
+        (r["schema_name"], r["table_name"]): {f: r[f] for f in _VOLATILE_TABLE_FIELDS}
+        for r in result.mappings().all()
+    }
+
+
+def reusable_schemas(
+    snapshot: CatalogSnapshot | None, fingerprints: dict[str, str]
+) -> list[str]:
+    if snapshot is None:
+        return []
+    return [
+        name
+        for name, fingerprint in fingerprints.items()
+        if (cached := snapshot.schemas.get(name)) is not None
+        and cached.fingerprint == fingerprint
+    ]
+
+
+def build_snapshot(
+    metadata_provider: MetadataProvider, fingerprints: dict[str, str]
+) -> CatalogSnapshot:
+    snapshot = CatalogSnapshot()
+    for schema_name, fingerprint in fingerprints.items():
+        tables = metadata_provider.cached_tables(schema_name)
+        if tables is None:
+            continue
+        columns: dict[str, list[ColumnInfo]] = {}
+        constraints: dict[str, TableConstraints] = {}
+        for table in tables:
+            cached = metadata_provider.cached_columns(schema_name, table.table_name)
+            if cached is not None:
+                columns[table.table_name] = list(cached)
+            found = metadata_provider.cached_constraints(schema_name, table.table_name)
+            if found is not None:
+                constraints[table.table_name] = found
+        snapshot.schemas[schema_name] = SchemaSnapshot(
+            fingerprint=fingerprint,
+            tables=[
+                t.model_copy(update=dict.fromkeys(_VOLATILE_TABLE_FIELDS))
+                for t in tables
+            ],
+            columns=columns,
+            constraints=constraints,
+        )
+    return snapshot
+
+
+def restore_snapshot(
+    metadata_provider: MetadataProvider,
+    snapshot: CatalogSnapshot | None,
+    fingerprints: dict[str, str],
+    relation_stats: Mapping[tuple[str, str], Mapping[str, Any]] | None = None,
+) -> list[str]:
+    metadata_provider.prime_schemas([SchemaInfo(name=name) for name in fingerprints])
+    if snapshot is None:
+        return []
+    relation_stats = relation_stats or {}
+    restored = reusable_schemas(snapshot, fingerprints)
+    for schema_name in restored:
+        cached = snapshot.schemas[schema_name]
+        metadata_provider.prime_tables(
+            schema_name,
+            (
+                t.model_copy(
+                    update=relation_stats.get((schema_name, t.table_name), {})
+                )
+                for t in cached.tables
+            ),
+        )
+        for table_name, columns in cached.columns.items():
+            metadata_provider.prime_columns(schema_name, table_name, columns)
+        for table_name, constraints in cached.constraints.items():
+            metadata_provider.prime_constraints(schema_name, table_name, constraints)
+    if len(restored) == len(fingerprints):
+        metadata_provider.mark_catalog_loaded()
+    return restored
+
+
+class CatalogCacheStore:
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory or default_cache_dir()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def path_for(self, url: str) -> Path:
+        return self._directory / f"catalog-{connection_cache_key(url)}.json"
+
+    def load(self, url: str) -> CatalogSnapshot | None:
+        path = self.path_for(url)
+        try:
+            snapshot = CatalogSnapshot.model_validate_json(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if snapshot.version != CACHE_FORMAT_VERSION:
+            return None
+        return snapshot
+
+    def save(self, url: str, snapshot: CatalogSnapshot) -> None:
+        path = self.path_for(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(snapshot.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, path)
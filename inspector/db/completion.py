@@ -0,0 +1,332 @@
+import re
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+
+from inspector.db.metadata import MetadataProvider
+
+DEFAULT_SEARCH_PATH = ("public",)
+MAX_COMPLETIONS = 50
+_MAX_NAME_CHARS = 512
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<skip>'(?:[^']|'')*'?|--[^\n]*|/\*.*?(?:\*/|$))
+    | (?P<quoted>"(?:[^"]|"")*"?)
+    | (?P<word>[A-Za-z_][\w$]*)
+    | (?P<punct>[.,;()])
+    | \S
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# The identifier being typed at the cursor, with any ``qualifier.`` parts.
+_CURSOR_RE = re.compile(r'((?:(?:"(?:[^"]|"")*"|[\w$]+)\.)*)("?[\w$]*)$')
+_QUALIFIER_PART_RE = re.compile(r'"(?:[^"]|"")*"|[\w$]+')
+_BARE_IDENTIFIER_RE = re.compile(r"[a-z_][a-z0-9_$]*")
+
+_RELATION_KEYWORDS = frozenset("FROM JOIN UPDATE INTO TABLE".split())
+_COLUMN_KEYWORDS = frozenset(
+    "SELECT WHERE ON AND OR NOT BY HAVING SET RETURNING WHEN THEN ELSE DISTINCT "
+    "USING".split()
+)
+_CONTEXT_KEYWORDS = _RELATION_KEYWORDS | _COLUMN_KEYWORDS
+# Words that end a FROM item, so they are never taken for an alias.
+_CLAUSE_WORDS = frozenset(
+    "WHERE JOIN ON LEFT RIGHT INNER OUTER FULL CROSS NATURAL GROUP ORDER LIMIT "
+    "OFFSET HAVING UNION INTERSECT EXCEPT SET USING WINDOW FETCH FOR VALUES "
+    "RETURNING SELECT LATERAL TABLESAMPLE".split()
+)
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    # Bare words as typed; identifiers are case-folded like the server does.
+    name: str
+    start: int
+
+
+class TableRef(NamedTuple):
+    schema_name: str | None
+    table_name: str
+
+
+# (None, None) asks for schemas, (schema, None) for its tables and (schema, table) for
+# the table's columns.
+class MetadataRequest(NamedTuple):
+    schema_name: str | None = None
+    table_name: str | None = None
+
+
+class CompletionItem(NamedTuple):
+    name: str
+    kind: str
+    detail: str = ""
+
+    @property
+    def text(self) -> str:
+        return sql_identifier(self.name)
+
+
+class Completion(NamedTuple):
+    # Characters before the cursor that a chosen item replaces.
+    replace_length: int
+    items: list[CompletionItem]
+    missing: list[MetadataRequest]
+
+
+def sql_identifier(name: str) -> str:
+    if _BARE_IDENTIFIER_RE.fullmatch(name):
+        return name
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _unquote(value: str) -> str:
+    if not value.startswith('"'):
+        return value.lower()
+    # The closing quote may not be typed yet.
+    inner = value[1:-1] if len(value) > 1 and value.endswith('"') else value[1:]
+    return inner.replace('""', '"')
+
+
+def tokenize(sql: str) -> list[Token]:
+    tokens: list[Token] = []
+    for match in _TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        if kind == "skip" or kind is None:
+            continue
+        value = match.group()
+        name = _unquote(value) if kind in ("word", "quoted") else value
+        tokens.append(Token(kind, value, name, match.start()))
+    return tokens
+
+
+def _is_name(token: Token) -> bool:
+    if token.kind == "quoted":
+        return True
+    return token.kind == "word" and token.value.upper() not in _CLAUSE_WORDS
+
+
+def _read_relation(
+    tokens: Sequence[Token], i: int
+) -> tuple[TableRef, str | None, int] | None:
+    if i >= len(tokens) or not _is_name(tokens[i]):
+        return None
+    parts = [tokens[i].name]
+    i += 1
+    while i + 1 < len(tokens) and tokens[i].value == "." and _is_name(tokens[i + 1]):
+        parts.append(tokens[i + 1].name)
+        i += 2
+    ref = TableRef(parts[-2] if len(parts) > 1 else None, parts[-1])
+    if i < len(tokens) and tokens[i].value.upper() == "AS":
+        i += 1
+    alias = None
+    if i < len(tokens) and _is_name(tokens[i]):
+        alias = tokens[i].name
+        i += 1
+    return ref, alias, i
+
+
+# Aliases and bare table names are both keys, so `o.` and `orders.` resolve the same way
+# for `FROM orders o`.
+def statement_tables(tokens: Sequence[Token]) -> dict[str, TableRef]:
+    tables: dict[str, TableRef] = {}
+    i = 0
+    while i < len(tokens):
+        keyword = tokens[i].value.upper() if tokens[i].kind == "word" else ""
+        i += 1
+        if keyword not in _RELATION_KEYWORDS:
+            continue
+        while (found := _read_relation(tokens, i)) is not None:
+            ref, alias, i = found
+            tables.setdefault(ref.table_name, ref)
+            if alias is not None:
+                tables[alias] = ref
+            if keyword != "FROM" or i >= len(tokens) or tokens[i].value != ",":
+                break
+            i += 1
+    return tables
+
+
+def _statement_tokens(tokens: Sequence[Token], cursor: int) -> list[Token]:
+    first = 0
+    for i, token in enumerate(tokens):
+        if token.value != ";":
+            continue
+        if token.start >= cursor:
+            return list(tokens[first:i])
+        first = i + 1
+    return list(tokens[first:])
+
+
+class PrefixIndex:
+    __slots__ = ("_keys", "_names")
+
+    def __init__(self, names: Iterable[str]) -> None:
+        pairs = sorted((name.lower(), name) for name in names)
+        self._keys = [key for key, _ in pairs]
+        self._names = [name for _, name in pairs]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, prefix: str, limit: int = MAX_COMPLETIONS) -> list[str]:
+        prefix = prefix.lower()
+        found: list[str] = []
+        for position in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if len(found) >= limit or not self._keys[position].startswith(prefix):
+                break
+            found.append(self._names[position])
+        return found
+
+
+# Completion never queries the database; scopes that are not cached yet are reported in
+# Completion.missing for the caller to fetch.
+class SqlCompleter:
+    def __init__(
+        self,
+        metadata_provider: MetadataProvider,
+        search_path: Sequence[str] = DEFAULT_SEARCH_PATH,
+    ) -> None:
+        self._metadata_provider = metadata_provider
+        self._search_path = tuple(search_path)
+        self._indexes: dict[MetadataRequest, tuple[Any, PrefixIndex]] = {}
+
+    @property
+    def search_path(self) -> tuple[str, ...]:
+        return self._search_path
+
+    @search_path.setter
+    def search_path(self, value: Sequence[str]) -> None:
+        self._search_path = tuple(value)
+
+    def _cached(self, scope: MetadataRequest) -> tuple[Any, ...] | None:
+        provider = self._metadata_provider
+        if scope.schema_name is None:
+            return provider.cached_schemas()
+        if scope.table_name is None:
+            return provider.cached_tables(scope.schema_name)
+        return provider.cached_columns(scope.schema_name, scope.table_name)
+
+    def _index(self, scope: MetadataRequest) -> PrefixIndex | None:
+        source = self._cached(scope)
+        if source is None:
+            return None
+        entry = self._indexes.get(scope)
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        if scope.schema_name is None:
+            names = [s.name for s in source]
+        elif scope.table_name is None:
+            names = [t.table_name for t in source]
+        else:
+            names = [c.column_name for c in source]
+        index = PrefixIndex(names)
+        self._indexes[scope] = (source, index)
+        return index
+
+    def _resolve(
+        self, ref: TableRef, missing: list[MetadataRequest]
+    ) -> MetadataRequest | None:
+        if ref.schema_name is not None:
+            return MetadataRequest(ref.schema_name, ref.table_name)
+        for schema_name in self._search_path:
+            index = self._index(MetadataRequest(schema_name))
+            if index is None:
+                missing.append(MetadataRequest(schema_name))
+            elif index.lookup(ref.table_name, 1) == [ref.table_name]:
+                return MetadataRequest(schema_name, ref.table_name)
+        return None
+
+    def _lookup(
+        self,
+        scope: MetadataRequest,
+        prefix: str,
+        kind: str,
+        detail: str,
+        missing: list[MetadataRequest],
+    ) -> list[CompletionItem]:
+        index = self._index(scope)
+        if index is None:
+            missing.append(scope)
+            return []
+        return [CompletionItem(name, kind, detail) for name in index.lookup(prefix)]
+
+    def _relations(
+        self, qualifier: list[str], prefix: str, missing: list[MetadataRequest]
+    ) -> list[CompletionItem]:
+        if qualifier:
+            return self._lookup(
+                MetadataRequest(qualifier[-1]), prefix, "table", qualifier[-1], missing
+            )
+        items: list[CompletionItem] = []
+        for schema_name in self._search_path:
+            items += self._lookup(
+                MetadataRequest(schema_name), prefix, "table", schema_name, missing
+            )
+        items += self._lookup(MetadataRequest(), prefix, "schema", "", missing)
+        return items
+
+    def _columns(
+        self,
+        qualifier: list[str],
+        prefix: str,
+        tables: dict[str, TableRef],
+        missing: list[MetadataRequest],
+    ) -> list[CompletionItem]:
+        if qualifier:
+            ref = tables.get(qualifier[-1])
+            if ref is None:
+                ref = TableRef(qualifier[-2] if len(qualifier) > 1 else None, qualifier[-1])
+            scope = self._resolve(ref, missing)
+            if scope is not None:
+                return self._lookup(scope, prefix, "column", ref.table_name, missing)
+            # Not a table: ``schema.`` in a select list still means tables.
+            schemas = self._index(MetadataRequest())
+            if len(qualifier) == 1 and (
+                schemas is None or schemas.lookup(qualifier[0], 1) == qualifier
+            ):
+                return self._relations(qualifier, prefix, missing)
+            return []
+        items: list[CompletionItem] = []
+        seen: set[TableRef] = set()
+        for ref in tables.values():
+            if ref in seen:
+                continue
+            seen.add(ref)
+            scope = self._resolve(ref, missing)
+            if scope is not None:
+                items += self._lookup(scope, prefix, "column", ref.table_name, missing)
+        items += [
+            CompletionItem(alias, "alias", ref.table_name)
+            for alias, ref in tables.items()
+            if alias != ref.table_name and alias.startswith(prefix.lower())
+        ]
+        return items
+
+    def complete(self, sql: str, cursor: int, force: bool = False) -> Completion:
+        # Names are short; only the tail before the cursor can hold one.
+        match = _CURSOR_RE.search(sql[max(cursor - _MAX_NAME_CHARS, 0) : cursor])
+        assert match is not None  # the pattern also matches an empty suffix
+        qualifier = [_unquote(p) for p in _QUALIFIER_PART_RE.findall(match.group(1))]
+        typed = match.group(2)
+        prefix = typed.lstrip('"')
+        if not (typed or qualifier or force):
+            return Completion(0, [], [])
+        name_start = cursor - len(match.group())
+        tokens = _statement_tokens(tokenize(sql), cursor)
+        keyword = ""
+        for token in reversed(tokens):
+            if token.start >= name_start:
+                continue
+            if token.kind == "word" and token.value.upper() in _CONTEXT_KEYWORDS:
+                keyword = token.value.upper()
+                break
+        missing: list[MetadataRequest] = []
+        if keyword in _RELATION_KEYWORDS:
+            items = self._relations(qualifier, prefix, missing)
+        else:
+            items = self._columns(qualifier, prefix, statement_tables(tokens), missing)
+        unique = list(dict.fromkeys(items))[:MAX_COMPLETIONS]
+        return Completion(len(typed), unique, list(dict.fromkeys(missing)))
@@ -1,28 +1,75 @@
+import asyncio
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from typing import Any, NamedTuple
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import Pool
 
 from inspector.config import ConnectionConfig
 
+_LAST_CHECKIN = "inspector_last_checkin"
+_READ_ONLY_OPTIONS = {"postgresql_readonly": True}
+
+
+class PoolStats(NamedTuple):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    acquisitions: int
+    total_wait: float
+    max_wait: float
+    pings: int
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+
+def _connect_args(config: ConnectionConfig) -> dict[str, Any]:
+    server_settings: dict[str, str] = {}
+    if config.statement_timeout_ms is not None:
+        server_settings["statement_timeout"] = str(config.statement_timeout_ms)
+    if config.lock_timeout_ms is not None:
+        server_settings["lock_timeout"] = str(config.lock_timeout_ms)
+    if not server_settings:
+        return {}
+    return {"server_settings": server_settings}
+
+
+async def driver_connection(session: AsyncSession) -> Any:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+async def _backend_pid(session: AsyncSession) -> int | None:
+    get_server_pid = getattr(await driver_connection(session), "get_server_pid", None)
+    if get_server_pid is None:
+        return None
+    return get_server_pid()
+
 
 class SessionProvider:
-    def __init__(
-        self,
-        config: ConnectionConfig | None = None,
-        pool_size: int = 4,
-        max_overflow: int = 8,
-    ) -> None:
+    def __init__(self, config: ConnectionConfig | None = None) -> None:
         self._config = config
-        self._pool_size = pool_size
-        self._max_overflow = max_overflow
         self._engine: AsyncEngine | None = None
         self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._active_backends: set[int] = set()
+        self._acquisitions = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._pings = 0
 
     async def create_engine(self, config: ConnectionConfig | None = None) -> AsyncEngine:
         if config is not None:
@@ -31,17 +78,77 @@ class SessionProvider:
             raise RuntimeError("Database configuration is not set.")
         self._engine = create_async_engine(
             self._config.url,
-            pool_size=self._pool_size,
-            max_overflow=self._max_overflow,
-            pool_pre_ping=True,
+            pool_size=self._config.pool_size,
+            max_overflow=self._config.max_overflow,
+            pool_timeout=self._config.pool_timeout_s,
+            pool_recycle=self._config.pool_recycle_s or -1,
+            connect_args=_connect_args(self._config),
         )
+        pool = self._engine.sync_engine.pool
+        if isinstance(pool, Pool):
+            event.listen(pool, "checkin", self._on_checkin)
+            event.listen(pool, "checkout", self._on_checkout)
         self._session_factory = async_sessionmaker(
             self._engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
+        if self._config.pool_warmup:
+            await self.warm_up(self._config.pool_warmup)
         return self._engine
 
+    # Failures are left for the first real query to report.
+    async def warm_up(self, connections: int) -> int:
+        if self._engine is None or self._config is None:
+            return 0
+        count = min(connections, self._config.pool_size)
+        results = await asyncio.gather(
+            *(self._engine.connect().start() for _ in range(count)),
+            return_exceptions=True,
+        )
+        opened = [r for r in results if isinstance(r, AsyncConnection)]
+        for connection in opened:
+            await connection.close()
+        return len(opened)
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        if connection_record is not None:
+            connection_record.info[_LAST_CHECKIN] = time.monotonic()
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        # Freshly opened connections have no check-in time and skip the ping;
+        # only connections left idle past the threshold pay the round trip.
+        if self._engine is None or self._config is None:
+            return
+        threshold = self._config.pool_pre_ping_idle_s
+        last_checkin = connection_record.info.get(_LAST_CHECKIN)
+        if threshold is None or last_checkin is None:
+            return
+        if time.monotonic() - last_checkin < threshold:
+            return
+        self._pings += 1
+        try:
+            self._engine.dialect.do_ping(dbapi_connection)
+        except Exception as exc:
+            raise DisconnectionError("Pooled connection failed pre-ping.") from exc
+
+    def pool_stats(self) -> PoolStats | None:
+        if self._engine is None:
+            return None
+        pool = self._engine.sync_engine.pool
+        return PoolStats(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            acquisitions=self._acquisitions,
+            total_wait=self._total_wait,
+            max_wait=self._max_wait,
+            pings=self._pings,
+        )
+
     async def close_engine(self) -> None:
         if self._engine is not None:
             await self._engine.dispose()
@@ -51,11 +158,72 @@ class SessionProvider:
     def get_engine(self) -> AsyncEngine | None:
         return self._engine
 
+    def get_config(self) -> ConnectionConfig | None:
+        return self._config
+
+    # BEGIN READ ONLY makes the server refuse writes the SQL classifier missed
+    # (functions with side effects) at no extra round trip.
     @asynccontextmanager
-    async def open(self) -> AsyncIterator[AsyncSession]:
+    async def open(self, read_only: bool = False) -> AsyncIterator[AsyncSession]:
         if self._session_factory is None:
             await self.create_engine()
         if self._session_factory is None:
             raise RuntimeError("Database session factory is not initialized.")
         async with self._session_factory() as session:
+            started = time.perf_counter()
+            await session.connection(
+                execution_options=_READ_ONLY_OPTIONS if read_only else None
+            )
+            self._record_wait(time.perf_counter() - started)
             yield session
+
+    # For long-lived pollers: one pooled connection held for the poller's lifetime, so
+    # only the first checkout can wait on the pool, not every poll.
+    @asynccontextmanager
+    async def dedicated(
+        self, read_only: bool = False
+    ) -> AsyncIterator[AsyncConnection]:
+        if self._engine is None:
+            await self.create_engine()
+        if self._engine is None:
+            raise RuntimeError("Database engine is not initialized.")
+        started = time.perf_counter()
+        async with self._engine.connect() as connection:
+            self._record_wait(time.perf_counter() - started)
+            if read_only:
+                await connection.execution_options(**_READ_ONLY_OPTIONS)
+            yield connection
+
+    def _record_wait(self, elapsed: float) -> None:
+        self._acquisitions += 1
+        self._total_wait += elapsed
+        self._max_wait = max(self._max_wait, elapsed)
+
+    @property
+    def active_backends(self) -> frozenset[int]:
+        return frozenset(self._active_backends)
+
+    @asynccontextmanager
+    async def cancellable(self, session: AsyncSession) -> AsyncIterator[None]:
+        pid = await _backend_pid(session)
+        if pid is None:
+            yield
+            return
+        self._active_backends.add(pid)
+        try:
+            yield
+        except asyncio.CancelledError:
+            await asyncio.shield(self.cancel_backends([pid]))
+            raise
+        finally:
+            self._active_backends.discard(pid)
+
+    async def cancel_backends(self, pids: list[int]) -> int:
+        if not pids:
+            return 0
+        async with self.open() as session:
+            await session.execute(
+                text("SELECT pg_cancel_backend(pid) FROM unnest(CAST(:pids AS int[])) AS pid"),
+                {"pids": pids},
+            )
+        return len(pids)
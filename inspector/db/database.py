@@ -1,51 +1,219 @@
-from typing import Any
+import asyncio
+import itertools
+import sys
+import time
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import aclosing
+from typing import Any, TypeVar
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from inspector.db.connection import SessionProvider
-from inspector.db.metadata import MetadataProvider
+from inspector.db.activity import (
+    DEFAULT_ACTIVITY_INTERVAL_S,
+    ActivitySnapshot,
+    monitor_activity,
+)
+from inspector.db.catalog_cache import (
+    CatalogCacheStore,
+    build_snapshot,
+    fetch_catalog_fingerprints,
+    fetch_relation_stats,
+    restore_snapshot,
+    reusable_schemas,
+)
+from inspector.db.completion import Completion, MetadataRequest, SqlCompleter
+from inspector.db.connection import PoolStats, SessionProvider
+from inspector.db.export import (
+    EXPORT_BATCH_SIZE,
+    ExportError,
+    ExportRange,
+    ExportResult,
+    ExportTarget,
+    copy_ranges,
+    copy_table_to,
+    copy_to,
+    describe_query,
+    export_snapshot,
+    import_snapshot,
+    plan_ctid_ranges,
+    plan_key_ranges,
+    range_query,
+    write_parquet,
+    write_rows,
+)
+from inspector.db.formats import ExportFormat, RangeSplit, RowFormat
+from inspector.db.lookup import LOOKUP_LIMIT, build_lookup_query
+from inspector.db.metadata import (
+    ColumnInfo,
+    MetadataProvider,
+    SchemaInfo,
+    TableConstraints,
+    TableInfo,
+)
+from inspector.db.object_index import DEFAULT_LIMIT, CatalogObject
+from inspector.db.plan import QueryPlan, explain_sql, parse_plan
+from inspector.db.query_cache import CachedResult, QueryCache
+from inspector.db.result import QueryResult, QueryRow
+from inspector.db.sql import HISTOGRAM_BOUNDS_SQL, RELPAGES_SQL, qualified_table
+from inspector.db.statements import ensure_read_only
+from inspector.db.table_stats import TableStatsSnapshot, fetch_table_stats
 
-QueryRow = dict[str, Any]
-QueryResult = tuple[list[str], list[QueryRow]]
+DEFAULT_STREAM_BATCH_SIZE = 500
+METADATA_BATCH_SIZE = 50
+METADATA_CONCURRENCY = 4
 
-_MUTATING_SQL_PREFIXES = {
-    "ALTER",
-    "COMMENT",
-    "CREATE",
-    "DELETE",
-    "DROP",
-    "GRANT",
-    "INSERT",
-    "REVOKE",
-    "TRUNCATE",
-    "UPDATE",
-}
+_T = TypeVar("_T")
 
 
-def _is_mutating_sql(sql: str) -> bool:
-    normalized = sql.lstrip()
-    if not normalized:
-        return False
-    first_token = normalized.split(maxsplit=1)[0].upper()
-    return first_token in _MUTATING_SQL_PREFIXES
+async def run_query(
+    session: AsyncSession, sql: str, params: Mapping[str, Any] | None = None
+) -> QueryResult:
+    ensure_read_only(sql)
 
+    if params:
+        result = await session.execute(text(sql), dict(params))
+    else:
+        result = await session.execute(text(sql))
 
-async def run_query(session: AsyncSession, sql: str) -> QueryResult:
-    if _is_mutating_sql(sql):
-        raise ValueError("Only read-only queries are allowed in inspector mode.")
+    if not result.returns_rows:
+        return QueryResult.empty()
 
-    result = await session.execute(text(sql))
+    return QueryResult.from_rows(list(result.keys()), result.all())
 
-    if not result.returns_rows:
-        return [], []
 
-    columns = list(result.keys())
-    rows = result.mappings().all()
-    if not rows:
-        return columns, []
+def _estimate_row_bytes(row: QueryRow) -> int:
+    return sum(sys.getsizeof(value) for value in row)
+
+
+class QueryStream:
+    def __init__(
+        self,
+        session_provider: SessionProvider,
+        sql: str,
+        params: Mapping[str, Any] | None = None,
+        batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        cache: QueryCache | None = None,
+        refresh: bool = False,
+    ) -> None:
+        self._session_provider = session_provider
+        self._sql = sql
+        self._params = dict(params) if params else None
+        self._batch_size = batch_size
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._cache = cache
+        self._refresh = refresh
+        self._cancelled = False
+        self.columns: list[str] = []
+        self.row_count = 0
+        self.byte_count = 0
+        self.truncated = False
+        self.exhausted = False
+        # When the rows were replayed from the result cache (time.monotonic()).
+        self.cached_at: float | None = None
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
 
-    return columns, [dict(r) for r in rows]
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def _limit_batch(self, rows: list[QueryRow]) -> list[QueryRow]:
+        if self._max_rows is not None:
+            remaining = self._max_rows - self.row_count
+            # A result of exactly max_rows is complete; only a row past the
+            # limit truncates it.
+            if len(rows) > remaining:
+                rows = rows[:remaining]
+                self.truncated = True
+        if self._max_bytes is not None:
+            # The row that reaches the budget is kept; only a row after it truncates.
+            for i, row in enumerate(rows):
+                if self.byte_count >= self._max_bytes:
+                    rows = rows[:i]
+                    self.truncated = True
+                    break
+                self.byte_count += _estimate_row_bytes(row)
+        self.row_count += len(rows)
+        return rows
+
+    def _replay(self, entry: CachedResult) -> Iterator[QueryResult]:
+        result = entry.result
+        if self._max_rows is not None and len(result) > self._max_rows:
+            result = result[: self._max_rows]
+            self.truncated = True
+        self.columns = result.columns
+        self.cached_at = entry.stored_at
+        for start in range(0, len(result), self._batch_size):
+            if self._cancelled:
+                return
+            # Slices share the cached column buffers.
+            batch = result[start : start + self._batch_size]
+            self.row_count += len(batch)
+            yield batch
+        self.exhausted = not self.truncated
+
+    async def __aiter__(self) -> AsyncIterator[QueryResult]:
+        ensure_read_only(self._sql)
+        cache = self._cache
+        key = cache.key(self._sql, self._params) if cache is not None else None
+        if key is not None and not self._refresh:
+            entry = cache.get(key)
+            if entry is not None:
+                for batch in self._replay(entry):
+                    yield batch
+                return
+        # Batches are kept for the cache while they fit in it; only complete
+        # results are stored, so a replay never depends on the limits.
+        kept: list[QueryResult] | None = [] if cache is not None else None
+        kept_bytes, kept_limit = 0, cache.max_bytes if cache is not None else 0
+        async with (
+            self._session_provider.open(read_only=True) as session,
+            self._session_provider.cancellable(session),
+        ):
+            if cache is not None and key is None:
+                key = await cache.resolve_key(session, self._sql, self._params)
+            result = await session.stream(text(self._sql), self._params)
+            try:
+                self.columns = list(result.keys())
+                async for partition in result.partitions(self._batch_size):
+                    if self._cancelled:
+                        return
+                    rows = self._limit_batch([tuple(r) for r in partition])
+                    if rows:
+                        batch = QueryResult.from_rows(self.columns, rows)
+                        if kept is not None:
+                            kept_bytes += sys.getsizeof(batch)
+                            if kept_bytes <= kept_limit:
+                                kept.append(batch)
+                            else:
+                                kept = None
+                        yield batch
+                    if self.truncated:
+                        break
+                else:
+                    self.exhausted = True
+            finally:
+                await result.close()
+        if cache is not None and key is not None and kept is not None and self.exhausted:
+            rows = itertools.chain.from_iterable(kept)
+            cache.put(key, QueryResult.from_rows(self.columns, rows))
 
 
 class DatabaseProvider:
@@ -56,24 +224,449 @@ class DatabaseProvider:
     ) -> None:
         self._session_provider = session_provider
         self._metadata_provider = metadata_provider or MetadataProvider()
+        self._catalog_fingerprints: dict[str, str] | None = None
+        self._completer = SqlCompleter(self._metadata_provider)
+        self._query_cache: QueryCache | None = None
+
+    async def _fetch_catalog_fingerprints(self) -> dict[str, str]:
+        async with self._session_provider.open() as session:
+            return await fetch_catalog_fingerprints(session)
+
+    async def restore_catalog(self, store: CatalogCacheStore) -> list[str]:
+        config = self._session_provider.get_config()
+        if config is None:
+            return []
+        snapshot = store.load(config.url)
+        async with self._session_provider.open() as session:
+            fingerprints = await fetch_catalog_fingerprints(session)
+            reusable = reusable_schemas(snapshot, fingerprints)
+            stats = await fetch_relation_stats(session, reusable) if reusable else {}
+        self._catalog_fingerprints = fingerprints
+        return restore_snapshot(self._metadata_provider, snapshot, fingerprints, stats)
+
+    async def persist_catalog(self, store: CatalogCacheStore) -> None:
+        config = self._session_provider.get_config()
+        if config is None:
+            return
+        current = await self._fetch_catalog_fingerprints()
+        baseline = self._catalog_fingerprints or current
+        unchanged = {
+            name: fingerprint
+            for name, fingerprint in current.items()
+            if baseline.get(name) == fingerprint
+        }
+        store.save(config.url, build_snapshot(self._metadata_provider, unchanged))
 
-    async def list_schemas(self):
+    async def load_catalog(self) -> None:
+        async with self._session_provider.open() as session:
+            await self._metadata_provider.load_catalog(session)
+
+    async def list_schemas(self) -> tuple[SchemaInfo, ...]:
+        cached = self._metadata_provider.cached_schemas()
+        if cached is not None:
+            return cached
         async with self._session_provider.open() as session:
             return await self._metadata_provider.list_schemas(session)
 
-    async def list_tables(self, schema_name: str):
+    async def list_tables(self, schema_name: str) -> tuple[TableInfo, ...]:
+        cached = self._metadata_provider.cached_tables(schema_name)
+        if cached is not None:
+            return cached
         async with self._session_provider.open() as session:
             return await self._metadata_provider.list_tables(session, schema_name)
 
-    async def list_columns(self, schema_name: str, table_name: str):
+    def _metadata_concurrency(self, concurrency: int | None) -> int:
+        if concurrency is not None:
+            return max(concurrency, 1)
+        config = self._session_provider.get_config()
+        if config is None:
+            return METADATA_CONCURRENCY
+        return max(min(METADATA_CONCURRENCY, config.pool_size), 1)
+
+    async def _run_batches(
+        self,
+        batches: Sequence[_T],
+        fetch: Callable[[AsyncSession, _T], Awaitable[Any]],
+        concurrency: int,
+    ) -> AsyncIterator[Any]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(batch: _T) -> Any:
+            async with semaphore, self._session_provider.open() as session:
+                return await fetch(session, batch)
+
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def iter_tables(
+        self,
+        schema_names: Iterable[str],
+        batch_size: int = METADATA_BATCH_SIZE,
+        concurrency: int | None = None,
+    ) -> AsyncIterator[tuple[str, tuple[TableInfo, ...]]]:
+        if self._metadata_provider.catalog_snapshot:
+            await self.list_schemas()
+        missing: list[str] = []
+        for name in dict.fromkeys(schema_names):
+            cached = self._metadata_provider.cached_tables(name)
+            if cached is None:
+                missing.append(name)
+            else:
+                yield name, cached
+        batches = [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+        async for found in self._run_batches(
+            batches,
+            self._metadata_provider.list_tables_batch,
+            self._metadata_concurrency(concurrency),
+        ):
+            for item in found.items():
+                yield item
+
+    async def iter_columns(
+        self,
+        tables: Iterable[tuple[str, str]],
+        batch_size: int = METADATA_BATCH_SIZE,
+        concurrency: int | None = None,
+    ) -> AsyncIterator[tuple[str, str, tuple[ColumnInfo, ...]]]:
+        if self._metadata_provider.catalog_snapshot:
+            await self.list_schemas()
+        missing: dict[str, list[str]] = {}
+        for schema_name, table_name in dict.fromkeys(tables):
+            cached = self._metadata_provider.cached_columns(schema_name, table_name)
+            if cached is None:
+                missing.setdefault(schema_name, []).append(table_name)
+            else:
+                yield schema_name, table_name, cached
+        batches = [
+            (schema_name, names[i : i + batch_size])
+            for schema_name, names in missing.items()
+            for i in range(0, len(names), batch_size)
+        ]
+
+        async def fetch(
+            session: AsyncSession, batch: tuple[str, list[str]]
+        ) -> tuple[str, dict[str, tuple[ColumnInfo, ...]]]:
+            schema_name, names = batch
+            found = await self._metadata_provider.list_columns_batch(
+                session, schema_name, names
+            )
+            return schema_name, found
+
+        async for schema_name, found in self._run_batches(
+            batches, fetch, self._metadata_concurrency(concurrency)
+        ):
+            for table_name, columns in found.items():
+                yield schema_name, table_name, columns
+
+    async def get_table(self, schema_name: str, table_name: str) -> TableInfo | None:
+        for table in await self.list_tables(schema_name):
+            if table.table_name == table_name:
+                return table
+        return None
+
+    async def list_columns(
+        self, schema_name: str, table_name: str
+    ) -> tuple[ColumnInfo, ...]:
+        cached = self._metadata_provider.cached_columns(schema_name, table_name)
+        if cached is not None:
+            return cached
         async with self._session_provider.open() as session:
             return await self._metadata_provider.list_columns(
                 session, schema_name, table_name
             )
 
-    async def run_query(self, sql: str) -> QueryResult:
+    async def list_constraints(
+        self, schema_name: str, table_name: str
+    ) -> TableConstraints:
+        cached = self._metadata_provider.cached_constraints(schema_name, table_name)
+        if cached is not None:
+            return cached
         async with self._session_provider.open() as session:
-            return await run_query(session, sql)
+            return await self._metadata_provider.list_constraints(
+                session, schema_name, table_name
+            )
+
+    async def lookup_rows(
+        self,
+        schema_name: str,
+        table_name: str,
+        conditions: Mapping[str, Any],
+        limit: int = LOOKUP_LIMIT,
+    ) -> QueryResult:
+        sql, params = build_lookup_query(schema_name, table_name, conditions, limit)
+        async with (
+            self._session_provider.open(read_only=True) as session,
+            self._session_provider.cancellable(session),
+        ):
+            return await run_query(session, sql, params)
+
+    async def list_key_columns(
+        self, schema_name: str, table_name: str
+    ) -> tuple[str, ...]:
+        cached = self._metadata_provider.cached_key_columns(schema_name, table_name)
+        if cached is not None:
+            return cached
+        async with self._session_provider.open() as session:
+            return await self._metadata_provider.list_key_columns(
+                session, schema_name, table_name
+            )
+
+    def _result_cache(self) -> QueryCache | None:
+        config = self._session_provider.get_config()
+        if config is None or not config.query_cache_ttl_s:
+            return None
+        if self._query_cache is None:
+            self._query_cache = QueryCache(
+                config.query_cache_ttl_s, config.query_cache_bytes
+            )
+        return self._query_cache
+
+    async def run_query(
+        self,
+        sql: str,
+        params: Mapping[str, Any] | None = None,
+        cache: bool = False,
+        refresh: bool = False,
+    ) -> QueryResult:
+        query_cache = self._result_cache() if cache else None
+        key = query_cache.key(sql, params) if query_cache is not None else None
+        if query_cache is not None and key is not None and not refresh:
+            entry = query_cache.get(key)
+            if entry is not None:
+                return entry.result
+        async with (
+            self._session_provider.open(read_only=True) as session,
+            self._session_provider.cancellable(session),
+        ):
+            if query_cache is not None and key is None:
+                key = await query_cache.resolve_key(session, sql, params)
+            result = await run_query(session, sql, params)
+        if query_cache is not None and key is not None:
+            query_cache.put(key, result)
+        return result
+
+    # With analyze the statement runs, in a read-only transaction that is rolled back.
+    async def explain_query(self, sql: str, analyze: bool = False) -> QueryPlan:
+        explain = explain_sql(sql, analyze)
+        async with (
+            self._session_provider.open(read_only=True) as session,
+            self._session_provider.cancellable(session),
+        ):
+            try:
+                result = await session.execute(text(explain))
+                return parse_plan(result.scalar_one())
+            finally:
+                await session.rollback()
+
+    # These counters move constantly, so unlike catalog metadata they are never cached.
+    async def table_stats(self, schema_name: str) -> TableStatsSnapshot:
+        async with self._session_provider.open(read_only=True) as session:
+            return await fetch_table_stats(session, schema_name)
+
+    @property
+    def activity_interval(self) -> float:
+        config = self._session_provider.get_config()
+        return config.activity_interval_s if config else DEFAULT_ACTIVITY_INTERVAL_S
+
+    async def monitor_activity(
+        self, interval: float | None = None
+    ) -> AsyncIterator[ActivitySnapshot]:
+        async with (
+            self._session_provider.dedicated(read_only=True) as connection,
+            aclosing(
+                monitor_activity(connection, interval or self.activity_interval)
+            ) as snapshots,
+        ):
+            async for snapshot in snapshots:
+                yield snapshot
+
+    def pool_stats(self) -> PoolStats | None:
+        return self._session_provider.pool_stats()
+
+    def stream_query(
+        self,
+        sql: str,
+        params: Mapping[str, Any] | None = None,
+        batch_size: int | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        refresh: bool = False,
+    ) -> QueryStream:
+        config = self._session_provider.get_config()
+        if config is not None:
+            batch_size = batch_size or config.stream_batch_size
+            max_rows = max_rows if max_rows is not None else config.max_result_rows
+            max_bytes = max_bytes if max_bytes is not None else config.max_result_bytes
+        return QueryStream(
+            self._session_provider,
+            sql,
+            params,
+            batch_size=batch_size or DEFAULT_STREAM_BATCH_SIZE,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            cache=self._result_cache(),
+            refresh=refresh,
+        )
+
+    async def export_query(
+        self, sql: str, export_format: ExportFormat, target: ExportTarget
+    ) -> ExportResult:
+        ensure_read_only(sql)
+        if export_format == "parquet":
+            async with self._session_provider.open(read_only=True) as session:
+                columns = await describe_query(session, sql)
+            stream = QueryStream(
+                self._session_provider, sql, batch_size=EXPORT_BATCH_SIZE
+            )
+            return await write_parquet(stream, target, columns)
+        async with (
+            self._session_provider.open(read_only=True) as session,
+            self._session_provider.cancellable(session),
+        ):
+            return await copy_to(session, sql, export_format, target)
+
+    # Nothing is kept in memory, so unlike stream_query no byte ceiling applies.
+    async def write_query(
+        self,
+        sql: str,
+        row_format: RowFormat,
+        target: ExportTarget,
+        max_rows: int | None = None,
+        header: bool = True,
+    ) -> ExportResult:
+        config = self._session_provider.get_config()
+        stream = QueryStream(
+            self._session_provider,
+            sql,
+            batch_size=config.stream_batch_size if config else DEFAULT_STREAM_BATCH_SIZE,
+            max_rows=max_rows,
+        )
+        return await write_rows(stream, row_format, target, header)
+
+    async def export_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        export_format: ExportFormat,
+        target: ExportTarget,
+    ) -> ExportResult:
+        if export_format != "csv":
+            sql = f"SELECT * FROM {qualified_table(schema_name, table_name)}"
+            return await self.export_query(sql, export_format, target)
+        async with (
+            self._session_provider.open() as session,
+            self._session_provider.cancellable(session),
+        ):
+            return await copy_table_to(session, schema_name, table_name, target)
+
+    def _export_jobs(self, jobs: int | None) -> int:
+        config = self._session_provider.get_config()
+        if jobs is None:
+            jobs = config.export_jobs if config is not None else 1
+        if config is not None:
+            # One pooled connection stays with the transaction that owns the
+            # snapshot, and one is kept free so a failed or interrupted export
+            # can still send pg_cancel_backend for the other workers.
+            jobs = min(jobs, config.pool_size + config.max_overflow - 2)
+        return max(jobs, 1)
+
+    async def _plan_ranges(
+        self,
+        session: AsyncSession,
+        schema_name: str,
+        table_name: str,
+        split: RangeSplit,
+        jobs: int,
+    ) -> tuple[list[ExportRange], tuple[str, ...]]:
+        params = {"schema_name": schema_name, "table_name": table_name}
+        if split == "key":
+            key_columns = await self._metadata_provider.list_key_columns(
+                session, schema_name, table_name
+            )
+            if key_columns:
+                result = await session.execute(
+                    text(HISTOGRAM_BOUNDS_SQL),
+                    {**params, "column_name": key_columns[0]},
+                )
+                row = result.first()
+                if row is not None and row.bounds:
+                    ranges = plan_key_ranges(
+                        key_columns[0], row.type_name, row.bounds, jobs
+                    )
+                    return ranges, key_columns
+        result = await session.execute(text(RELPAGES_SQL), params)
+        return plan_ctid_ranges(result.scalar() or 0, jobs), ()
+
+    # Every connection imports the same exported snapshot, so the ranges add up to one
+    # consistent view of the table.
+    async def export_table_parallel(
+        self,
+        schema_name: str,
+        table_name: str,
+        export_format: ExportFormat,
+        target: ExportTarget,
+        jobs: int | None = None,
+        split: RangeSplit = "key",
+        merge: bool = True,
+    ) -> ExportResult:
+        if export_format == "parquet":
+            raise ExportError("Parallel export supports csv and jsonl only.")
+        jobs = self._export_jobs(jobs)
+        started = time.perf_counter()
+        async with self._session_provider.open() as coordinator:
+            snapshot_id = await export_snapshot(coordinator)
+            ranges, order_by = await self._plan_ranges(
+                coordinator, schema_name, table_name, split, jobs
+            )
+
+            async def run(index: int, part_target: ExportTarget) -> ExportResult:
+                export_range = ranges[index]
+                sql = range_query(schema_name, table_name, export_range, order_by)
+                async with (
+                    self._session_provider.open() as session,
+                    self._session_provider.cancellable(session),
+                ):
+                    await import_snapshot(session, snapshot_id)
+                    return await copy_to(
+                        session,
+                        sql,
+                        export_format,
+                        part_target,
+                        args=export_range.args,
+                        header=index == 0 or not merge,
+                    )
+
+            results = await copy_ranges(len(ranges), run, target, merge)
+        return ExportResult(
+            sum(r.rows for r in results),
+            sum(r.bytes_written for r in results),
+            time.perf_counter() - started,
+        )
+
+    def search_objects(
+        self, query: str, limit: int = DEFAULT_LIMIT
+    ) -> list[CatalogObject]:
+        return self._metadata_provider.object_index.search(query, limit)
+
+    def complete_sql(self, sql: str, cursor: int, force: bool = False) -> Completion:
+        return self._completer.complete(sql, cursor, force)
+
+    async def load_completion_metadata(self, request: MetadataRequest) -> None:
+        if request.schema_name is None:
+            await self.list_schemas()
+        elif request.table_name is None:
+            await self.list_tables(request.schema_name)
+        else:
+            await self.list_columns(request.schema_name, request.table_name)
+
+    def indexed_object_count(self) -> int:
+        return len(self._metadata_provider.object_index)
 
     def clear_metadata_cache(self) -> None:
         self._metadata_provider.clear_cache()
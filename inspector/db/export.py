@@ -0,0 +1,421 @@
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from contextlib import ExitStack, contextmanager
+from itertools import pairwise
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inspector.db.connection import driver_connection
+from inspector.db.formats import ExportFormat, RowFormat
+from inspector.db.result import QueryResult
+from inspector.db.sql import qualified_table, quote_identifier, quote_literal
+
+EXPORT_BATCH_SIZE = 10_000
+
+ExportTarget = str | os.PathLike[str] | IO[bytes]
+
+# One JSON document per line. CSV mode with control characters as delimiter
+# and quote leaves the text untouched: to_json never emits raw control
+# characters or newlines, so no field is ever quoted or escaped.
+_JSONL_COPY_OPTIONS: dict[str, Any] = {
+    "format": "csv",
+    "delimiter": "\x02",
+    "quote": "\x01",
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+class ExportResult(NamedTuple):
+    rows: int
+    bytes_written: int
+    elapsed: float
+
+
+# `where` uses $n placeholders for `args`.
+class ExportRange(NamedTuple):
+    index: int
+    where: str = ""
+    args: tuple[str, ...] = ()
+
+
+def jsonl_query(sql: str) -> str:
+    return f"SELECT to_json(q)::text FROM ({sql}) AS q"
+
+
+@contextmanager
+def _open_target(target: ExportTarget) -> Iterator[IO[bytes]]:
+    if target == "-":
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    elif isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as f:
+            yield f
+    else:
+        yield target
+
+
+def _copied_rows(status: str) -> int:
+    # asyncpg returns the command tag, e.g. "COPY 1234".
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except ValueError:
+        return 0
+
+
+async def _copy(
+    target: ExportTarget,
+    run: Callable[[Callable[[bytes], Awaitable[None]]], Awaitable[str]],
+) -> ExportResult:
+    started = time.perf_counter()
+    written = 0
+    with _open_target(target) as f:
+
+        async def write(chunk: bytes) -> None:
+            nonlocal written
+            f.write(chunk)
+            written += len(chunk)
+
+        status = await run(write)
+    return ExportResult(_copied_rows(status), written, time.perf_counter() - started)
+
+
+async def copy_to(
+    session: AsyncSession,
+    sql: str,
+    export_format: ExportFormat,
+    target: ExportTarget,
+    args: Sequence[Any] = (),
+    header: bool = True,
+) -> ExportResult:
+    # The query is wrapped in COPY (...), where a trailing semicolon is an error.
+    sql = sql.strip().rstrip(";")
+    if export_format == "csv":
+        options: dict[str, Any] = {"format": "csv", "header": header}
+    elif export_format == "jsonl":
+        sql = jsonl_query(sql)
+        options = _JSONL_COPY_OPTIONS
+    else:
+        raise ExportError(f"COPY does not support the {export_format!r} format.")
+    connection = await driver_connection(session)
+    return await _copy(
+        target, lambda write: connection.copy_from_query(sql, *args, output=write, **options)
+    )
+
+
+async def copy_table_to(
+    session: AsyncSession, schema_name: str, table_name: str, target: ExportTarget
+) -> ExportResult:
+    connection = await driver_connection(session)
+    return await _copy(
+        target,
+        lambda write: connection.copy_from_table(
+            table_name, schema_name=schema_name, output=write, format="csv", header=True
+        ),
+    )
+
+
+def _split_ranges(
+    expression: str, type_name: str, boundaries: Sequence[str], nullable: bool = False
+) -> list[ExportRange]:
+    if not boundaries:
+        return [ExportRange(0)]
+
+    def bound(position: int) -> str:
+        return f"CAST(${position}::text AS {type_name})"
+
+    ranges = [ExportRange(0, f"{expression} < {bound(1)}", (boundaries[0],))]
+    for index, (lower, upper) in enumerate(pairwise(boundaries), start=1):
+        ranges.append(
+            ExportRange(
+                index,
+                f"{expression} >= {bound(1)} AND {expression} < {bound(2)}",
+                (lower, upper),
+            )
+        )
+    last = f"{expression} >= {bound(1)}"
+    if nullable:
+        last = f"({last} OR {expression} IS NULL)"
+    ranges.append(ExportRange(len(boundaries), last, (boundaries[-1],)))
+    return ranges
+
+
+# relpages is only an estimate, so the first and last ranges are left open.
+def plan_ctid_ranges(relpages: int, jobs: int) -> list[ExportRange]:
+    boundaries = sorted({relpages * i // jobs for i in range(1, jobs)} - {0})
+    return _split_ranges("ctid", "tid", [f"({block},0)" for block in boundaries])
+
+
+def plan_key_ranges(
+    column_name: str, type_name: str, bounds: Sequence[str], jobs: int
+) -> list[ExportRange]:
+    picked: list[str] = []
+    for i in range(1, jobs):
+        value = bounds[len(bounds) * i // jobs] if bounds else None
+        if value is not None and value not in picked:
+            picked.append(value)
+    return _split_ranges(quote_identifier(column_name), type_name, picked, nullable=True)
+
+
+def range_query(
+    schema_name: str,
+    table_name: str,
+    export_range: ExportRange,
+    order_by: Sequence[str] = (),
+) -> str:
+    sql = f"SELECT * FROM {qualified_table(schema_name, table_name)}"
+    if export_range.where:
+        sql += f" WHERE {export_range.where}"
+    if order_by:
+        sql += " ORDER BY " + ", ".join(quote_identifier(c) for c in order_by)
+    return sql
+
+
+def range_path(target: str | os.PathLike[str], index: int) -> Path:
+    path = Path(target)
+    return path.with_name(f"{path.stem}.{index:03d}{path.suffix}")
+
+
+_SNAPSHOT_ISOLATION_SQL = "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+
+
+# The snapshot stays importable while the session's transaction is open.
+async def export_snapshot(session: AsyncSession) -> str:
+    await session.execute(text(_SNAPSHOT_ISOLATION_SQL))
+    result = await session.execute(text("SELECT pg_export_snapshot()"))
+    return result.scalar_one()
+
+
+async def import_snapshot(session: AsyncSession, snapshot_id: str) -> None:
+    await session.execute(text(_SNAPSHOT_ISOLATION_SQL))
+    await session.execute(text(f"SET TRANSACTION SNAPSHOT {quote_literal(snapshot_id)}"))
+
+
+async def _run_all(
+    coroutines: Iterable[Coroutine[Any, Any, ExportResult]],
+) -> list[ExportResult]:
+    tasks = [asyncio.ensure_future(c) for c in coroutines]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# When merging, the first range streams straight into the target and the rest spool to
+# temporary files that are appended in order.
+async def copy_ranges(
+    count: int,
+    run: Callable[[int, ExportTarget], Coroutine[Any, Any, ExportResult]],
+    target: ExportTarget,
+    merge: bool = True,
+) -> list[ExportResult]:
+    if not merge:
+        if not isinstance(target, (str, os.PathLike)) or target == "-":
+            raise ExportError("Per-range files need an output path.")
+        return await _run_all(run(i, range_path(target, i)) for i in range(count))
+    spool_dir = None
+    if isinstance(target, (str, os.PathLike)) and target != "-":
+        spool_dir = Path(target).parent
+    with _open_target(target) as out, ExitStack() as stack:
+        spools = [
+            stack.enter_context(tempfile.TemporaryFile(dir=spool_dir))
+            for _ in range(count - 1)
+        ]
+        results = await _run_all(
+            [run(0, out), *(run(i, spool) for i, spool in enumerate(spools, start=1))]
+        )
+        for spool in spools:
+            spool.seek(0)
+            shutil.copyfileobj(spool, out)
+    return results
+
+
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _tsv_value(value: Any) -> str:
+    # Same conventions as COPY's text format, so the output loads back as is.
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_TSV_ESCAPES)
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def format_rows(batch: QueryResult, row_format: RowFormat) -> str:
+    if row_format == "tsv":
+        return "".join("\t".join(map(_tsv_value, row)) + "\n" for row in batch)
+    columns = batch.columns
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False)
+        + "\n"
+        for row in batch
+    )
+
+
+def _tsv_header(columns: Sequence[str]) -> str:
+    return "\t".join(map(_tsv_value, columns)) + "\n"
+
+
+# Flushing after each batch lets readers of a pipe see rows as they arrive.
+async def write_rows(
+    batches: AsyncIterable[QueryResult],
+    row_format: RowFormat,
+    target: ExportTarget,
+    header: bool = True,
+) -> ExportResult:
+    started = time.perf_counter()
+    rows = 0
+    written = 0
+    header_pending = header and row_format == "tsv"
+    with _open_target(target) as f:
+
+        def emit(text_rows: str) -> None:
+            nonlocal written
+            chunk = text_rows.encode("utf-8")
+            f.write(chunk)
+            f.flush()
+            written += len(chunk)
+
+        async for batch in batches:
+            text_rows = format_rows(batch, row_format)
+            if header_pending:
+                text_rows = _tsv_header(batch.columns) + text_rows
+                header_pending = False
+            emit(text_rows)
+            rows += len(batch)
+        columns = getattr(batches, "columns", None)
+        if header_pending and columns:
+            emit(_tsv_header(columns))
+    return ExportResult(rows, written, time.perf_counter() - started)
+
+
+def _load_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ExportError(
+            "Parquet export needs pyarrow: pip install 'pg-inspector[parquet]'."
+        ) from exc
+    return pyarrow, pyarrow.parquet
+
+
+class ColumnType(NamedTuple):
+    name: str
+    type_name: str
+
+
+async def describe_query(session: AsyncSession, sql: str) -> list[ColumnType]:
+    connection = await driver_connection(session)
+    statement = await connection.prepare(sql)
+    return [
+        ColumnType(attribute.name, attribute.type.name)
+        for attribute in statement.get_attributes()
+    ]
+
+
+# PostgreSQL types with a matching Arrow type, by asyncpg type name. asyncpg
+# decodes interval as a timedelta with months as 30 days and years as 365, so
+# durations carry that approximation. Everything else (numeric, uuid, inet,
+# ranges, arrays, ...) is written as text.
+_ARROW_TYPES: dict[str, Callable[[Any], Any]] = {
+    "bool": lambda pa: pa.bool_(),
+    "int2": lambda pa: pa.int16(),
+    "int4": lambda pa: pa.int32(),
+    "int8": lambda pa: pa.int64(),
+    "oid": lambda pa: pa.int64(),
+    "float4": lambda pa: pa.float32(),
+    "float8": lambda pa: pa.float64(),
+    "text": lambda pa: pa.string(),
+    "varchar": lambda pa: pa.string(),
+    "bpchar": lambda pa: pa.string(),
+    "name": lambda pa: pa.string(),
+    "json": lambda pa: pa.string(),
+    "jsonb": lambda pa: pa.string(),
+    "bytea": lambda pa: pa.binary(),
+    "date": lambda pa: pa.date32(),
+    "time": lambda pa: pa.time64("us"),
+    "timestamp": lambda pa: pa.timestamp("us"),
+    "timestamptz": lambda pa: pa.timestamp("us", tz="UTC"),
+    "interval": lambda pa: pa.duration("us"),
+}
+
+
+def _as_text(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _arrow_type(pa: Any, type_name: str) -> Any:
+    arrow_type = _ARROW_TYPES.get(type_name)
+    return pa.string() if arrow_type is None else arrow_type(pa)
+
+
+def parquet_schema(pa: Any, columns: Sequence[ColumnType]) -> Any:
+    return pa.schema(
+        pa.field(column.name, _arrow_type(pa, column.type_name)) for column in columns
+    )
+
+
+async def write_parquet(
+    batches: AsyncIterable[QueryResult],
+    target: ExportTarget,
+    columns: Sequence[ColumnType],
+) -> ExportResult:
+    pa, pq = _load_pyarrow()
+    started = time.perf_counter()
+    rows = 0
+    schema = parquet_schema(pa, columns)
+    textual = [column.type_name not in _ARROW_TYPES for column in columns]
+    with _open_target(target) as f:
+        with pq.ParquetWriter(f, schema) as writer:
+            async for batch in batches:
+                # By position: a query may return several columns with one name.
+                arrays = [
+                    pa.array(
+                        [_as_text(v) for v in batch.column_at(position)]
+                        if as_text
+                        else batch.column_at(position),
+                        type=field.type,
+                    )
+                    for position, (field, as_text) in enumerate(
+                        zip(schema, textual, strict=True)
+                    )
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(batch)
+        written = f.tell() if f.seekable() else 0
+    return ExportResult(rows, written, time.perf_counter() - started)
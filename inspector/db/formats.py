@@ -0,0 +1,24 @@
+import os
+from pathlib import Path
+from typing import Literal, get_args
+
+# Kept free of third-party imports: the CLI reads these to build its help
+# text before deciding whether a database layer is needed at all.
+
+ExportFormat = Literal["csv", "jsonl", "parquet"]
+EXPORT_FORMATS: tuple[str, ...] = get_args(ExportFormat)
+RowFormat = Literal["tsv", "jsonl"]
+ROW_FORMATS: tuple[str, ...] = get_args(RowFormat)
+RangeSplit = Literal["key", "ctid"]
+RANGE_SPLITS: tuple[str, ...] = get_args(RangeSplit)
+
+_EXTENSIONS: dict[str, ExportFormat] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+def format_for_path(path: str | os.PathLike[str]) -> ExportFormat | None:
+    return _EXTENSIONS.get(Path(path).suffix.lower())
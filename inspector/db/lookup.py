@@ -0,0 +1,81 @@
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
+
+from inspector.db.metadata import IndexInfo, TableConstraints
+from inspector.db.sql import qualified_table, quote_identifier, quote_literal
+
+LOOKUP_LIMIT = 500
+# Unindexed lookups on tables estimated above this many rows ask first.
+SEQ_SCAN_WARNING_ROWS = 100_000
+
+
+class LookupAdvice(NamedTuple):
+    # None when the filter cannot use an index.
+    index: IndexInfo | None
+    # Set when the lookup would scan a large table.
+    warning: str | None
+
+
+# '' escapes a quote in a quoted value; an unquoted NULL looks for NULLs.
+def parse_lookup(value: str) -> tuple[str, str | None]:
+    column, sep, raw = value.partition("=")
+    column, raw = column.strip(), raw.strip()
+    if not sep or not column:
+        raise ValueError("Expected column = value.")
+    if column.startswith('"') and column.endswith('"') and len(column) > 1:
+        column = column[1:-1].replace('""', '"')
+    if raw.upper() == "NULL":
+        return column, None
+    if len(raw) > 1 and raw.startswith("'") and raw.endswith("'"):
+        raw = raw[1:-1].replace("''", "'")
+    return column, raw
+
+
+def advise_lookup(
+    constraints: TableConstraints,
+    columns: Iterable[str],
+    estimated_rows: int | None,
+) -> LookupAdvice:
+    columns = list(columns)
+    index = constraints.lookup_index(columns)
+    if index is not None or estimated_rows is None:
+        return LookupAdvice(index, None)
+    if estimated_rows < SEQ_SCAN_WARNING_ROWS:
+        return LookupAdvice(None, None)
+    indexed = constraints.indexed_columns()
+    warning = (
+        f"No index on {', '.join(columns)}; this scans ~{estimated_rows:,} rows"
+    )
+    if indexed:
+        warning += f" (indexed: {', '.join(indexed)})"
+    return LookupAdvice(None, warning)
+
+
+# Typed text is inlined as an untyped literal so the server coerces it to the column's
+# type and can use an index; values from result rows are bound.
+def build_lookup_query(
+    schema_name: str,
+    table_name: str,
+    conditions: Mapping[str, Any],
+    limit: int = LOOKUP_LIMIT,
+) -> tuple[str, dict[str, Any]]:
+    predicates: list[str] = []
+    params: dict[str, Any] = {"limit": limit}
+    for position, (column, value) in enumerate(conditions.items()):
+        name = quote_identifier(column)
+        if value is None:
+            predicates.append(f"{name} IS NULL")
+        elif isinstance(value, str):
+            # text() would read ":word" inside the literal as a bind parameter.
+            literal = quote_literal(value).replace(":", "\\:")
+            predicates.append(f"{name} = {literal}")
+        else:
+            params[f"v{position}"] = value
+            predicates.append(f"{name} = :v{position}")
+    if not predicates:
+        raise ValueError("A lookup needs at least one condition.")
+    sql = (
+        f"SELECT * FROM {qualified_table(schema_name, table_name)} "
+        f"WHERE {' AND '.join(predicates)} LIMIT :limit"
+    )
+    return sql, params
@@ -1,71 +1,458 @@
-from typing import TypeVar
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from inspector.db.object_index import ObjectIndex
+
 
 class SchemaInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Schema name")
 
 
 class TableInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     schema_name: str = Field(..., description="Schema name")
     table_name: str = Field(..., description="Table name")
+    estimated_rows: int | None = Field(
+        default=None, description="Planner row estimate (pg_class.reltuples)"
+    )
+    total_bytes: int | None = Field(
+        default=None, description="Table size including indexes and TOAST"
+    )
+    last_analyzed: datetime | None = Field(
+        default=None, description="Latest manual or automatic ANALYZE"
+    )
+    partition_of: str | None = Field(
+        default=None, description="Parent table in the same schema, for partitions"
+    )
 
 
 class ColumnInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     column_name: str = Field(..., description="Column name")
     data_type: str = Field(..., description="Data type")
     is_nullable: str = Field(..., description="YES or NO")
 
 
-_ModelT = TypeVar("_ModelT", bound=BaseModel)
+# Index methods that can answer an equality lookup on their leading column.
+_EQUALITY_INDEX_METHODS = frozenset({"btree", "hash"})
+
+
+class IndexInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    index_name: str = Field(..., description="Index name")
+    columns: tuple[str, ...] = Field(
+        ..., description="Key columns in order; expressions as their SQL text"
+    )
+    method: str = Field(default="btree", description="Access method (pg_am.amname)")
+    is_unique: bool = Field(default=False, description="Enforces uniqueness")
+    is_primary: bool = Field(default=False, description="Backs the primary key")
+    is_partial: bool = Field(default=False, description="Has a WHERE predicate")
+    is_valid: bool = Field(default=True, description="Usable by the planner")
+
+    @property
+    def supports_lookup(self) -> bool:
+        return (
+            self.is_valid
+            and not self.is_partial
+            and bool(self.columns)
+            and self.method in _EQUALITY_INDEX_METHODS
+        )
+
+
+class ForeignKeyInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    constraint_name: str = Field(..., description="Constraint name")
+    columns: tuple[str, ...] = Field(..., description="Referencing columns")
+    referenced_schema: str = Field(..., description="Schema of the referenced table")
+    referenced_table: str = Field(..., description="Referenced table")
+    referenced_columns: tuple[str, ...] = Field(
+        ..., description="Referenced key columns, matching ``columns`` by position"
+    )
+
+
+class TableConstraints(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    indexes: tuple[IndexInfo, ...] = ()
+    foreign_keys: tuple[ForeignKeyInfo, ...] = ()
+
+    @property
+    def primary_key(self) -> tuple[str, ...]:
+        for index in self.indexes:
+            if index.is_primary:
+                return index.columns
+        return ()
+
+    def indexed_columns(self) -> tuple[str, ...]:
+        ordered = sorted(
+            (i for i in self.indexes if i.supports_lookup),
+            key=lambda i: (not i.is_primary, not i.is_unique),
+        )
+        return tuple(dict.fromkeys(i.columns[0] for i in ordered))
+
+    # A unique index identifies rows only when every key column is NOT NULL;
+    # expression columns never match a column name, so they rule the index out too.
+    def key_columns(self, columns: Iterable[ColumnInfo]) -> tuple[str, ...]:
+        not_null = {c.column_name for c in columns if c.is_nullable == "NO"}
+        candidates = [
+            i
+            for i in self.indexes
+            if i.is_unique
+            and i.is_valid
+            and not i.is_partial
+            and i.columns
+            and not_null.issuperset(i.columns)
+        ]
+        best = min(
+            candidates, key=lambda i: (not i.is_primary, len(i.columns)), default=None
+        )
+        return best.columns if best is not None else ()
+
+    # Prefers indexes covering more leading columns, then primary and unique ones; None
+    # means the lookup would scan the table.
+    def lookup_index(self, columns: Iterable[str]) -> IndexInfo | None:
+        wanted = set(columns)
+
+        def rank(index: IndexInfo) -> tuple[int, bool, bool]:
+            covered = 0
+            for column in index.columns:
+                if column not in wanted:
+                    break
+                covered += 1
+            return covered, index.is_primary, index.is_unique
+
+        candidates = [
+            i for i in self.indexes if i.supports_lookup and i.columns[0] in wanted
+        ]
+        return max(candidates, key=rank, default=None)
+
+
+_CATALOG_SCHEMAS_SQL = """
+SELECT n.nspname AS name
+FROM pg_namespace n
+WHERE n.nspname !~ '^pg_(toast|temp_)'
+ORDER BY n.nspname
+"""
+
+_TABLES_SQL = """
+SELECT c.oid AS relid,
+       n.nspname AS schema_name,
+       c.relname AS table_name,
+       CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END
+           AS estimated_rows,
+       pg_total_relation_size(c.oid) AS total_bytes,
+       GREATEST(s.last_analyze, s.last_autoanalyze) AS last_analyzed,
+       parent.relname AS partition_of
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+LEFT JOIN pg_inherits inh ON c.relispartition AND inh.inhrelid = c.oid
+LEFT JOIN pg_class parent
+  ON parent.oid = inh.inhparent AND parent.relnamespace = c.relnamespace
+WHERE c.relkind IN ('r', 'p')
+  AND (pg_has_role(c.relowner, 'USAGE')
+       OR has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, REFERENCES'))
+"""
+
+_SCHEMA_TABLES_SQL = f"""
+{_TABLES_SQL}
+  AND n.nspname = :schema_name
+ORDER BY c.relname
+"""
+
+_SCHEMAS_TABLES_SQL = f"""
+{_TABLES_SQL}
+  AND n.nspname = ANY(CAST(:schema_names AS text[]))
+ORDER BY n.nspname, c.relname
+"""
+
+_TABLE_COLUMNS_SQL = """
+SELECT c.relname AS table_name,
+       a.attname AS column_name,
+       format_type(a.atttypid, a.atttypmod) AS data_type,
+       CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a
+  ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+WHERE n.nspname = :schema_name
+  AND c.relname = ANY(CAST(:table_names AS text[]))
+ORDER BY c.relname, a.attnum
+"""
+
+_CATALOG_COLUMNS_SQL = f"""
+WITH relations AS MATERIALIZED (
+{_TABLES_SQL}
+  AND n.nspname !~ '^pg_(toast|temp_)'
+)
+SELECT r.schema_name,
+       r.table_name,
+       r.estimated_rows,
+       r.total_bytes,
+       r.last_analyzed,
+       r.partition_of,
+       a.attname AS column_name,
+       format_type(a.atttypid, a.atttypmod) AS data_type,
+       CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable
+FROM relations r
+LEFT JOIN pg_attribute a
+  ON a.attrelid = r.relid AND a.attnum > 0 AND NOT a.attisdropped
+ORDER BY r.schema_name, r.table_name, a.attnum
+"""
+
+
+_INDEXES_SQL = """
+SELECT n.nspname AS schema_name,
+       c.relname AS table_name,
+       ic.relname AS index_name,
+       am.amname AS method,
+       i.indisunique AS is_unique,
+       i.indisprimary AS is_primary,
+       i.indpred IS NOT NULL AS is_partial,
+       i.indisvalid AS is_valid,
+       ARRAY(
+           SELECT coalesce(a.attname, pg_get_indexdef(i.indexrelid, k.ord::int, true))
+           FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+           LEFT JOIN pg_attribute a
+             ON a.attrelid = i.indrelid AND a.attnum = k.attnum AND k.attnum > 0
+           WHERE k.ord <= i.indnkeyatts
+           ORDER BY k.ord
+       ) AS columns
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_class ic ON ic.oid = i.indexrelid
+JOIN pg_am am ON am.oid = ic.relam
+WHERE c.relkind IN ('r', 'p')
+"""
+
+_FOREIGN_KEYS_SQL = """
+SELECT n.nspname AS schema_name,
+       c.relname AS table_name,
+       con.conname AS constraint_name,
+       rn.nspname AS referenced_schema,
+       rc.relname AS referenced_table,
+       ARRAY(
+           SELECT a.attname
+           FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+           JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+           ORDER BY k.ord
+       ) AS columns,
+       ARRAY(
+           SELECT a.attname
+           FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+           JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+           ORDER BY k.ord
+       ) AS referenced_columns
+FROM pg_constraint con
+JOIN pg_class c ON c.oid = con.conrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_class rc ON rc.oid = con.confrelid
+JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+WHERE con.contype = 'f'
+"""
+
+_TABLES_FILTER = """
+  AND n.nspname = :schema_name
+  AND c.relname = ANY(CAST(:table_names AS text[]))
+"""
+
+_TABLE_INDEXES_SQL = f"{_INDEXES_SQL}{_TABLES_FILTER}ORDER BY ic.relname"
+_TABLE_FOREIGN_KEYS_SQL = f"{_FOREIGN_KEYS_SQL}{_TABLES_FILTER}ORDER BY con.conname"
+
+_CATALOG_FILTER = """
+  AND n.nspname !~ '^pg_(toast|temp_)'
+"""
+
+_CATALOG_INDEXES_SQL = (
+    f"{_INDEXES_SQL}{_CATALOG_FILTER}ORDER BY n.nspname, c.relname, ic.relname"
+)
+_CATALOG_FOREIGN_KEYS_SQL = (
+    f"{_FOREIGN_KEYS_SQL}{_CATALOG_FILTER}ORDER BY n.nspname, c.relname, con.conname"
+)
+
+
+def _group_constraints(
+    index_rows: Iterable[Mapping[str, Any]], foreign_key_rows: Iterable[Mapping[str, Any]]
+) -> dict[tuple[str, str], TableConstraints]:
+    indexes: dict[tuple[str, str], list[IndexInfo]] = {}
+    foreign_keys: dict[tuple[str, str], list[ForeignKeyInfo]] = {}
+    for row in index_rows:
+        indexes.setdefault((row["schema_name"], row["table_name"]), []).append(
+            IndexInfo.model_validate(dict(row))
+        )
+    for row in foreign_key_rows:
+        foreign_keys.setdefault((row["schema_name"], row["table_name"]), []).append(
+            ForeignKeyInfo.model_validate(dict(row))
+        )
+    return {
+        key: TableConstraints(
+            indexes=tuple(indexes.get(key, ())),
+            foreign_keys=tuple(foreign_keys.get(key, ())),
+        )
+        for key in indexes.keys() | foreign_keys.keys()
+    }
 
 
 class MetadataProvider:
-    def __init__(self) -> None:
+    def __init__(self, catalog_snapshot: bool = False) -> None:
+        self._catalog_snapshot = catalog_snapshot
+        self._catalog_loaded = False
         self._schema_cache: tuple[SchemaInfo, ...] | None = None
         self._table_cache: dict[str, tuple[TableInfo, ...]] = {}
         self._column_cache: dict[tuple[str, str], tuple[ColumnInfo, ...]] = {}
+        self._constraint_cache: dict[tuple[str, str], TableConstraints] = {}
+        self._object_index = ObjectIndex()
 
-    def _copy_models(self, rows: tuple[_ModelT, ...]) -> list[_ModelT]:
-        return [row.model_copy(deep=True) for row in rows]
+    @property
+    def catalog_snapshot(self) -> bool:
+        return self._catalog_snapshot
+
+    @property
+    def object_index(self) -> ObjectIndex:
+        return self._object_index
 
     def _reset_caches(self) -> None:
+        self._catalog_loaded = False
         self._schema_cache = None
         self._table_cache.clear()
         self._column_cache.clear()
+        self._constraint_cache.clear()
+        self._object_index.clear()
 
     def clear_cache(self) -> None:
         self._reset_caches()
 
+    def cached_schemas(self) -> tuple[SchemaInfo, ...] | None:
+        if self._catalog_snapshot and not self._catalog_loaded:
+            return None
+        return self._schema_cache
+
+    def cached_tables(self, schema_name: str) -> tuple[TableInfo, ...] | None:
+        return self._table_cache.get(schema_name)
+
+    def cached_columns(
+        self, schema_name: str, table_name: str
+    ) -> tuple[ColumnInfo, ...] | None:
+        return self._column_cache.get((schema_name, table_name))
+
+    def cached_key_columns(
+        self, schema_name: str, table_name: str
+    ) -> tuple[str, ...] | None:
+        constraints = self.cached_constraints(schema_name, table_name)
+        columns = self.cached_columns(schema_name, table_name)
+        if constraints is None or columns is None:
+            return None
+        return constraints.key_columns(columns)
+
+    def cached_constraints(
+        self, schema_name: str, table_name: str
+    ) -> TableConstraints | None:
+        return self._constraint_cache.get((schema_name, table_name))
+
+    def mark_catalog_loaded(self) -> None:
+        self._catalog_loaded = True
+
+    def prime_schemas(self, schemas: Iterable[SchemaInfo]) -> tuple[SchemaInfo, ...]:
+        self._schema_cache = tuple(schemas)
+        self._object_index.add_schemas(s.name for s in self._schema_cache)
+        return self._schema_cache
+
+    def prime_tables(
+        self, schema_name: str, tables: Iterable[TableInfo]
+    ) -> tuple[TableInfo, ...]:
+        cached = self._table_cache[schema_name] = tuple(tables)
+        self._object_index.add_tables(schema_name, (t.table_name for t in cached))
+        return cached
+
+    def prime_columns(
+        self, schema_name: str, table_name: str, columns: Iterable[ColumnInfo]
+    ) -> tuple[ColumnInfo, ...]:
+        cached = self._column_cache[(schema_name, table_name)] = tuple(columns)
+        self._object_index.add_columns(
+            schema_name, table_name, (c.column_name for c in cached)
+        )
+        return cached
+
+    def prime_constraints(
+        self, schema_name: str, table_name: str, constraints: TableConstraints
+    ) -> TableConstraints:
+        self._constraint_cache[(schema_name, table_name)] = constraints
+        return constraints
+
+    async def _ensure_catalog(self, session: AsyncSession) -> None:
+        if self._catalog_snapshot and not self._catalog_loaded:
+            await self.load_catalog(session)
+
+    async def load_catalog(self, session: AsyncSession) -> None:
+        schema_result = await session.execute(text(_CATALOG_SCHEMAS_SQL))
+        schemas = tuple(
+            SchemaInfo.model_validate(dict(r)) for r in schema_result.mappings().all()
+        )
+        column_result = await session.execute(text(_CATALOG_COLUMNS_SQL))
+        tables: dict[str, list[TableInfo]] = {s.name: [] for s in schemas}
+        columns: dict[tuple[str, str], list[ColumnInfo]] = {}
+        for row in column_result.mappings().all():
+            key = (row["schema_name"], row["table_name"])
+            table_columns = columns.get(key)
+            if table_columns is None:
+                table_columns = columns[key] = []
+                tables.setdefault(key[0], []).append(
+                    TableInfo(
+                        schema_name=key[0],
+                        table_name=key[1],
+                        estimated_rows=row["estimated_rows"],
+                        total_bytes=row["total_bytes"],
+                        last_analyzed=row["last_analyzed"],
+                        partition_of=row["partition_of"],
+                    )
+                )
+            if row["column_name"] is not None:
+                table_columns.append(
+                    ColumnInfo(
+                        column_name=row["column_name"],
+                        data_type=row["data_type"],
+                        is_nullable=row["is_nullable"],
+                    )
+                )
+        index_result = await session.execute(text(_CATALOG_INDEXES_SQL))
+        foreign_key_result = await session.execute(text(_CATALOG_FOREIGN_KEYS_SQL))
+        constraints = _group_constraints(
+            index_result.mappings().all(), foreign_key_result.mappings().all()
+        )
+        self.prime_schemas(schemas)
+        for name, rows in tables.items():
+            self.prime_tables(name, rows)
+        for (schema_name, table_name), rows in columns.items():
+            self.prime_columns(schema_name, table_name, rows)
+            self.prime_constraints(
+                schema_name,
+                table_name,
+                constraints.get((schema_name, table_name), TableConstraints()),
+            )
+        self._catalog_loaded = True
+
     async def list_columns(
         self, session: AsyncSession, schema_name: str, table_name: str
-    ) -> list[ColumnInfo]:
-        key = (schema_name, table_name)
-        cached = self._column_cache.get(key)
-        if cached is not None:
-            return self._copy_models(cached)
-        result = await session.execute(
-            text(
-                """
-                SELECT column_name, data_type, is_nullable
-                FROM information_schema.columns
-                WHERE table_schema = :schema_name AND table_name = :table_name
-                ORDER BY ordinal_position
-                """
-            ),
-            {"schema_name": schema_name, "table_name": table_name},
-        )
-        rows = result.mappings().all()
-        parsed = tuple(ColumnInfo.model_validate(dict(r)) for r in rows)
-        self._column_cache[key] = parsed
-        return self._copy_models(parsed)
+    ) -> tuple[ColumnInfo, ...]:
+        batch = await self.list_columns_batch(session, schema_name, [table_name])
+        return batch[table_name]
 
-    async def list_schemas(self, session: AsyncSession) -> list[SchemaInfo]:
+    async def list_schemas(self, session: AsyncSession) -> tuple[SchemaInfo, ...]:
+        await self._ensure_catalog(session)
         if self._schema_cache is not None:
-            return self._copy_models(self._schema_cache)
+            return self._schema_cache
         result = await session.execute(
             text(
                 """
@@ -77,26 +464,126 @@ class MetadataProvider:
             )
         )
         rows = result.mappings().all()
-        parsed = tuple(SchemaInfo.model_validate(dict(r)) for r in rows)
-        self._schema_cache = parsed
-        return self._copy_models(parsed)
+        return self.prime_schemas(SchemaInfo.model_validate(dict(r)) for r in rows)
 
-    async def list_tables(self, session: AsyncSession, schema_name: str) -> list[TableInfo]:
+    async def list_tables(
+        self, session: AsyncSession, schema_name: str
+    ) -> tuple[TableInfo, ...]:
+        await self._ensure_catalog(session)
         cached = self._table_cache.get(schema_name)
         if cached is not None:
-            return self._copy_models(cached)
+            return cached
         result = await session.execute(
-            text(
-                """
-                SELECT table_schema AS schema_name, table_name AS table_name
-                FROM information_schema.tables
-                WHERE table_schema = :schema_name AND table_type = 'BASE TABLE'
-                ORDER BY table_name
-                """
-            ),
-            {"schema_name": schema_name},
+            text(_SCHEMA_TABLES_SQL), {"schema_name": schema_name}
         )
         rows = result.mappings().all()
-        parsed = tuple(TableInfo.model_validate(dict(r)) for r in rows)
-        self._table_cache[schema_name] = parsed
-        return self._copy_models(parsed)
+        return self.prime_tables(
+            schema_name, (TableInfo.model_validate(dict(r)) for r in rows)
+        )
+
+    async def list_tables_batch(
+        self, session: AsyncSession, schema_names: Sequence[str]
+    ) -> dict[str, tuple[TableInfo, ...]]:
+        await self._ensure_catalog(session)
+        found = {n: c for n in schema_names if (c := self._table_cache.get(n)) is not None}
+        missing = [n for n in schema_names if n not in found]
+        if not missing:
+            return found
+        result = await session.execute(
+            text(_SCHEMAS_TABLES_SQL), {"schema_names": missing}
+        )
+        grouped: dict[str, list[TableInfo]] = {name: [] for name in missing}
+        for row in result.mappings().all():
+            table = TableInfo.model_validate(dict(row))
+            grouped.setdefault(table.schema_name, []).append(table)
+        for name, tables in grouped.items():
+            found[name] = self.prime_tables(name, tables)
+        return found
+
+    async def list_columns_batch(
+        self, session: AsyncSession, schema_name: str, table_names: Sequence[str]
+    ) -> dict[str, tuple[ColumnInfo, ...]]:
+        await self._ensure_catalog(session)
+        found: dict[str, tuple[ColumnInfo, ...]] = {}
+        missing: list[str] = []
+        for name in table_names:
+            cached = self._column_cache.get((schema_name, name))
+            if cached is None:
+                missing.append(name)
+            else:
+                found[name] = cached
+        if not missing:
+            return found
+        result = await session.execute(
+            text(_TABLE_COLUMNS_SQL),
+            {"schema_name": schema_name, "table_names": missing},
+        )
+        grouped: dict[str, list[ColumnInfo]] = {name: [] for name in missing}
+        for row in result.mappings().all():
+            grouped.setdefault(row["table_name"], []).append(
+                ColumnInfo(
+                    column_name=row["column_name"],
+                    data_type=row["data_type"],
+                    is_nullable=row["is_nullable"],
+                )
+            )
+        for name, columns in grouped.items():
+            found[name] = self.prime_columns(schema_name, name, columns)
+        return found
+
+    async def list_constraints(
+        self, session: AsyncSession, schema_name: str, table_name: str
+    ) -> TableConstraints:
+        batch = await self.list_constraints_batch(session, schema_name, [table_name])
+        return batch[table_name]
+
+    async def list_constraints_batch(
+        self, session: AsyncSession, schema_name: str, table_names: Sequence[str]
+    ) -> dict[str, TableConstraints]:
+        await self._ensure_catalog(session)
+        found: dict[str, TableConstraints] = {}
+        missing: list[str] = []
+        for name in table_names:
+            cached = self._constraint_cache.get((schema_name, name))
+            if cached is None:
+                missing.append(name)
+            else:
+                found[name] = cached
+        if not missing:
+            return found
+        params = {"schema_name": schema_name, "table_names": missing}
+        index_result = await session.execute(text(_TABLE_INDEXES_SQL), params)
+        foreign_key_result = await session.execute(text(_TABLE_FOREIGN_KEYS_SQL), params)
+        loaded = _group_constraints(
+            index_result.mappings().all(), foreign_key_result.mappings().all()
+        )
+        for name in missing:
+            found[name] = self.prime_constraints(
+                schema_name, name, loaded.get((schema_name, name), TableConstraints())
+            )
+        return found
+
+    async def list_key_columns(
+        self, session: AsyncSession, schema_name: str, table_name: str
+    ) -> tuple[str, ...]:
+        constraints = await self.list_constraints(session, schema_name, table_name)
+        columns = await self.list_columns(session, schema_name, table_name)
+        return constraints.key_columns(columns)
+
+
+def group_partitions(
+    tables: Sequence[TableInfo],
+) -> tuple[list[TableInfo], dict[str, list[TableInfo]]]:
+    top_level: list[TableInfo] = []
+    partitions: dict[str, list[TableInfo]] = {}
+    for table in tables:
+        if table.partition_of is None:
+            top_level.append(table)
+        else:
+            partitions.setdefault(table.partition_of, []).append(table)
+    # Partitions whose parent is not listed (no privilege on it) stay visible.
+    names = {t.table_name for t in tables} if partitions else set()
+    for parent in [p for p in partitions if p not in names]:
+        top_level.extend(partitions.pop(parent))
+    return top_level, partitions
+
@@ -0,0 +1,211 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from operator import itemgetter
+from typing import NamedTuple
+
+# Postings longer than this are only scanned until the budget is spent, which
+# keeps lookups for very common fragments ("id", "_at") bounded.
+SCAN_BUDGET = 2048
+DEFAULT_LIMIT = 20
+# Candidates with the most shared trigrams are re-ranked by the (slower)
+# string scorer; this many per requested result.
+RERANK_FACTOR = 4
+
+_KIND_BONUS = {"table": 2.0, "schema": 1.0, "column": 0.0}
+
+
+class CatalogObject(NamedTuple):
+    kind: str
+    schema_name: str
+    table_name: str | None = None
+    column_name: str | None = None
+
+    @property
+    def name(self) -> str:
+        return self.column_name or self.table_name or self.schema_name
+
+    @property
+    def parent_name(self) -> str:
+        if self.column_name is not None:
+            return f"{self.schema_name}.{self.table_name}"
+        if self.table_name is not None:
+            return self.schema_name
+        return ""
+
+    @property
+    def qualified_name(self) -> str:
+        parent = self.parent_name
+        return f"{parent}.{self.name}" if parent else self.name
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_trigrams(query: str) -> set[str]:
+    # The padded leading trigrams make prefix matches share more trigrams
+    # than matches further into the name; queries under three characters
+    # only have those, so they match prefixes only.
+    return _trigrams(query)
+
+
+def _score(name: str, query: str, shared: int, total: int) -> float:
+    if name == query:
+        base = 1000.0
+    elif name.startswith(query):
+        base = 800.0
+    else:
+        position = name.find(query)
+        if position > 0 and name[position - 1] in "_ .":
+            base = 600.0
+        elif position > 0:
+            base = 400.0
+        else:
+            base = 300.0 * shared / total
+    return base - len(name) * 0.5
+
+
+class _TrigramIndex:
+    __slots__ = ("objects", "names", "parents", "postings", "by_name", "ordered")
+
+    def __init__(self) -> None:
+        self.objects: list[CatalogObject] = []
+        self.names: list[str] = []
+        self.parents: list[str] = []
+        self.postings: dict[str, array] = {}
+        self.by_name: dict[str, list[int]] = {}
+        # Distinct names, sorted on the first lookup after new names arrive.
+        self.ordered: list[str] | None = []
+
+    def add(self, obj: CatalogObject) -> None:
+        object_id = len(self.objects)
+        name = obj.name.lower()
+        self.objects.append(obj)
+        self.names.append(name)
+        self.parents.append(obj.parent_name.lower())
+        ids = self.by_name.get(name)
+        if ids is None:
+            ids = self.by_name[name] = []
+            self.ordered = None
+        ids.append(object_id)
+        for gram in _trigrams(name):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("I")
+            posting.append(object_id)
+
+    # Rarest postings first; postings that no longer fit the scan budget are skipped and
+    # counted, since common trigrams carry little information.
+    def candidates(self, grams: set[str]) -> tuple[Counter[int], int]:
+        postings = sorted(
+            (p for g in grams if (p := self.postings.get(g)) is not None), key=len
+        )
+        counts: Counter[int] = Counter()
+        if not postings:
+            return counts, 0
+        counts.update(postings[0][:SCAN_BUDGET])
+        scanned = min(len(postings[0]), SCAN_BUDGET)
+        for position, posting in enumerate(postings[1:], start=1):
+            if scanned + len(posting) > SCAN_BUDGET:
+                return counts, len(postings) - position
+            counts.update(posting)
+            scanned += len(posting)
+        return counts, 0
+
+    # Exact matches first, then prefix matches in name order. The trigram scan
+    # may cut a common fragment short; these must be found wherever they were
+    # inserted.
+    def direct_hits(self, query: str, parent_query: str, limit: int) -> list[int]:
+        if self.ordered is None:
+            self.ordered = sorted(self.by_name)
+        hits: list[int] = []
+        scanned = 0
+        for position in range(bisect_left(self.ordered, query), len(self.ordered)):
+            name = self.ordered[position]
+            if not name.startswith(query):
+                break
+            for object_id in self.by_name[name]:
+                scanned += 1
+                if scanned > SCAN_BUDGET or len(hits) >= limit:
+                    return hits
+                if parent_query in self.parents[object_id]:
+                    hits.append(object_id)
+        return hits
+
+
+# Columns are indexed apart from schemas and tables so that common column names cannot
+# crowd tables out of the scan budget.
+class ObjectIndex:
+    def __init__(self) -> None:
+        self._relations = _TrigramIndex()
+        self._columns = _TrigramIndex()
+        self._seen: set[CatalogObject] = set()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, obj: object) -> bool:
+        return obj in self._seen
+
+    def clear(self) -> None:
+        self._relations = _TrigramIndex()
+        self._columns = _TrigramIndex()
+        self._seen.clear()
+
+    def add(self, obj: CatalogObject) -> None:
+        if obj in self._seen:
+            return
+        self._seen.add(obj)
+        target = self._columns if obj.kind == "column" else self._relations
+        target.add(obj)
+
+    def add_schemas(self, schema_names: Iterable[str]) -> None:
+        for name in schema_names:
+            self.add(CatalogObject("schema", name))
+
+    def add_tables(self, schema_name: str, table_names: Iterable[str]) -> None:
+        for name in table_names:
+            self.add(CatalogObject("table", schema_name, name))
+
+    def add_columns(
+        self, schema_name: str, table_name: str, column_names: Iterable[str]
+    ) -> None:
+        for name in column_names:
+            self.add(CatalogObject("column", schema_name, table_name, name))
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[CatalogObject]:
+        query = query.strip().lower()
+        parent_query = ""
+        if "." in query:
+            parent_query, query = query.rsplit(".", 1)
+        if not query:
+            return []
+        grams = _query_trigrams(query)
+        shortlist = limit * RERANK_FACTOR
+        scored: list[tuple[float, CatalogObject]] = []
+        for index in (self._relations, self._columns):
+            counts, skipped = index.candidates(grams)
+            if parent_query:
+                parents = index.parents
+                counts = Counter(
+                    {i: n for i, n in counts.items() if parent_query in parents[i]}
+                )
+            # Require half of the query trigrams to be shared, less the ones
+            # the scan budget skipped.
+            threshold = max((len(grams) + 1) // 2 - skipped, 1)
+            direct = index.direct_hits(query, parent_query, shortlist)
+            ranked = sorted(counts, key=counts.__getitem__, reverse=True)
+            matched = set(direct)
+            for object_id in list(dict.fromkeys([*direct, *ranked]))[:shortlist]:
+                # Exact and prefix matches share every query trigram.
+                shared = len(grams) if object_id in matched else counts[object_id]
+                if shared < threshold:
+                    break
+                obj = index.objects[object_id]
+                score = _score(index.names[object_id], query, shared, len(grams))
+                scored.append((score + _KIND_BONUS[obj.kind], obj))
+        scored.sort(key=itemgetter(0), reverse=True)
+        return [obj for _, obj in scored[:limit]]
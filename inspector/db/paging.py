@@ -0,0 +1,505 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Literal, NamedTuple
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.result import QueryResult
+from inspector.db.sql import (
+    HEAP_BLOCKS_SQL,
+    HISTOGRAM_BOUNDS_SQL,
+    qualified_table,
+    quote_identifier,
+)
+
+PAGE_SIZE = 100
+PAGE_CACHE_SIZE = 16
+CTID_COLUMN = "__inspector_ctid"
+# Keyless tables are read in windows of heap blocks so that ORDER BY ctid only
+# sorts one window; windows that come back short double up to the maximum.
+CTID_WINDOW_BLOCKS = 64
+CTID_MAX_WINDOW_BLOCKS = 8192
+
+Direction = Literal["forward", "backward"]
+# Key column values, or (leaf heap index, ctid) for keyless tables.
+Bookmark = tuple[Any, ...]
+
+
+class Heap(NamedTuple):
+    schema_name: str
+    table_name: str
+    blocks: int
+
+
+def _bookmark_params(bookmark: Bookmark) -> dict[str, Any]:
+    return {f"k{i}": value for i, value in enumerate(bookmark)}
+
+
+def build_keyset_query(
+    schema_name: str,
+    table_name: str,
+    key_columns: Sequence[str],
+    page_size: int,
+    direction: Direction = "forward",
+    bookmark: Bookmark | None = None,
+) -> tuple[str, dict[str, Any]]:
+    quoted_keys = ", ".join(quote_identifier(c) for c in key_columns)
+    order = "" if direction == "forward" else " DESC"
+    order_by = ", ".join(f"{quote_identifier(c)}{order}" for c in key_columns)
+    where = ""
+    params: dict[str, Any] = {}
+    if bookmark is not None:
+        op = ">" if direction == "forward" else "<"
+        placeholders = ", ".join(f":k{i}" for i in range(len(bookmark)))
+        where = f" WHERE ({quoted_keys}) {op} ({placeholders})"
+        params = _bookmark_params(bookmark)
+    sql = (
+        f"SELECT * FROM {qualified_table(schema_name, table_name)}{where} "
+        f"ORDER BY {order_by} LIMIT {page_size}"
+    )
+    return sql, params
+
+
+def build_ctid_query(
+    schema_name: str,
+    table_name: str,
+    page_size: int,
+    direction: Direction = "forward",
+    bookmark: str | None = None,
+    block_range: tuple[int, int | None] = (0, None),
+    columns: Sequence[str] | None = None,
+) -> tuple[str, dict[str, Any]]:
+    start, stop = block_range
+    predicates = ["ctid >= CAST(:lo AS tid)"]
+    params: dict[str, Any] = {"lo": f"({start},0)"}
+    if stop is not None:
+        predicates.append("ctid < CAST(:hi AS tid)")
+        params["hi"] = f"({stop},0)"
+    if bookmark is not None:
+        op = ">" if direction == "forward" else "<"
+        predicates.append(f"ctid {op} CAST(:k0 AS tid)")
+        params["k0"] = bookmark
+    order = "" if direction == "forward" else " DESC"
+    select = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+    sql = (
+        f"SELECT ctid::text AS {quote_identifier(CTID_COLUMN)}, {select} "
+        f"FROM {qualified_table(schema_name, table_name)} "
+        f"WHERE {' AND '.join(predicates)} ORDER BY ctid{order} LIMIT {page_size}"
+    )
+    return sql, params
+
+
+def _tid_block(tid: str) -> int:
+    return int(tid.strip("()").split(",")[0])
+
+
+def build_seek_query(
+    schema_name: str,
+    table_name: str,
+    key_columns: Sequence[str],
+    page_size: int,
+    type_name: str,
+) -> str:
+    order_by = ", ".join(quote_identifier(c) for c in key_columns)
+    return (
+        f"SELECT * FROM {qualified_table(schema_name, table_name)} "
+        f"WHERE {quote_identifier(key_columns[0])} >= CAST(:k0 AS {type_name}) "
+        f"ORDER BY {order_by} LIMIT {page_size}"
+    )
+
+
+class CachedPage(NamedTuple):
+    result: QueryResult
+    first_key: Bookmark | None
+    last_key: Bookmark | None
+
+
+class PageCache:
+    def __init__(self, capacity: int = PAGE_CACHE_SIZE) -> None:
+        self._capacity = capacity
+        self._pages: OrderedDict[int, CachedPage] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, page_index: int) -> bool:
+        return page_index in self._pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, page_index: int) -> CachedPage | None:
+        page = self._pages.get(page_index)
+        if page is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._pages.move_to_end(page_index)
+        return page
+
+    def put(self, page_index: int, page: CachedPage) -> None:
+        self._pages[page_index] = page
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self._capacity:
+            self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+
+class TablePager:
+    def __init__(
+        self,
+        database_provider: DatabaseProvider,
+        schema_name: str,
+        table_name: str,
+        page_size: int = PAGE_SIZE,
+        cache_size: int = PAGE_CACHE_SIZE,
+    ) -> None:
+        self._database_provider = database_provider
+        self._schema_name = schema_name
+        self._table_name = table_name
+        self._page_size = page_size
+        self._key_columns: tuple[str, ...] | None = None
+        self._page_index = 0
+        self._first_key: Bookmark | None = None
+        self._last_key: Bookmark | None = None
+        self._cache = PageCache(cache_size)
+        self._inflight: dict[int, asyncio.Task[CachedPage]] = {}
+        # Bumped whenever the cache is reset, so late prefetches are dropped.
+        self._generation = 0
+        self._estimated_rows: int | None = None
+        self._heaps: list[Heap] | None = None
+        self._heap_columns: tuple[str, ...] | None = None
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    @property
+    def page_index(self) -> int:
+        return self._page_index
+
+    @property
+    def offset(self) -> int:
+        return self._page_index * self._page_size
+
+    @property
+    def estimated_rows(self) -> int | None:
+        return self._estimated_rows
+
+    @estimated_rows.setter
+    def estimated_rows(self, value: int | None) -> None:
+        self._estimated_rows = value
+
+    @property
+    def estimated_page_count(self) -> int | None:
+        if self._estimated_rows is None:
+            return None
+        return max(1, -(-self._estimated_rows // self._page_size))
+
+    @property
+    def cache(self) -> PageCache:
+        return self._cache
+
+    @property
+    def key_columns(self) -> tuple[str, ...]:
+        return self._key_columns or ()
+
+    @property
+    def uses_ctid(self) -> bool:
+        return not self._key_columns
+
+    async def _resolve_keys(self) -> None:
+        if self._key_columns is None:
+            self._key_columns = tuple(
+                await self._database_provider.list_key_columns(
+                    self._schema_name, self._table_name
+                )
+            )
+
+    def _row_key(self, result: QueryResult, row_index: int) -> Bookmark:
+        index = result.column_index
+        return tuple(result.value(row_index, index[name]) for name in self.key_columns)
+
+    async def _resolve_heaps(self) -> list[Heap]:
+        if self._heaps is None:
+            result = await self._database_provider.run_query(
+                HEAP_BLOCKS_SQL,
+                {"relation": qualified_table(self._schema_name, self._table_name)},
+            )
+            self._heaps = [Heap(*row) for row in result]
+            own = (self._schema_name, self._table_name)
+            if any((h.schema_name, h.table_name) != own for h in self._heaps):
+                # Partitions may order their columns differently from the parent.
+                columns = await self._database_provider.list_columns(
+                    self._schema_name, self._table_name
+                )
+                self._heap_columns = tuple(c.column_name for c in columns)
+        return self._heaps
+
+    # Each query covers a bounded window of blocks, so a TID range scan and a small sort
+    # replace a sort of everything past the bookmark.
+    async def _scan_heaps(
+        self, direction: Direction, bookmark: Bookmark | None, limit: int
+    ) -> CachedPage:
+        heaps = await self._resolve_heaps()
+        forward = direction == "forward"
+        if bookmark is None:
+            index, tid = (0, None) if forward else (len(heaps) - 1, None)
+        else:
+            index, tid = bookmark
+        # Forward windows start at `start`; backward ones end before `stop`
+        # (None: past the last block, to include rows added since).
+        start = _tid_block(tid) if tid is not None else 0
+        stop = _tid_block(tid) + 1 if tid is not None else None
+        window = CTID_WINDOW_BLOCKS
+        chunks: list[tuple[int, QueryResult]] = []
+        # Keeps the column names when nothing is found.
+        empty = QueryResult.empty()
+        needed = limit
+        while needed > 0 and 0 <= index < len(heaps):
+            heap = heaps[index]
+            if forward:
+                last = start + window >= heap.blocks
+                block_range = (start, None if last else start + window)
+            else:
+                begin = max((heap.blocks if stop is None else stop) - window, 0)
+                last = begin == 0
+                block_range = (begin, stop)
+            sql, params = build_ctid_query(
+                heap.schema_name,
+                heap.table_name,
+                needed,
+                direction,
+                tid,
+                block_range,
+                self._heap_columns,
+            )
+            result = await self._database_provider.run_query(sql, params)
+            if result:
+                chunks.append((index, result))
+                needed -= len(result)
+            else:
+                empty = result
+            tid = None
+            if last:
+                index += 1 if forward else -1
+                start, stop, window = 0, None, CTID_WINDOW_BLOCKS
+            else:
+                if forward:
+                    start += window
+                else:
+                    stop = begin
+                window = min(window * 2, CTID_MAX_WINDOW_BLOCKS)
+        if not forward:
+            chunks = [(i, chunk.reversed()) for i, chunk in reversed(chunks)]
+        if not chunks:
+            return CachedPage(empty, None, None)
+        first_index, first = chunks[0]
+        last_index, last_chunk = chunks[-1]
+        position = first.column_index[CTID_COLUMN]
+        first_key = (first_index, first.value(0, position))
+        last_key = (last_index, last_chunk.value(len(last_chunk) - 1, position))
+        if len(chunks) == 1:
+            result = first
+        else:
+            result = QueryResult.from_rows(
+                first.columns, itertools.chain.from_iterable(c for _, c in chunks)
+            )
+        return CachedPage(result, first_key, last_key)
+
+    async def _fetch(
+        self, direction: Direction, bookmark: Bookmark | None
+    ) -> CachedPage:
+        await self._resolve_keys()
+        if self.uses_ctid:
+            page = await self._scan_heaps(direction, bookmark, self._page_size)
+            return page._replace(result=page.result.without_columns(CTID_COLUMN))
+        sql, params = build_keyset_query(
+            self._schema_name,
+            self._table_name,
+            self.key_columns,
+            self._page_size,
+            direction,
+            bookmark,
+        )
+        result = await self._database_provider.run_query(sql, params)
+        if direction == "backward":
+            result = result.reversed()
+        first_key = self._row_key(result, 0) if result else None
+        last_key = self._row_key(result, len(result) - 1) if result else None
+        return CachedPage(result, first_key, last_key)
+
+    def _neighbour_request(self, page_index: int) -> tuple[Direction, Bookmark] | None:
+        if page_index == self._page_index + 1 and self._last_key is not None:
+            return "forward", self._last_key
+        if page_index == self._page_index - 1 >= 0 and self._first_key is not None:
+            return "backward", self._first_key
+        return None
+
+    async def _load_neighbour(self, page_index: int) -> CachedPage | None:
+        cached = self._cache.get(page_index)
+        if cached is not None:
+            return cached
+        inflight = self._inflight.get(page_index)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+        request = self._neighbour_request(page_index)
+        if request is None:
+            return None
+        page = await self._fetch(*request)
+        self._cache.put(page_index, page)
+        return page
+
+    def _move_to(self, page_index: int, page: CachedPage) -> QueryResult:
+        self._page_index = page_index
+        self._first_key = page.first_key
+        self._last_key = page.last_key
+        return page.result
+
+    def _reset_cache(self) -> None:
+        self._generation += 1
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+        self._cache.clear()
+
+    async def first_page(self) -> QueryResult:
+        self._reset_cache()
+        self._heaps = None
+        page = await self._fetch("forward", None)
+        self._cache.put(0, page)
+        return self._move_to(0, page)
+
+    async def next_page(self) -> QueryResult | None:
+        if self._last_key is None:
+            return None
+        page = await self._load_neighbour(self._page_index + 1)
+        if page is None or page.first_key is None:
+            return None
+        return self._move_to(self._page_index + 1, page)
+
+    async def prev_page(self) -> QueryResult | None:
+        if self._page_index == 0 or self._first_key is None:
+            return None
+        page = await self._load_neighbour(self._page_index - 1)
+        if page is None or page.first_key is None:
+            return None
+        return self._move_to(self._page_index - 1, page)
+
+    async def _prefetch_page(
+        self, page_index: int, direction: Direction, bookmark: Bookmark
+    ) -> CachedPage:
+        generation = self._generation
+        try:
+            page = await self._fetch(direction, bookmark)
+            if generation == self._generation:
+                self._cache.put(page_index, page)
+            return page
+        finally:
+            if generation == self._generation:
+                self._inflight.pop(page_index, None)
+
+    async def prefetch(self) -> None:
+        tasks: list[asyncio.Task[CachedPage]] = []
+        for page_index in (self._page_index + 1, self._page_index - 1):
+            if page_index in self._cache or page_index in self._inflight:
+                continue
+            request = self._neighbour_request(page_index)
+            if request is None:
+                continue
+            task = asyncio.create_task(self._prefetch_page(page_index, *request))
+            self._inflight[page_index] = task
+            tasks.append(task)
+        if tasks:
+            # Tasks cancelled by a cache reset are not a failure of this prefetch.
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(
+                    result, asyncio.CancelledError
+                ):
+                    raise result
+
+    def _table_params(self) -> dict[str, Any]:
+        return {"schema_name": self._schema_name, "table_name": self._table_name}
+
+    async def _seek_histogram(self, fraction: float) -> CachedPage | None:
+        result = await self._database_provider.run_query(
+            HISTOGRAM_BOUNDS_SQL,
+            {**self._table_params(), "column_name": self.key_columns[0]},
+        )
+        if not result:
+            return None
+        bounds, type_name = result[0]
+        if not bounds:
+            return None
+        bound = bounds[round(fraction * (len(bounds) - 1))]
+        sql = build_seek_query(
+            self._schema_name,
+            self._table_name,
+            self.key_columns,
+            self._page_size,
+            type_name,
+        )
+        result = await self._database_provider.run_query(sql, {"k0": bound})
+        first_key = self._row_key(result, 0) if result else None
+        last_key = self._row_key(result, len(result) - 1) if result else None
+        return CachedPage(result, first_key, last_key)
+
+    async def _seek_block(self, fraction: float) -> CachedPage | None:
+        heaps = await self._resolve_heaps()
+        target = int(fraction * sum(h.blocks for h in heaps))
+        for index, heap in enumerate(heaps):
+            if target < heap.blocks or index == len(heaps) - 1:
+                break
+            target -= heap.blocks
+        else:
+            return None
+        # (block,0) is never a live tuple, so rows after it start the block.
+        bookmark = (index, f"({target},0)")
+        if self.uses_ctid:
+            return await self._fetch("forward", bookmark)
+        anchor = await self._scan_heaps("forward", bookmark, 1)
+        if anchor.first_key is None:
+            return None
+        return await self._fetch("forward", self._row_key(anchor.result, 0))
+
+    async def _jump(self, fraction: float, target: int) -> QueryResult | None:
+        await self._resolve_keys()
+        if fraction <= 0.0:
+            return await self.first_page()
+        page = None
+        if not self.uses_ctid:
+            page = await self._seek_histogram(fraction)
+        if page is None:
+            page = await self._seek_block(fraction)
+        if page is None or page.first_key is None:
+            return None
+        self._reset_cache()
+        self._cache.put(target, page)
+        return self._move_to(target, page)
+
+    def _page_count_for_jump(self) -> int:
+        page_count = self.estimated_page_count
+        if page_count is None:
+            raise ValueError("No row estimate for this table yet; run ANALYZE to jump.")
+        return page_count
+
+    async def jump_to_fraction(self, fraction: float) -> QueryResult | None:
+        fraction = min(max(fraction, 0.0), 1.0)
+        if fraction == 0.0:
+            return await self._jump(0.0, 0)
+        page_count = self._page_count_for_jump()
+        return await self._jump(fraction, min(int(fraction * page_count), page_count - 1))
+
+    async def jump_to_page(self, page_number: int) -> QueryResult | None:
+        if page_number <= 1:
+            return await self._jump(0.0, 0)
+        page_count = self._page_count_for_jump()
+        page_number = min(page_number, page_count)
+        return await self._jump((page_number - 1) / page_count, page_number - 1)
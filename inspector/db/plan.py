@@ -0,0 +1,144 @@
+import json
+from collections.abc import Iterator, Mapping
+from typing import Any, NamedTuple
+
+from inspector.db.statements import ensure_read_only, lex, split_statements
+
+HOT_NODE_COUNT = 3
+# A node is only hot if it accounts for at least this share of the plan.
+HOT_NODE_MIN_SHARE = 0.1
+
+
+class PlanNode(NamedTuple):
+    node_type: str
+    # Relation, index, CTE or function the node reads, plus its alias.
+    target: str
+    # Join type, scan direction, strategy and the like.
+    detail: str
+    startup_cost: float
+    total_cost: float
+    # Cost minus the children's, for ranking plans that were not run.
+    self_cost: float
+    plan_rows: float
+    # None when the plan was not run with ANALYZE.
+    actual_rows: float | None
+    loops: int
+    # Inclusive of the children over all loops; self_ms is the node's own share.
+    total_ms: float | None
+    self_ms: float | None
+    shared_hit: int
+    shared_read: int
+    children: tuple["PlanNode", ...]
+
+    # Above 1 means the planner underestimated.
+    @property
+    def row_estimate_factor(self) -> float | None:
+        if self.actual_rows is None or not self.loops:
+            return None
+        return max(self.actual_rows / self.loops, 1.0) / max(self.plan_rows, 1.0)
+
+    def walk(self) -> Iterator["PlanNode"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class QueryPlan(NamedTuple):
+    root: PlanNode
+    analyzed: bool
+    planning_ms: float | None
+    execution_ms: float | None
+
+    def weight(self, node: PlanNode) -> float:
+        if self.analyzed and node.self_ms is not None:
+            return node.self_ms
+        return node.self_cost
+
+    @property
+    def total_weight(self) -> float:
+        return sum(self.weight(node) for node in self.root.walk())
+
+    def hot_nodes(self, count: int = HOT_NODE_COUNT) -> list[PlanNode]:
+        total = self.total_weight
+        if total <= 0:
+            return []
+        nodes = [
+            n for n in self.root.walk() if self.weight(n) / total >= HOT_NODE_MIN_SHARE
+        ]
+        return sorted(nodes, key=self.weight, reverse=True)[:count]
+
+
+def explain_sql(sql: str, analyze: bool = False) -> str:
+    ensure_read_only(sql)
+    if len(split_statements(lex(sql))) != 1:
+        raise ValueError("EXPLAIN needs exactly one statement.")
+    options = "FORMAT JSON, BUFFERS, ANALYZE" if analyze else "FORMAT JSON, BUFFERS"
+    return f"EXPLAIN ({options}) {sql.strip().rstrip(';')}"
+
+
+def _target(raw: Mapping[str, Any]) -> str:
+    name = raw.get("Relation Name") or raw.get("CTE Name") or raw.get("Function Name")
+    if name and raw.get("Schema"):
+        name = f"{raw['Schema']}.{name}"
+    parts = [f"on {name}"] if name else []
+    alias = raw.get("Alias")
+    if alias and alias != raw.get("Relation Name"):
+        parts.append(alias)
+    if raw.get("Index Name"):
+        parts.append(f"using {raw['Index Name']}")
+    return " ".join(parts)
+
+
+def _detail(raw: Mapping[str, Any]) -> str:
+    values = [
+        str(raw[key])
+        for key in ("Join Type", "Strategy", "Scan Direction")
+        if raw.get(key) not in (None, "Forward", "Plain")
+    ]
+    if raw.get("Parent Relationship") in ("InitPlan", "SubPlan"):
+        values.append(str(raw.get("Subplan Name") or raw["Parent Relationship"]))
+    return ", ".join(values)
+
+
+def parse_node(raw: Mapping[str, Any]) -> PlanNode:
+    children = tuple(parse_node(child) for child in raw.get("Plans", ()))
+    loops = int(raw.get("Actual Loops", 0))
+    actual_rows: float | None = None
+    total_ms: float | None = None
+    self_ms: float | None = None
+    if "Actual Total Time" in raw:
+        actual_rows = float(raw.get("Actual Rows", 0)) * loops
+        total_ms = float(raw["Actual Total Time"]) * loops
+        # Parallel children can add up to more than their parent.
+        self_ms = max(total_ms - sum(c.total_ms or 0.0 for c in children), 0.0)
+    total_cost = float(raw.get("Total Cost", 0.0))
+    return PlanNode(
+        node_type=str(raw.get("Node Type", "?")),
+        target=_target(raw),
+        detail=_detail(raw),
+        startup_cost=float(raw.get("Startup Cost", 0.0)),
+        total_cost=total_cost,
+        self_cost=max(total_cost - sum(c.total_cost for c in children), 0.0),
+        plan_rows=float(raw.get("Plan Rows", 0)),
+        actual_rows=actual_rows,
+        loops=loops,
+        total_ms=total_ms,
+        self_ms=self_ms,
+        shared_hit=int(raw.get("Shared Hit Blocks", 0)),
+        shared_read=int(raw.get("Shared Read Blocks", 0)),
+        children=children,
+    )
+
+
+# asyncpg hands json over as text.
+def parse_plan(value: Any) -> QueryPlan:
+    document = json.loads(value) if isinstance(value, (str, bytes)) else value
+    if isinstance(document, list):
+        document = document[0]
+    root = parse_node(document["Plan"])
+    return QueryPlan(
+        root=root,
+        analyzed=root.total_ms is not None,
+        planning_ms=document.get("Planning Time"),
+        execution_ms=document.get("Execution Time"),
+    )
@@ -0,0 +1,120 @@
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from typing import Any, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from inspector.db.result import QueryResult
+from inspector.db.statements import normalize_sql
+
+DEFAULT_QUERY_CACHE_BYTES = 64 * 1024 * 1024
+
+_SEARCH_PATH_SQL = "SELECT current_setting('search_path')"
+
+CacheKey = tuple[str, str, Hashable]
+
+
+class CachedResult(NamedTuple):
+    result: QueryResult
+    # time.monotonic() values.
+    stored_at: float
+    expires_at: float
+    size: int
+
+    def age(self, now: float | None = None) -> float:
+        return (time.monotonic() if now is None else now) - self.stored_at
+
+
+async def fetch_search_path(session: AsyncSession) -> str:
+    result = await session.execute(text(_SEARCH_PATH_SQL))
+    return str(result.scalar_one())
+
+
+class QueryCache:
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int = DEFAULT_QUERY_CACHE_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, CachedResult] = OrderedDict()
+        self._bytes = 0
+        # Sessions are pooled and SET is refused, so one value per connection.
+        self.search_path: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    # None until the search_path is known, or when the parameters cannot be hashed.
+    def key(self, sql: str, params: Mapping[str, Any] | None = None) -> CacheKey | None:
+        if self.search_path is None:
+            return None
+        bound = tuple(sorted(params.items())) if params else ()
+        try:
+            hash(bound)
+        except TypeError:
+            return None
+        return normalize_sql(sql), self.search_path, bound
+
+    async def resolve_key(
+        self,
+        session: AsyncSession,
+        sql: str,
+        params: Mapping[str, Any] | None = None,
+    ) -> CacheKey | None:
+        if self.search_path is None:
+            self.search_path = await fetch_search_path(session)
+        return self.key(sql, params)
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() >= entry.expires_at:
+            self.invalidate(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    # Results larger than the whole cache are not stored.
+    def put(
+        self,
+        key: CacheKey,
+        result: QueryResult,
+        ttl: float | None = None,
+    ) -> CachedResult | None:
+        self.invalidate(key)
+        size = sys.getsizeof(result)
+        if size > self._max_bytes:
+            return None
+        now = self._clock()
+        entry = CachedResult(result, now, now + (self._ttl if ttl is None else ttl), size)
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+        return entry
+
+    def invalidate(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
@@ -0,0 +1,202 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+QueryRow = tuple[Any, ...]
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class TypedColumn:
+    __slots__ = ("_values", "_nulls")
+
+    def __init__(self, values: array, nulls: bytearray | None = None) -> None:
+        self._values = values
+        self._nulls = nulls
+
+    @property
+    def typecode(self) -> str:
+        return self._values.typecode
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> Any:
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        return self._values[index]
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self) + self._values.buffer_info()[1] * self._values.itemsize
+        if self._nulls is not None:
+            size += len(self._nulls)
+        return size
+
+
+ColumnBuffer = TypedColumn | list[Any]
+
+
+def _pack_column(values: list[Any]) -> ColumnBuffer:
+    typecode: str | None = None
+    has_nulls = False
+    for value in values:
+        if value is None:
+            has_nulls = True
+            continue
+        kind = type(value)
+        if kind is int and _INT64_MIN <= value <= _INT64_MAX:
+            code = "q"
+        elif kind is float:
+            code = "d"
+        else:
+            return values
+        if typecode is None:
+            typecode = code
+        elif typecode != code:
+            return values
+    if typecode is None:
+        return values
+    if not has_nulls:
+        return TypedColumn(array(typecode, values))
+    fill = 0 if typecode == "q" else 0.0
+    nulls = bytearray(1 if v is None else 0 for v in values)
+    return TypedColumn(array(typecode, (fill if v is None else v for v in values)), nulls)
+
+
+class QueryResult:
+    __slots__ = ("_columns", "_index", "_data", "_start", "_stop")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        data: Sequence[ColumnBuffer],
+        start: int = 0,
+        stop: int | None = None,
+        index: dict[str, int] | None = None,
+    ) -> None:
+        self._columns = tuple(columns)
+        self._index = index if index is not None else _build_index(self._columns)
+        self._data = tuple(data)
+        self._start = start
+        if stop is None:
+            stop = len(self._data[0]) if self._data else 0
+        self._stop = stop
+
+    @classmethod
+    def empty(cls, columns: Sequence[str] = ()) -> "QueryResult":
+        return cls(columns, [[] for _ in columns])
+
+    @classmethod
+    def from_rows(
+        cls, columns: Sequence[str], rows: Iterable[Sequence[Any]]
+    ) -> "QueryResult":
+        columns = tuple(columns)
+        if not columns:
+            return cls.empty()
+        transposed = list(zip(*rows)) or [() for _ in columns]
+        return cls(columns, [_pack_column(list(values)) for values in transposed])
+
+    @classmethod
+    def from_dicts(
+        cls, columns: Sequence[str], rows: Iterable[Mapping[str, Any]]
+    ) -> "QueryResult":
+        return cls.from_rows(columns, (tuple(r.get(c) for c in columns) for r in rows))
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    @property
+    def column_index(self) -> Mapping[str, int]:
+        return self._index
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __bool__(self) -> bool:
+        return self._stop > self._start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QueryResult):
+            return NotImplemented
+        return self._columns == other._columns and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"QueryResult(columns={list(self._columns)!r}, rows={len(self)})"
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self)
+        for column in self._data:
+            size += sys.getsizeof(column)
+            if isinstance(column, list):
+                size += sum(sys.getsizeof(value) for value in column)
+        return size
+
+    def value(self, row_index: int, column_index: int) -> Any:
+        return self._data[column_index][self._start + row_index]
+
+    def row(self, row_index: int) -> QueryRow:
+        position = self._start + row_index
+        return tuple(column[position] for column in self._data)
+
+    def row_dict(self, row_index: int) -> dict[str, Any]:
+        return dict(zip(self._columns, self.row(row_index)))
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [self.row_dict(i) for i in range(len(self))]
+
+    def column(self, name: str) -> list[Any]:
+        return self.column_at(self._index[name])
+
+    def column_at(self, column_index: int) -> list[Any]:
+        values = self._data[column_index]
+        return [values[i] for i in range(self._start, self._stop)]
+
+    def __iter__(self) -> Iterator[QueryRow]:
+        for position in range(self._start, self._stop):
+            yield tuple(column[position] for column in self._data)
+
+    @overload
+    def __getitem__(self, key: int) -> QueryRow: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "QueryResult": ...
+
+    def __getitem__(self, key: int | slice) -> "QueryRow | QueryResult":
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("QueryResult slices do not support a step.")
+            return QueryResult(
+                self._columns,
+                self._data,
+                self._start + start,
+                self._start + max(start, stop),
+                self._index,
+            )
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("QueryResult row index out of range.")
+        return self.row(key)
+
+    def without_columns(self, *names: str) -> "QueryResult":
+        keep = [i for i, c in enumerate(self._columns) if c not in names]
+        return QueryResult(
+            [self._columns[i] for i in keep],
+            [self._data[i] for i in keep],
+            self._start,
+            self._stop,
+        )
+
+    def reversed(self) -> "QueryResult":
+        return QueryResult.from_rows(self._columns, list(self)[::-1])
+
+
+def _build_index(columns: Sequence[str]) -> dict[str, int]:
+    index: dict[str, int] = {}
+    for position, name in enumerate(columns):
+        index.setdefault(name, position)
+    return index
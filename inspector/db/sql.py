@@ -0,0 +1,46 @@
+HISTOGRAM_BOUNDS_SQL = """
+SELECT s.histogram_bounds::text::text[] AS bounds,
+       format_type(a.atttypid, NULL) AS type_name
+FROM pg_stats s
+JOIN pg_namespace n ON n.nspname = s.schemaname
+JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = s.tablename
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = s.attname
+WHERE s.schemaname = :schema_name AND s.tablename = :table_name
+  AND s.attname = :column_name AND s.histogram_bounds IS NOT NULL
+ORDER BY s.inherited DESC
+LIMIT 1
+"""
+
+RELPAGES_SQL = """
+SELECT c.relpages
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema_name AND c.relname = :table_name
+"""
+
+# Leaf heaps of a table (the table itself unless it is partitioned) with
+# their current size in blocks.
+HEAP_BLOCKS_SQL = """
+SELECT n.nspname AS schema_name,
+       c.relname AS table_name,
+       pg_relation_size(c.oid) / current_setting('block_size')::int AS blocks
+FROM pg_partition_tree(CAST(:relation AS regclass)) t
+JOIN pg_class c ON c.oid = t.relid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE t.isleaf AND c.relkind = 'r'
+ORDER BY t.level, n.nspname, c.relname
+"""
+
+
+def quote_identifier(identifier: str) -> str:
+    escaped = identifier.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def quote_literal(value: str) -> str:
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def qualified_table(schema_name: str, table_name: str) -> str:
+    return f"{quote_identifier(schema_name)}.{quote_identifier(table_name)}"
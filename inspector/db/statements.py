@@ -0,0 +1,177 @@
+import re
+from typing import NamedTuple
+
+# Statements that only read; anything else (including SET, BEGIN, COPY,
+# CALL or DO) is refused.
+_READ_ONLY_KEYWORDS = frozenset({"SELECT", "WITH", "VALUES", "TABLE", "SHOW"})
+_DATA_MODIFYING = frozenset({"INSERT", "UPDATE", "DELETE", "MERGE"})
+# FOR UPDATE, FOR NO KEY UPDATE, FOR SHARE, FOR KEY SHARE.
+_LOCKING_STRENGTHS = frozenset({"UPDATE", "NO", "SHARE", "KEY"})
+_EXPLAIN_OPTIONS = frozenset({"ANALYZE", "ANALYSE", "VERBOSE"})
+
+# Literals and comments match without capturing; words, quoted identifiers
+# and parentheses are captured as ``token``. Whitespace, numbers and
+# operators never match, so the regex engine skips them without a callback.
+_LEXEME_RE = re.compile(
+    r"""
+    [Ee]'(?:[^'\\]|\\.|'')*(?:'|\Z)
+    | '(?:[^']|'')*(?:'|\Z)
+    | --[^\n]*
+    | /\*(?:[^*/]|\*(?!/)|/(?!\*))*(?:\*/|\Z)
+    | \$(?P<tag>(?:[^\W\d]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z)
+    | \$\d+ | \d+
+    | (?P<token>[^\W\d][\w$]*|"(?:[^"]|"")*(?:"|\Z)|[();]|/\*)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# What the comment alternative leaves behind for a nested comment.
+_NESTED_COMMENT = "/*"
+# Literals kept verbatim by normalize_sql; the text between them is code.
+_NORMALIZE_RE = re.compile(
+    r"""
+    (?P<literal>
+        (?<![\w$])[Ee]'(?:[^'\\]|\\.|'')*(?:'|\Z)
+        | '(?:[^']|'')*(?:'|\Z)
+        | "(?:[^"]|"")*(?:"|\Z)
+        | (?<![\w$])\$(?P<tag>(?:[^\W\d]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z)
+    )
+    | --[^\n]*
+    | (?P<block>/\*)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class StatementClass(NamedTuple):
+    keyword: str
+    # Why the statement can write or take locks; None when it only reads.
+    reason: str | None
+
+    @property
+    def read_only(self) -> bool:
+        return self.reason is None
+
+
+def _block_comment_end(sql: str, pos: int) -> int:
+    depth = 1
+    while depth:
+        close = sql.find("*/", pos)
+        if close < 0:
+            return len(sql)
+        opened = sql.find("/*", pos, close)
+        if opened < 0:
+            depth -= 1
+            pos = close + 2
+        else:
+            depth += 1
+            pos = opened + 2
+    return pos
+
+
+# Nested comments are rare, so they are cut out and the text lexed again.
+def lex(sql: str) -> list[str]:
+    while True:
+        lexemes = [token.upper() for _, token in _LEXEME_RE.findall(sql) if token]
+        if _NESTED_COMMENT not in lexemes:
+            return lexemes
+        for found in _LEXEME_RE.finditer(sql):
+            if found.group("token") == _NESTED_COMMENT:
+                end = _block_comment_end(sql, found.end())
+                sql = f"{sql[: found.start()]} {sql[end:]}"
+                break
+
+
+def split_statements(lexemes: list[str]) -> list[list[str]]:
+    statements: list[list[str]] = []
+    current: list[str] = []
+    for lexeme in lexemes:
+        if lexeme == ";":
+            if current:
+                statements.append(current)
+            current = []
+        else:
+            current.append(lexeme)
+    if current:
+        statements.append(current)
+    return statements
+
+
+def _leading_keyword(statement: list[str], start: int = 0) -> tuple[str, int]:
+    for i in range(start, len(statement)):
+        if statement[i] != "(":
+            return statement[i], i
+    return "", len(statement)
+
+
+def _explained(statement: list[str], start: int) -> tuple[str, int]:
+    i = start + 1
+    if i < len(statement) and statement[i] == "(":
+        depth = 0
+        for i in range(i, len(statement)):
+            depth += {"(": 1, ")": -1}.get(statement[i], 0)
+            if depth == 0:
+                break
+        i += 1
+    while i < len(statement) and statement[i] in _EXPLAIN_OPTIONS:
+        i += 1
+    return _leading_keyword(statement, i)
+
+
+def classify_statement(statement: list[str]) -> StatementClass:
+    keyword, start = _leading_keyword(statement)
+    if keyword == "EXPLAIN":
+        keyword, start = _explained(statement, start)
+    if keyword not in _READ_ONLY_KEYWORDS:
+        return StatementClass(keyword, f"{keyword or 'empty'} statement")
+    previous = ""
+    for lexeme in statement[start + 1 :]:
+        # A statement nested in parentheses, or the main statement that
+        # follows the last CTE.
+        if lexeme in _DATA_MODIFYING and previous in ("(", ")"):
+            return StatementClass(keyword, f"{lexeme} inside a {keyword} query")
+        if previous == "FOR" and lexeme in _LOCKING_STRENGTHS:
+            return StatementClass(keyword, "row-locking FOR UPDATE/SHARE clause")
+        if lexeme == "INTO":
+            return StatementClass(keyword, "SELECT INTO creates a table")
+        previous = lexeme
+    return StatementClass(keyword, None)
+
+
+def write_reason(sql: str) -> str | None:
+    for statement in split_statements(lex(sql)):
+        result = classify_statement(statement)
+        if result.reason is not None:
+            return result.reason
+    return None
+
+
+def ensure_read_only(sql: str) -> None:
+    reason = write_reason(sql)
+    if reason is not None:
+        raise ValueError(
+            f"Only read-only queries are allowed in inspector mode ({reason})."
+        )
+
+
+# Literals and quoted identifiers are kept as written, so only spellings the server
+# treats identically share a cache key.
+def normalize_sql(sql: str) -> str:
+    parts: list[str] = []
+    code: list[str] = []
+    pos = 0
+    while (found := _NORMALIZE_RE.search(sql, pos)) is not None:
+        code.append(sql[pos : found.start()])
+        if found.group("literal") is None:
+            code.append(" ")
+            pos = found.end()
+            if found.group("block"):
+                pos = _block_comment_end(sql, pos)
+            continue
+        parts.append(_WHITESPACE_RE.sub(" ", "".join(code)).upper())
+        parts.append(found.group())
+        code = []
+        pos = found.end()
+    code.append(sql[pos:])
+    parts.append(_WHITESPACE_RE.sub(" ", "".join(code)).upper())
+    return "".join(parts).strip().rstrip("; ")
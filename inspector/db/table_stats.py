@@ -0,0 +1,184 @@
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TABLE_STATS_SQL = """
+SELECT t.relname AS table_name,
+       t.seq_scan,
+       t.seq_tup_read,
+       coalesce(t.idx_scan, 0) AS idx_scan,
+       t.n_tup_ins + t.n_tup_upd + t.n_tup_del AS tup_written,
+       t.n_live_tup,
+       t.n_dead_tup,
+       coalesce(io.heap_blks_hit, 0) + coalesce(io.idx_blks_hit, 0) AS blks_hit,
+       coalesce(io.heap_blks_read, 0) + coalesce(io.idx_blks_read, 0) AS blks_read,
+       pg_relation_size(t.relid) AS table_bytes,
+       coalesce(ix.index_count, 0) AS index_count,
+       ix.unused_indexes,
+       coalesce(ix.unused_index_bytes, 0) AS unused_index_bytes
+FROM pg_stat_user_tables t
+JOIN pg_statio_user_tables io ON io.relid = t.relid
+LEFT JOIN (
+    SELECT s.relid,
+           count(*) AS index_count,
+           array_agg(s.indexrelname ORDER BY s.indexrelname)
+               FILTER (WHERE s.idx_scan = 0 AND NOT i.indisunique) AS unused_indexes,
+           sum(pg_relation_size(s.indexrelid))
+               FILTER (WHERE s.idx_scan = 0 AND NOT i.indisunique) AS unused_index_bytes
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.schemaname = :schema_name
+    GROUP BY s.relid
+) ix ON ix.relid = t.relid
+WHERE t.schemaname = :schema_name
+"""
+
+
+class TableStats(NamedTuple):
+    table_name: str
+    seq_scan: int
+    seq_tup_read: int
+    idx_scan: int
+    # Inserted, updated and deleted rows.
+    tup_written: int
+    n_live_tup: int
+    n_dead_tup: int
+    # Shared buffer hits and reads, heap and indexes together.
+    blks_hit: int
+    blks_read: int
+    table_bytes: int
+    index_count: int
+    # Indexes never scanned that do not enforce uniqueness.
+    unused_indexes: tuple[str, ...]
+    unused_index_bytes: int
+
+    @property
+    def seq_scan_ratio(self) -> float | None:
+        scans = self.seq_scan + self.idx_scan
+        return self.seq_scan / scans if scans else None
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        blocks = self.blks_hit + self.blks_read
+        return self.blks_hit / blocks if blocks else None
+
+    @property
+    def dead_ratio(self) -> float | None:
+        tuples = self.n_live_tup + self.n_dead_tup
+        return self.n_dead_tup / tuples if tuples else None
+
+    # Assumes dead tuples average out in size.
+    @property
+    def bloat_bytes(self) -> int:
+        return int(self.table_bytes * (self.dead_ratio or 0.0))
+
+
+class TableRates(NamedTuple):
+    seq_scan: float
+    idx_scan: float
+    tup_written: float
+    blks_read: float
+
+
+class TableStatsSnapshot(NamedTuple):
+    schema_name: str
+    tables: dict[str, TableStats]
+    # time.monotonic() when the query returned.
+    taken_at: float
+
+    # Tables whose counters went backwards (a stats reset) are left out.
+    def rates_since(self, previous: "TableStatsSnapshot") -> dict[str, TableRates]:
+        elapsed = self.taken_at - previous.taken_at
+        if elapsed <= 0:
+            return {}
+        rates: dict[str, TableRates] = {}
+        for name, current in self.tables.items():
+            before = previous.tables.get(name)
+            if before is None:
+                continue
+            deltas = [
+                getattr(current, field) - getattr(before, field)
+                for field in TableRates._fields
+            ]
+            if min(deltas) < 0:
+                continue
+            rates[name] = TableRates(*(delta / elapsed for delta in deltas))
+        return rates
+
+
+class RankingMetric(NamedTuple):
+    label: str
+    # Higher values rank first; None sorts last.
+    value: Callable[[TableStats, TableRates | None], float | None]
+
+
+RANKING_METRICS: dict[str, RankingMetric] = {
+    "seq_scan": RankingMetric(
+        "rows read by sequential scans", lambda t, r: float(t.seq_tup_read)
+    ),
+    "seq_scan_ratio": RankingMetric(
+        "sequential share of scans", lambda t, r: t.seq_scan_ratio
+    ),
+    "cache_misses": RankingMetric(
+        "blocks read outside shared buffers", lambda t, r: float(t.blks_read)
+    ),
+    "bloat": RankingMetric(
+        "estimated dead tuple bytes", lambda t, r: float(t.bloat_bytes)
+    ),
+    "unused_indexes": RankingMetric(
+        "bytes in unused indexes", lambda t, r: float(t.unused_index_bytes)
+    ),
+    "write_rate": RankingMetric(
+        "rows written per second", lambda t, r: r.tup_written if r else None
+    ),
+    "read_rate": RankingMetric(
+        "blocks read per second", lambda t, r: r.blks_read if r else None
+    ),
+}
+
+
+def rank_tables(
+    snapshot: TableStatsSnapshot,
+    metric: str,
+    rates: Mapping[str, TableRates] | None = None,
+) -> list[str]:
+    value = RANKING_METRICS[metric].value
+    rates = rates or {}
+
+    def key(name: str) -> tuple[bool, float, str]:
+        found = value(snapshot.tables[name], rates.get(name))
+        return found is None, -(found or 0.0), name
+
+    return sorted(snapshot.tables, key=key)
+
+
+def table_stats_from_row(row: Mapping[str, Any]) -> TableStats:
+    return TableStats(
+        table_name=row["table_name"],
+        seq_scan=int(row["seq_scan"] or 0),
+        seq_tup_read=int(row["seq_tup_read"] or 0),
+        idx_scan=int(row["idx_scan"]),
+        tup_written=int(row["tup_written"] or 0),
+        n_live_tup=int(row["n_live_tup"] or 0),
+        n_dead_tup=int(row["n_dead_tup"] or 0),
+        blks_hit=int(row["blks_hit"]),
+        blks_read=int(row["blks_read"]),
+        table_bytes=int(row["table_bytes"] or 0),
+        index_count=int(row["index_count"]),
+        unused_indexes=tuple(row["unused_indexes"] or ()),
+        unused_index_bytes=int(row["unused_index_bytes"]),
+    )
+
+
+async def fetch_table_stats(
+    session: AsyncSession, schema_name: str
+) -> TableStatsSnapshot:
+    result = await session.execute(text(TABLE_STATS_SQL), {"schema_name": schema_name})
+    tables = {
+        stats.table_name: stats
+        for stats in map(table_stats_from_row, result.mappings().all())
+    }
+    return TableStatsSnapshot(schema_name, tables, time.monotonic())
@@ -1,36 +1,183 @@
-import asyncio
-from typing import Annotated
+import os
+import sys
+from typing import TYPE_CHECKING, Annotated
 
 import typer
 
-from inspector.app import PgInspectorApp
-from inspector.config import ConnectionConfig, PgInspectorSettings
-from inspector.db.connection import SessionProvider
-from inspector.db.database import DatabaseProvider
+from inspector.db.formats import EXPORT_FORMATS, RANGE_SPLITS, ROW_FORMATS, format_for_path
+
+# Heavy modules (pydantic, SQLAlchemy, Textual) are imported inside the
+# commands that need them, so `inspector --help` and argument errors stay fast.
+if TYPE_CHECKING:
+    from inspector.config import ConnectionConfig
 
 app = typer.Typer(help="PostgreSQL CLI visual inspector.")
 
 
 def _get_connection_config(
-    connection: str | None,
-) -> ConnectionConfig:
+    connection: str | None, **overrides: object | None
+) -> "ConnectionConfig":
+    from inspector.config import ConnectionConfig, PgInspectorSettings
+
     settings = PgInspectorSettings()
     url = connection or settings.database_url
     if not url:
         typer.echo("Error: Set DATABASE_URL or pass -c/--connection.", err=True)
         raise typer.Exit(1)
-    return ConnectionConfig(url=url)
+    values = settings.model_dump(include=set(ConnectionConfig.model_fields) - {"url"})
+    values.update({k: v for k, v in overrides.items() if v is not None})
+    return ConnectionConfig(url=url, **values)
+
+
+def _command_config(
+    ctx: typer.Context, connection: str | None, **overrides: object | None
+) -> "ConnectionConfig":
+    # Root options given before the subcommand apply to it too.
+    root = ctx.obj or {}
+    return _get_connection_config(
+        connection or root.get("connection"), **root.get("overrides", {}), **overrides
+    )
+
+
+@app.command()
+def export(
+    ctx: typer.Context,
+    table: Annotated[
+        str | None,
+        typer.Argument(help="Table to export, as schema.table (default schema public)."),
+    ] = None,
+    sql: Annotated[
+        str | None,
+        typer.Option("--sql", help="Export the result of a read-only query instead."),
+    ] = None,
+    output: Annotated[
+        str,
+        typer.Option("--output", "-o", help="Output file, or - for stdout."),
+    ] = "-",
+    export_format: Annotated[
+        str | None,
+        typer.Option(
+            "--format",
+            "-f",
+            help=f"One of {', '.join(EXPORT_FORMATS)}; defaults to the output extension.",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Copy a table as this many ranges over parallel connections.",
+        ),
+    ] = None,
+    split: Annotated[
+        str,
+        typer.Option(
+            "--split",
+            help="Split tables on the leading key column (key) or heap blocks (ctid).",
+        ),
+    ] = "key",
+    per_range_files: Annotated[
+        bool,
+        typer.Option(
+            "--per-range-files",
+            help="Write each range to its own numbered file instead of merging.",
+        ),
+    ] = False,
+    connection: Annotated[
+        str | None,
+        typer.Option("--connection", "-c", help="PostgreSQL connection URL."),
+    ] = None,
+) -> None:
+    """Stream a table or query result to CSV, JSONL or Parquet."""
+    if (table is None) == (sql is None):
+        typer.echo("Error: Pass either a table or --sql.", err=True)
+        raise typer.Exit(1)
+    chosen = export_format or format_for_path(output) or "csv"
+    if chosen not in EXPORT_FORMATS:
+        typer.echo(f"Error: Unknown format {chosen!r}.", err=True)
+        raise typer.Exit(1)
+    if split not in RANGE_SPLITS:
+        typer.echo(f"Error: Unknown split {split!r}.", err=True)
+        raise typer.Exit(1)
+    config = _command_config(ctx, connection, export_jobs=jobs)
+    import asyncio
+
+    from inspector import commands
+
+    try:
+        result = asyncio.run(
+            commands.run_export(
+                config, table, sql, chosen, output, split, merge=not per_range_files
+            )
+        )
+    except commands.COMMAND_ERRORS as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+    typer.echo(
+        f"Exported {result.rows} rows ({result.bytes_written} bytes) "
+        f"in {result.elapsed:.1f}s",
+        err=True,
+    )
+
+
+@app.command()
+def query(
+    ctx: typer.Context,
+    sql: Annotated[
+        str | None,
+        typer.Argument(help="Read-only SQL to run; read from stdin when omitted or -."),
+    ] = None,
+    row_format: Annotated[
+        str,
+        typer.Option("--format", "-f", help=f"One of {', '.join(ROW_FORMATS)}."),
+    ] = "tsv",
+    max_rows: Annotated[
+        int | None,
+        typer.Option("--max-rows", min=1, help="Stop after this many rows."),
+    ] = None,
+    header: Annotated[
+        bool,
+        typer.Option("--header/--no-header", help="Print a TSV header line."),
+    ] = True,
+    connection: Annotated[
+        str | None,
+        typer.Option("--connection", "-c", help="PostgreSQL connection URL."),
+    ] = None,
+) -> None:
+    """Run a read-only query and stream its rows to stdout as they arrive."""
+    if row_format not in ROW_FORMATS:
+        typer.echo(f"Error: Unknown format {row_format!r}.", err=True)
+        raise typer.Exit(1)
+    if sql is None or sql == "-":
+        sql = sys.stdin.read()
+    if not sql.strip():
+        typer.echo("Error: No SQL given.", err=True)
+        raise typer.Exit(1)
+    config = _command_config(ctx, connection)
+    import asyncio
 
+    from inspector import commands
 
-async def _run_tui(config: ConnectionConfig) -> None:
-    session_provider = SessionProvider(config=config)
-    database_provider = DatabaseProvider(session_provider)
-    await session_provider.create_engine(config)
     try:
-        inspector_app = PgInspectorApp(config, database_provider)
-        inspector_app.run()
-    finally:
-        await session_provider.close_engine()
+        asyncio.run(commands.run_query(config, sql, row_format, max_rows, header))
+    except BrokenPipeError:
+        # The reader (e.g. `head`) went away; stop quietly like other CLI tools.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except commands.COMMAND_ERRORS as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+
+def _profile_startup(value: bool) -> None:
+    if not value:
+        return
+    from inspector.startup import PROBES, format_profile, profile
+
+    results = [profile(probe) for probe in PROBES]
+    typer.echo("\n\n".join(format_profile(result) for result in results))
+    raise typer.Exit(0 if all(result.within_budget for result in results) else 1)
 
 
 @app.callback(invoke_without_command=True)
@@ -40,11 +187,92 @@ def main(
         str | None,
         typer.Option("--connection", "-c", help="PostgreSQL connection URL."),
     ] = None,
+    catalog_snapshot: Annotated[
+        bool | None,
+        typer.Option(
+            "--catalog-snapshot/--no-catalog-snapshot",
+            help="Load schemas, tables and columns in bulk from pg_catalog.",
+        ),
+    ] = None,
+    metadata_cache: Annotated[
+        bool | None,
+        typer.Option(
+            "--metadata-cache/--no-metadata-cache",
+            help="Persist catalog metadata on disk between runs.",
+        ),
+    ] = None,
+    statement_timeout_ms: Annotated[
+        int | None,
+        typer.Option("--statement-timeout", help="statement_timeout in milliseconds."),
+    ] = None,
+    lock_timeout_ms: Annotated[
+        int | None,
+        typer.Option("--lock-timeout", help="lock_timeout in milliseconds."),
+    ] = None,
+    pool_size: Annotated[
+        int | None,
+        typer.Option("--pool-size", help="Connections kept open in the pool."),
+    ] = None,
+    max_overflow: Annotated[
+        int | None,
+        typer.Option("--max-overflow", help="Extra connections allowed under load."),
+    ] = None,
+    pool_warmup: Annotated[
+        int | None,
+        typer.Option("--pool-warmup", help="Connections to open eagerly at startup."),
+    ] = None,
+    pool_pre_ping_idle_s: Annotated[
+        float | None,
+        typer.Option(
+            "--pool-pre-ping-idle",
+            help="Ping pooled connections idle longer than this many seconds.",
+        ),
+    ] = None,
+    query_cache_ttl_s: Annotated[
+        float | None,
+        typer.Option(
+            "--query-cache-ttl",
+            help="Reuse query runner results for this many seconds.",
+        ),
+    ] = None,
+    activity_interval_s: Annotated[
+        float | None,
+        typer.Option(
+            "--activity-interval",
+            help="Seconds between polls in the activity monitor.",
+        ),
+    ] = None,
+    profile_startup: Annotated[
+        bool,
+        typer.Option(
+            "--profile-startup",
+            is_eager=True,
+            callback=_profile_startup,
+            help="Time CLI start-up against its budget and exit.",
+        ),
+    ] = False,
 ) -> None:
+    overrides = {
+        "catalog_snapshot": catalog_snapshot,
+        "metadata_cache": metadata_cache,
+        "statement_timeout_ms": statement_timeout_ms,
+        "lock_timeout_ms": lock_timeout_ms,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_warmup": pool_warmup,
+        "pool_pre_ping_idle_s": pool_pre_ping_idle_s,
+        "query_cache_ttl_s": query_cache_ttl_s,
+        "activity_interval_s": activity_interval_s,
+    }
     if ctx.invoked_subcommand is not None:
+        ctx.obj = {"connection": connection, "overrides": overrides}
         return
-    config = _get_connection_config(connection)
-    asyncio.run(_run_tui(config))
+    config = _get_connection_config(connection, **overrides)
+    import asyncio
+
+    from inspector import commands
+
+    asyncio.run(commands.run_tui(config))
 
 
 if __name__ == "__main__":
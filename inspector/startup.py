@@ -0,0 +1,112 @@
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from typing import NamedTuple
+
+# Wall-clock budgets in milliseconds, interpreter start-up included.
+HELP_BUDGET_MS = 400.0
+HEADLESS_BUDGET_MS = 1200.0
+# Modules the CLI must not import before a command needs a database or UI.
+HEAVY_MODULES = ("asyncpg", "pydantic", "sqlalchemy", "textual")
+SLOWEST_IMPORTS = 8
+
+
+class StartupProbe(NamedTuple):
+    label: str
+    argv: tuple[str, ...]
+    budget_ms: float
+    # Heavy modules allowed on this path.
+    allowed: tuple[str, ...] = ()
+
+
+PROBES = (
+    StartupProbe("inspector --help", ("-m", "inspector", "--help"), HELP_BUDGET_MS),
+    StartupProbe(
+        "inspector query --help",
+        ("-m", "inspector", "query", "--help"),
+        HELP_BUDGET_MS,
+    ),
+    # Everything a headless command imports before it connects.
+    StartupProbe(
+        "headless command",
+        ("-c", "import inspector.main, inspector.commands"),
+        HEADLESS_BUDGET_MS,
+        ("asyncpg", "pydantic", "sqlalchemy"),
+    ),
+)
+
+
+class ImportTiming(NamedTuple):
+    name: str
+    depth: int
+    cumulative_ms: float
+
+
+class StartupProfile(NamedTuple):
+    probe: StartupProbe
+    wall_ms: float
+    imports: list[ImportTiming]
+
+    @property
+    def heavy_modules(self) -> list[str]:
+        return heavy_imports(self.probe, self.imports)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.wall_ms <= self.probe.budget_ms and not self.heavy_modules
+
+    def slowest(self, count: int = SLOWEST_IMPORTS) -> list[ImportTiming]:
+        top_level = [t for t in self.imports if t.depth == 0]
+        return sorted(top_level, key=lambda t: t.cumulative_ms, reverse=True)[:count]
+
+
+# Lines look like `import time: self [us] | cumulative | name`.
+def parse_importtime(output: str) -> list[ImportTiming]:
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), depth, int(cumulative) / 1000))
+    return timings
+
+
+def heavy_imports(probe: StartupProbe, imports: Sequence[ImportTiming]) -> list[str]:
+    loaded = {timing.name.partition(".")[0] for timing in imports}
+    return [m for m in HEAVY_MODULES if m in loaded and m not in probe.allowed]
+
+
+def _run(argv: Sequence[str], *options: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *options, *argv], capture_output=True, text=True, check=False
+    )
+
+
+def profile(probe: StartupProbe, runs: int = 3) -> StartupProfile:
+    wall = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(probe.argv)
+        wall = min(wall, time.perf_counter() - started)
+    return StartupProfile(probe, wall * 1000, trace_imports(probe))
+
+
+def trace_imports(probe: StartupProbe) -> list[ImportTiming]:
+    return parse_importtime(_run(probe.argv, "-X", "importtime").stderr)
+
+
+def format_profile(result: StartupProfile) -> str:
+    status = "ok" if result.within_budget else "OVER BUDGET"
+    lines = [
+        f"{result.probe.label}: {result.wall_ms:.0f} ms "
+        f"(budget {result.probe.budget_ms:.0f} ms) {status}"
+    ]
+    if result.heavy_modules:
+        lines.append(f"  unexpected imports: {', '.join(result.heavy_modules)}")
+    for timing in result.slowest():
+        lines.append(f"  {timing.cumulative_ms:8.1f} ms  {timing.name}")
+    return "\n".join(lines)
@@ -1,9 +1,21 @@
 from inspector.tui.screens.schema_browser import SchemaBrowserScreen
 from inspector.tui.screens.table_view import TableViewScreen
 from inspector.tui.screens.query_runner import QueryRunnerScreen
+from inspector.tui.screens.prompt import PromptScreen
+from inspector.tui.screens.pool_stats import PoolStatsScreen
+from inspector.tui.screens.object_finder import ObjectFinderScreen
+from inspector.tui.screens.plan_view import PlanScreen
+from inspector.tui.screens.activity_monitor import ActivityMonitorScreen
+from inspector.tui.screens.table_stats import TableStatsScreen
 
 __all__ = [
     "SchemaBrowserScreen",
     "TableViewScreen",
     "QueryRunnerScreen",
+    "PromptScreen",
+    "PoolStatsScreen",
+    "ObjectFinderScreen",
+    "PlanScreen",
+    "ActivityMonitorScreen",
+    "TableStatsScreen",
 ]
@@ -0,0 +1,134 @@
+from contextlib import aclosing
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import DataTable, Footer, Static
+from textual.worker import Worker
+
+from inspector.db.activity import ActivitySnapshot, Backend
+from inspector.db.database import DatabaseProvider
+from inspector.tui.widgets.table_helpers import sync_data_table
+
+ACTIVITY_COLUMNS = (
+    "pid",
+    "user",
+    "application",
+    "client",
+    "state",
+    "wait",
+    "xact",
+    "query age",
+    "blocked by",
+    "blocking",
+    "locks",
+    "query",
+)
+
+
+def _format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return ""
+    seconds = max(int(seconds), 0)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+def format_backend(backend: Backend, blocking: int) -> tuple[str, ...]:
+    locks = str(backend.locks_held)
+    if backend.locks_waiting:
+        locks += f" (+{backend.locks_waiting} waiting)"
+    return (
+        str(backend.pid),
+        backend.username,
+        backend.application,
+        backend.client,
+        backend.state,
+        backend.wait,
+        _format_seconds(backend.xact_seconds),
+        _format_seconds(backend.query_seconds),
+        ", ".join(map(str, backend.blocked_by)),
+        str(blocking) if blocking else "",
+        locks,
+        backend.query,
+    )
+
+
+def format_activity_summary(snapshot: ActivitySnapshot, interval: float) -> str:
+    backends = snapshot.backends.values()
+    active = sum(1 for b in backends if b.state == "active")
+    waiting = sum(1 for b in backends if b.blocked_by)
+    summary = (
+        f"{len(snapshot.backends)} backends, {active} active, "
+        f"{waiting} waiting on locks · poll {snapshot.elapsed * 1000:.0f} ms, "
+        f"every {interval:g}s"
+    )
+    if snapshot.truncated:
+        summary += " · showing the first rows only"
+    return summary
+
+
+class ActivityMonitorScreen(Screen[None]):
+    BINDINGS = [
+        ("p", "toggle_pause", "Pause"),
+        ("escape", "back", "Back"),
+    ]
+
+    def __init__(self, database_provider: DatabaseProvider) -> None:
+        super().__init__()
+        self._database_provider = database_provider
+        self._rows: dict[str, tuple[str, ...]] = {}
+        self._poller: Worker[None] | None = None
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static("Server activity", classes="panel-title"),
+            DataTable(id="activity-table", cursor_type="row"),
+            Static("Connecting...", id="activity-status"),
+            id="activity-container",
+        )
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#activity-table", DataTable)
+        for column in ACTIVITY_COLUMNS:
+            table.add_column(column, key=column)
+        table.focus()
+        self._start()
+
+    def _start(self) -> None:
+        self._poller = self.run_worker(self._poll(), exclusive=True)
+
+    async def _poll(self) -> None:
+        status = self.query_one("#activity-status", Static)
+        table = self.query_one("#activity-table", DataTable)
+        interval = self._database_provider.activity_interval
+        try:
+            async with aclosing(
+                self._database_provider.monitor_activity(interval)
+            ) as snapshots:
+                async for snapshot in snapshots:
+                    blocking = snapshot.blocked_counts()
+                    rows = {
+                        str(pid): format_backend(backend, blocking.get(pid, 0))
+                        for pid, backend in snapshot.backends.items()
+                    }
+                    sync_data_table(table, self._rows, rows)
+                    self._rows = rows
+                    status.update(format_activity_summary(snapshot, interval))
+        except Exception as e:  # noqa: BLE001
+            status.update(f"Error: {e!s}")
+
+    def action_toggle_pause(self) -> None:
+        if self._poller is None or self._poller.is_finished:
+            self._start()
+            return
+        self._poller.cancel()
+        self._poller = None
+        self.query_one("#activity-status", Static).update("Paused (p to resume)")
+
+    def action_back(self) -> None:
+        self.app.pop_screen()
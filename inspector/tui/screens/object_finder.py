@@ -0,0 +1,86 @@
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Input, OptionList, Static
+from textual.widgets.option_list import Option
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.object_index import CatalogObject
+
+
+def _option_prompt(obj: CatalogObject) -> Text:
+    prompt = Text(f"{obj.kind[0].upper()}  {obj.name}")
+    if obj.parent_name:
+        prompt.append(f"  {obj.parent_name}", style="dim")
+    return prompt
+
+
+class ObjectFinderScreen(ModalScreen[CatalogObject | None]):
+    BINDINGS = [
+        ("escape", "cancel", "Cancel"),
+        ("down", "cursor_down", "Next"),
+        ("up", "cursor_up", "Previous"),
+    ]
+
+    DEFAULT_CSS = """
+    ObjectFinderScreen {
+        align: center top;
+    }
+    #finder-container {
+        width: 80%;
+        max-width: 100;
+        height: auto;
+        max-height: 80%;
+        margin-top: 2;
+        padding: 0 1;
+        border: thick $primary;
+        background: $surface;
+    }
+    #finder-results {
+        height: auto;
+        max-height: 20;
+    }
+    """
+
+    def __init__(self, database_provider: DatabaseProvider) -> None:
+        super().__init__()
+        self._database_provider = database_provider
+        self._matches: list[CatalogObject] = []
+
+    def compose(self) -> ComposeResult:
+        count = self._database_provider.indexed_object_count()
+        yield Vertical(
+            Static(f"Find schema, table or column ({count} indexed)", id="finder-title"),
+            Input(placeholder="name or schema.name", id="finder-input"),
+            OptionList(id="finder-results"),
+            id="finder-container",
+        )
+
+    def on_mount(self) -> None:
+        self.query_one("#finder-input", Input).focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self._matches = self._database_provider.search_objects(event.value)
+        results = self.query_one("#finder-results", OptionList)
+        results.clear_options()
+        results.add_options(Option(_option_prompt(obj)) for obj in self._matches)
+        if self._matches:
+            results.highlighted = 0
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        results = self.query_one("#finder-results", OptionList)
+        if results.highlighted is not None and self._matches:
+            self.dismiss(self._matches[results.highlighted])
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        self.dismiss(self._matches[event.option_index])
+
+    def action_cursor_down(self) -> None:
+        self.query_one("#finder-results", OptionList).action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        self.query_one("#finder-results", OptionList).action_cursor_up()
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
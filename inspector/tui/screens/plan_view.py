@@ -0,0 +1,135 @@
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import Footer, Static, Tree
+from textual.widgets.tree import TreeNode
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.plan import PlanNode, QueryPlan
+
+HOT_STYLE = "bold red"
+# Row estimates off by more than this factor either way are flagged.
+MISESTIMATE_FACTOR = 10.0
+
+
+def format_plan_summary(plan: QueryPlan) -> str:
+    if not plan.analyzed:
+        return (
+            f"Estimated plan, total cost {plan.root.total_cost:.1f} "
+            "(a: run with ANALYZE)"
+        )
+    parts = [f"Execution {plan.execution_ms or 0.0:.1f} ms"]
+    if plan.planning_ms is not None:
+        parts.append(f"planning {plan.planning_ms:.1f} ms")
+    return ", ".join(parts) + " (ANALYZE, rolled back)"
+
+
+def format_plan_node(
+    node: PlanNode, plan: QueryPlan, total: float | None = None
+) -> str:
+    heading = " ".join(filter(None, [node.node_type, node.target]))
+    if node.detail:
+        heading += f" ({node.detail})"
+    parts = [heading]
+    total = plan.total_weight if total is None else total
+    share = f" ({plan.weight(node) / total:.0%})" if total > 0 else ""
+    if plan.analyzed and node.self_ms is not None:
+        parts.append(f"{node.self_ms:.2f} ms self{share}")
+        factor = node.row_estimate_factor
+        estimated = node.plan_rows * node.loops
+        rows = f"rows {node.actual_rows or 0:,.0f} of est. {estimated:,.0f}"
+        if factor is not None and factor >= MISESTIMATE_FACTOR:
+            rows += f" (x{factor:.0f} under)"
+        elif factor is not None and factor <= 1 / MISESTIMATE_FACTOR:
+            rows += f" (x{1 / factor:.0f} over)"
+        if node.loops > 1:
+            rows += f" in {node.loops} loops"
+        parts.append(rows)
+    else:
+        parts.append(f"cost {node.self_cost:.1f} self{share}")
+        parts.append(f"est. rows {node.plan_rows:,.0f}")
+    if node.shared_hit or node.shared_read:
+        parts.append(f"buffers hit {node.shared_hit} read {node.shared_read}")
+    return " · ".join(parts)
+
+
+class PlanScreen(Screen[None]):
+    BINDINGS = [
+        ("a", "analyze", "Analyze"),
+        ("e", "explain", "Estimate"),
+        ("escape", "back", "Back"),
+    ]
+
+    def __init__(self, database_provider: DatabaseProvider, sql: str) -> None:
+        super().__init__()
+        self._database_provider = database_provider
+        self._sql = sql
+
+    def compose(self) -> ComposeResult:
+        tree: Tree[PlanNode] = Tree("Plan", id="plan-tree")
+        tree.show_root = False
+        yield Vertical(
+            Static("", id="plan-summary"),
+            tree,
+            Static("", id="plan-status"),
+            id="plan-container",
+        )
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.action_explain()
+
+    def action_explain(self) -> None:
+        self.run_worker(self._load(analyze=False), exclusive=True)
+
+    def action_analyze(self) -> None:
+        self.run_worker(self._load(analyze=True), exclusive=True)
+
+    async def _load(self, analyze: bool) -> None:
+        status = self.query_one("#plan-status", Static)
+        status.update(
+            "Running EXPLAIN ANALYZE (the query executes, then rolls back)..."
+            if analyze
+            else "Planning..."
+        )
+        try:
+            plan = await self._database_provider.explain_query(self._sql, analyze)
+        except Exception as e:  # noqa: BLE001
+            status.update(f"Error: {e!s}")
+            return
+        self._show(plan)
+        hot = plan.hot_nodes()
+        status.update(
+            f"{len(hot)} hot node(s) in red; Enter folds a node" if hot else ""
+        )
+
+    def _show(self, plan: QueryPlan) -> None:
+        self.query_one("#plan-summary", Static).update(format_plan_summary(plan))
+        tree = self.query_one("#plan-tree", Tree)
+        tree.clear()
+        hot = plan.hot_nodes()
+        hot_ids = {id(node) for node in hot}
+        total = plan.total_weight
+        tree_nodes: dict[int, TreeNode[PlanNode]] = {}
+
+        def add(parent: TreeNode[PlanNode], node: PlanNode) -> None:
+            label = Text(format_plan_node(node, plan, total))
+            if id(node) in hot_ids:
+                label.stylize(HOT_STYLE)
+            if node.children:
+                branch = parent.add(label, data=node, expand=True)
+                for child in node.children:
+                    add(branch, child)
+            else:
+                branch = parent.add_leaf(label, data=node)
+            tree_nodes[id(node)] = branch
+
+        add(tree.root, plan.root)
+        tree.root.expand()
+        if hot:
+            tree.call_after_refresh(tree.move_cursor, tree_nodes[id(hot[0])])
+        tree.focus()
+
+    def action_back(self) -> None:
+        self.app.pop_screen()
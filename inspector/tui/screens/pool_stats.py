@@ -0,0 +1,68 @@
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Static
+
+from inspector.db.connection import PoolStats
+from inspector.db.database import DatabaseProvider
+
+REFRESH_INTERVAL = 1.0
+
+
+def format_pool_stats(stats: PoolStats | None) -> str:
+    if stats is None:
+        return "Connection pool is not initialized."
+    return "\n".join(
+        [
+            f"Pool size:      {stats.size}",
+            f"Checked out:    {stats.checked_out}",
+            f"Idle:           {stats.checked_in}",
+            f"Overflow:       {stats.overflow}",
+            f"Acquisitions:   {stats.acquisitions}",
+            f"Mean wait:      {stats.mean_wait * 1000:.1f} ms",
+            f"Max wait:       {stats.max_wait * 1000:.1f} ms",
+            f"Pre-pings:      {stats.pings}",
+        ]
+    )
+
+
+class PoolStatsScreen(ModalScreen[None]):
+    BINDINGS = [
+        ("escape", "close", "Close"),
+        ("f2", "close", "Close"),
+    ]
+
+    DEFAULT_CSS = """
+    PoolStatsScreen {
+        align: center middle;
+    }
+    #pool-stats {
+        width: 44;
+        height: auto;
+        padding: 1 2;
+        border: thick $primary;
+        background: $surface;
+    }
+    """
+
+    def __init__(self, database_provider: DatabaseProvider) -> None:
+        super().__init__()
+        self._database_provider = database_provider
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static("Connection pool", classes="panel-title"),
+            Static("", id="pool-stats-body"),
+            id="pool-stats",
+        )
+
+    def on_mount(self) -> None:
+        self._refresh_stats()
+        self.set_interval(REFRESH_INTERVAL, self._refresh_stats)
+
+    def _refresh_stats(self) -> None:
+        body = self.query_one("#pool-stats-body", Static)
+        body.update(format_pool_stats(self._database_provider.pool_stats()))
+
+    def action_close(self) -> None:
+        self.dismiss(None)
@@ -1,53 +1,213 @@
+import asyncio
+import time
+
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.screen import Screen
-from textual.widgets import DataTable, Footer, Static, TextArea
+from textual.widgets import Footer, OptionList, Static, TextArea
+from textual.worker import Worker
+
+from inspector.db.completion import MetadataRequest
+from inspector.db.database import DatabaseProvider, QueryStream
+from inspector.db.formats import format_for_path
+from inspector.db.result import QueryResult
+from inspector.tui.screens.plan_view import PlanScreen
+from inspector.tui.screens.prompt import PromptScreen
+from inspector.tui.widgets.sql_editor import SqlEditor
+from inspector.tui.widgets.table_helpers import (
+    append_data_table_rows,
+    populate_data_table,
+)
+from inspector.tui.widgets.virtual_table import VirtualDataTable
+
+FETCH_AHEAD_ROWS = 50
+
 
-from inspector.db.database import DatabaseProvider
-from inspector.tui.widgets.table_helpers import populate_data_table
+def _format_stream_status(stream: QueryStream) -> str:
+    if stream.cancelled:
+        status = f"Rows: {stream.row_count} (cancelled)"
+    elif stream.truncated:
+        status = f"Rows: {stream.row_count} (result limit reached)"
+    elif stream.exhausted:
+        status = f"Rows: {stream.row_count}"
+    else:
+        status = f"Rows: {stream.row_count}+ (scroll for more)"
+    if stream.cached_at is not None:
+        age = time.monotonic() - stream.cached_at
+        status += f" · cached {age:.0f}s ago (Ctrl+R to refresh)"
+    return status
 
 
 class QueryRunnerScreen(Screen[None]):
     BINDINGS = [
         ("ctrl+enter", "run_query", "Run"),
+        ("ctrl+r", "refresh_query", "Refresh"),
+        ("ctrl+x", "cancel_query", "Cancel"),
+        ("ctrl+e", "export", "Export"),
+        ("ctrl+l", "explain", "Plan"),
         ("escape", "back", "Back"),
     ]
 
+    DEFAULT_CSS = """
+    #query-completions {
+        display: none;
+        height: auto;
+        max-height: 8;
+    }
+    """
+
     def __init__(self, database_provider: DatabaseProvider) -> None:
         super().__init__()
         self._database_provider = database_provider
+        self._stream: QueryStream | None = None
+        self._query_worker: Worker[None] | None = None
+        self._more_wanted = asyncio.Event()
+        self._requested_metadata: set[MetadataRequest] = set()
 
     def compose(self) -> ComposeResult:
         yield Vertical(
-            Static("SQL (Ctrl+Enter to run)", id="query-label"),
-            TextArea(id="query-input"),
+            Static("SQL (Ctrl+Enter to run, Tab to complete)", id="query-label"),
+            SqlEditor(id="query-input"),
+            OptionList(id="query-completions"),
             Static("Results", id="results-label"),
-            DataTable(id="query-results", cursor_type="row"),
+            VirtualDataTable(id="query-results"),
             Static("", id="query-status"),
             id="query-container",
         )
         yield Footer()
 
     def on_mount(self) -> None:
-        self.query_one("#query-input", TextArea).focus()
+        editor = self.query_one("#query-input", SqlEditor)
+        editor.completion_list = self.query_one("#query-completions", OptionList)
+        editor.focus()
+
+    def _update_completions(self, editor: SqlEditor, force: bool = False) -> None:
+        # Served from in-memory metadata only; anything missing is fetched by
+        # a worker and the completion refreshed when it arrives.
+        completion = self._database_provider.complete_sql(
+            editor.text, editor.cursor_offset, force
+        )
+        editor.show_completions(completion)
+        for request in completion.missing:
+            if request not in self._requested_metadata:
+                self._requested_metadata.add(request)
+                self.run_worker(self._load_metadata(editor, request), group="completion")
 
-    def action_run_query(self) -> None:
+    async def _load_metadata(self, editor: SqlEditor, request: MetadataRequest) -> None:
+        try:
+            await self._database_provider.load_completion_metadata(request)
+        except Exception:  # noqa: BLE001
+            return
+        # Refresh for wherever the cursor is now; typing may have moved on.
+        if editor.has_focus and not editor.just_completed:
+            self._update_completions(editor)
+
+    def on_text_area_changed(self, event: TextArea.Changed) -> None:
+        editor = event.text_area
+        if isinstance(editor, SqlEditor) and not editor.just_completed:
+            self._update_completions(editor)
+
+    def on_text_area_selection_changed(self, event: TextArea.SelectionChanged) -> None:
+        editor = event.text_area
+        if isinstance(editor, SqlEditor) and editor.completing:
+            if editor.cursor_offset != editor.completion_offset:
+                editor.hide_completions()
+
+    def on_sql_editor_completion_requested(
+        self, event: SqlEditor.CompletionRequested
+    ) -> None:
+        self._update_completions(event.editor, force=True)
+
+    def action_run_query(self, refresh: bool = False) -> None:
         ta = self.query_one("#query-input", TextArea)
         sql = (ta.text or "").strip()
         if not sql:
             return
-        self.run_worker(self._execute(sql), exclusive=True)
+        self.action_cancel_query()
+        self._query_worker = self.run_worker(self._execute(sql, refresh), exclusive=True)
+
+    def action_refresh_query(self) -> None:
+        self.action_run_query(refresh=True)
+
+    def action_cancel_query(self) -> None:
+        if self._stream is not None:
+            self._stream.cancel()
+        if self._query_worker is not None and not self._query_worker.is_finished:
+            self._query_worker.cancel()
+        self._query_worker = None
+
+    def action_export(self) -> None:
+        sql = (self.query_one("#query-input", TextArea).text or "").strip()
+        if not sql:
+            return
+        self.app.push_screen(
+            PromptScreen(
+                "Export query result to file (.csv, .jsonl or .parquet)",
+                value="query.csv",
+            ),
+            lambda path: self._on_export_target(sql, path),
+        )
+
+    def action_explain(self) -> None:
+        sql = (self.query_one("#query-input", TextArea).text or "").strip()
+        if sql:
+            self.app.push_screen(PlanScreen(self._database_provider, sql))
+
+    def _on_export_target(self, sql: str, path: str | None) -> None:
+        if path is not None:
+            self.run_worker(self._export(sql, path), group="export", exclusive=True)
+
+    async def _export(self, sql: str, path: str) -> None:
+        status = self.query_one("#query-status", Static)
+        status.update(f"Exporting to {path}...")
+        try:
+            result = await self._database_provider.export_query(
+                sql, format_for_path(path) or "csv", path
+            )
+        except Exception as e:  # noqa: BLE001
+            status.update(f"Export failed: {e!s}")
+            return
+        status.update(
+            f"Exported {result.rows} rows to {path} in {result.elapsed:.1f}s"
+        )
+
+    def on_virtual_data_table_row_highlighted(
+        self, event: VirtualDataTable.RowHighlighted
+    ) -> None:
+        if event.cursor_row >= event.virtual_table.row_count - FETCH_AHEAD_ROWS:
+            self._more_wanted.set()
 
-    async def _execute(self, sql: str) -> None:
+    async def _execute(self, sql: str, refresh: bool = False) -> None:
         status = self.query_one("#query-status", Static)
         status.update("Running...")
+        table = self.query_one("#query-results", VirtualDataTable)
+        stream = self._database_provider.stream_query(sql, refresh=refresh)
+        self._stream = stream
         try:
-            columns, rows = await self._database_provider.run_query(sql)
-            table = self.query_one("#query-results", DataTable)
-            populate_data_table(table, columns, rows)
-            status.update(f"Rows: {len(rows)}")
+            first_batch = True
+            async for batch in stream:
+                if first_batch:
+                    populate_data_table(table, batch)
+                    first_batch = False
+                else:
+                    append_data_table_rows(table, batch)
+                status.update(_format_stream_status(stream))
+                if len(batch) < stream.batch_size:
+                    continue
+                self._more_wanted.clear()
+                await self._more_wanted.wait()
+            if first_batch:
+                populate_data_table(table, QueryResult.empty(stream.columns))
+            status.update(_format_stream_status(stream))
+        except asyncio.CancelledError:
+            stream.cancel()
+            status.update(_format_stream_status(stream))
+            raise
         except Exception as e:  # noqa: BLE001
             status.update(f"Error: {e!s}")
+        finally:
+            if self._stream is stream:
+                self._stream = None
 
     def action_back(self) -> None:
         self.app.pop_screen()
@@ -1,3 +1,6 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.screen import Screen
@@ -5,13 +8,46 @@ from textual.widgets import Footer, Static, Tree
 from textual.widgets.tree import TreeNode
 
 from inspector.db.database import DatabaseProvider
+from inspector.db.metadata import TableInfo, group_partitions
+from inspector.db.object_index import CatalogObject
+from inspector.tui.screens.object_finder import ObjectFinderScreen
 from inspector.tui.screens.query_runner import QueryRunnerScreen
+from inspector.tui.screens.table_stats import TableStatsScreen
 from inspector.tui.screens.table_view import TableViewScreen
+from inspector.tui.widgets.table_helpers import format_bytes, format_row_estimate
+
+
+TREE_CHUNK_SIZE = 200
+
+# Children of a schema are keyed by the schema name, partitions by
+# (schema name, parent table name).
+ChildrenKey = str | tuple[str, str]
+
+
+class MoreChildren(NamedTuple):
+    key: ChildrenKey
+    offset: int
+
+
+def _table_label(table: TableInfo, partition_count: int = 0) -> str:
+    parts: list[str] = []
+    if table.estimated_rows is not None:
+        parts.append(f"{format_row_estimate(table.estimated_rows)} rows")
+    if table.total_bytes is not None:
+        parts.append(format_bytes(table.total_bytes))
+    if partition_count:
+        parts.append(f"{partition_count} partitions")
+    if not parts:
+        return table.table_name
+    return f"{table.table_name}  {' · '.join(parts)}"
 
 
 class SchemaBrowserScreen(Screen[None]):
     BINDINGS = [
         ("q", "query", "Query"),
+        ("slash", "find", "Find"),
+        ("o", "open_table", "Open table"),
+        ("h", "hot_tables", "Hot tables"),
         ("escape", "back", "Back"),
     ]
 
@@ -21,6 +57,10 @@ class SchemaBrowserScreen(Screen[None]):
     ) -> None:
         super().__init__()
         self._database_provider = database_provider
+        self._schema_nodes: dict[str, TreeNode] = {}
+        self._children: dict[ChildrenKey, list[TableInfo]] = {}
+        self._partitions: dict[str, dict[str, list[TableInfo]]] = {}
+        self._populated: set[ChildrenKey] = set()
 
     def compose(self) -> ComposeResult:
         tree = Tree("Schemas", id="schema-tree")
@@ -33,7 +73,10 @@ class SchemaBrowserScreen(Screen[None]):
                 id="schema-panel",
             ),
             Vertical(
-                Static("Select a table (Enter) or open Query (q)", id="schema-hint"),
+                Static(
+                    "Select a table (Enter), find an object (/) or open Query (q)",
+                    id="schema-hint",
+                ),
                 id="content-panel",
             ),
             id="browser-layout",
@@ -47,36 +90,129 @@ class SchemaBrowserScreen(Screen[None]):
         tree = self.query_one("#schema-tree", Tree)
         schemas = await self._database_provider.list_schemas()
         for s in schemas:
-            tree.root.add(s.name, expand=False)
+            self._schema_nodes[s.name] = tree.root.add(s.name, data=s.name, expand=False)
+        self.run_worker(self._prefill_tables(list(self._schema_nodes)), group="prefill")
+
+    async def _prefill_tables(self, schema_names: list[str]) -> None:
+        # Only warms the metadata cache; nodes are built when a schema is
+        # expanded.
+        try:
+            async for _ in self._database_provider.iter_tables(schema_names):
+                pass
+        except Exception:  # noqa: BLE001
+            return
 
     def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
         node = event.node
-        if not node.children:
-            schema_name = str(node.label).strip()
-            self.run_worker(self._load_tables(node, schema_name), exclusive=False)
+        if isinstance(node.data, str) and node.data not in self._populated:
+            self.run_worker(self._load_tables(node.data), exclusive=False)
+        elif isinstance(node.data, TableInfo):
+            key = (node.data.schema_name, node.data.table_name)
+            if key not in self._populated:
+                self._populated.add(key)
+                self._add_chunk(node, key, 0)
 
-    async def _load_tables(self, schema_node: TreeNode, schema_name: str) -> None:
+    async def _load_tables(self, schema_name: str) -> None:
         tables = await self._database_provider.list_tables(schema_name)
-        for t in tables:
-            schema_node.add_leaf(t.table_name)
+        self._populate_schema(schema_name, tables)
+
+    def _populate_schema(self, schema_name: str, tables: Sequence[TableInfo]) -> None:
+        schema_node = self._schema_nodes.get(schema_name)
+        if schema_node is None or schema_name in self._populated:
+            return
+        self._populated.add(schema_name)
+        top_level, partitions = group_partitions(tables)
+        self._children[schema_name] = top_level
+        self._partitions[schema_name] = partitions
+        for parent, children in partitions.items():
+            self._children[(schema_name, parent)] = children
+        self._add_chunk(schema_node, schema_name, 0)
+
+    def _add_chunk(self, node: TreeNode, key: ChildrenKey, offset: int) -> None:
+        children = self._children.get(key, [])
+        end = offset + TREE_CHUNK_SIZE
+        for table in children[offset:end]:
+            partitions = self._partitions.get(table.schema_name, {})
+            count = len(partitions.get(table.table_name, ()))
+            label = _table_label(table, count)
+            if count:
+                node.add(label, data=table, expand=False)
+            else:
+                node.add_leaf(label, data=table)
+        remaining = len(children) - end
+        if remaining > 0:
+            node.add_leaf(
+                f"… show {min(remaining, TREE_CHUNK_SIZE)} more ({remaining} left)",
+                data=MoreChildren(key, end),
+            )
+
+    def _show_more(self, node: TreeNode) -> None:
+        more: MoreChildren = node.data
+        parent = node.parent
+        if parent is None:
+            return
+        node.remove()
+        self._add_chunk(parent, more.key, more.offset)
+
+    def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
+        if isinstance(event.node.data, MoreChildren):
+            self._show_more(event.node)
 
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         node = event.node
-        tree = self.query_one("#schema-tree", Tree)
-        if (
-            node.parent is not None
-            and node.parent is not tree.root
-            and not node.allow_expand
-        ):
-            schema_name = str(node.parent.label).strip()
-            table_name = str(node.label).strip()
+        if isinstance(node.data, MoreChildren):
+            self._show_more(node)
+        elif isinstance(node.data, TableInfo) and not node.allow_expand:
+            self._open_table(node.data)
+
+    def action_open_table(self) -> None:
+        node = self.query_one("#schema-tree", Tree).cursor_node
+        if node is not None and isinstance(node.data, TableInfo):
+            self._open_table(node.data)
+
+    def _open_table(self, table: TableInfo) -> None:
+        self.app.push_screen(
+            TableViewScreen(
+                schema_name=table.schema_name,
+                table_name=table.table_name,
+                database_provider=self._database_provider,
+                table_info=table,
+            )
+        )
+
+    def action_hot_tables(self) -> None:
+        node = self.query_one("#schema-tree", Tree).cursor_node
+        if node is None:
+            return
+        if isinstance(node.data, TableInfo):
+            schema_name = node.data.schema_name
+        elif isinstance(node.data, str):
+            schema_name = node.data
+        else:
+            return
+        self.app.push_screen(TableStatsScreen(self._database_provider, schema_name))
+
+    def action_find(self) -> None:
+        self.app.push_screen(ObjectFinderScreen(self._database_provider), self._on_found)
+
+    def _on_found(self, obj: CatalogObject | None) -> None:
+        if obj is None:
+            return
+        if obj.table_name is not None:
             self.app.push_screen(
                 TableViewScreen(
-                    schema_name=schema_name,
-                    table_name=table_name,
+                    schema_name=obj.schema_name,
+                    table_name=obj.table_name,
                     database_provider=self._database_provider,
                 )
             )
+            return
+        node = self._schema_nodes.get(obj.schema_name)
+        if node is not None:
+            tree = self.query_one("#schema-tree", Tree)
+            node.expand()
+            tree.move_cursor(node)
+            tree.focus()
 
     def action_query(self) -> None:
         self.app.push_screen(QueryRunnerScreen(database_provider=self._database_provider))
@@ -0,0 +1,145 @@
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import DataTable, Footer, Static
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.table_stats import (
+    RANKING_METRICS,
+    TableRates,
+    TableStats,
+    TableStatsSnapshot,
+    rank_tables,
+)
+from inspector.tui.widgets.table_helpers import format_bytes, sync_data_table
+
+REFRESH_INTERVAL = 10.0
+
+TABLE_STATS_COLUMNS = (
+    "table",
+    "seq scans",
+    "seq rows",
+    "cache hit",
+    "dead",
+    "bloat (est.)",
+    "unused indexes",
+    "seq/s",
+    "idx/s",
+    "writes/s",
+    "reads/s",
+)
+
+
+def _percent(ratio: float | None) -> str:
+    return "" if ratio is None else f"{ratio:.1%}"
+
+
+def _rate(value: float | None) -> str:
+    return "" if value is None else f"{value:,.1f}"
+
+
+def format_table_stats_row(
+    stats: TableStats, rates: TableRates | None
+) -> tuple[str, ...]:
+    unused = ""
+    if stats.unused_indexes:
+        unused = (
+            f"{len(stats.unused_indexes)} of {stats.index_count}, "
+            f"{format_bytes(stats.unused_index_bytes)}"
+        )
+    return (
+        stats.table_name,
+        _percent(stats.seq_scan_ratio),
+        f"{stats.seq_tup_read:,}",
+        _percent(stats.cache_hit_ratio),
+        _percent(stats.dead_ratio),
+        format_bytes(stats.bloat_bytes) if stats.bloat_bytes else "",
+        unused,
+        _rate(rates.seq_scan if rates else None),
+        _rate(rates.idx_scan if rates else None),
+        _rate(rates.tup_written if rates else None),
+        _rate(rates.blks_read if rates else None),
+    )
+
+
+class TableStatsScreen(Screen[None]):
+    BINDINGS = [
+        ("s", "next_metric", "Rank by"),
+        ("r", "refresh", "Refresh"),
+        ("escape", "back", "Back"),
+    ]
+
+    def __init__(self, database_provider: DatabaseProvider, schema_name: str) -> None:
+        super().__init__()
+        self._database_provider = database_provider
+        self._schema_name = schema_name
+        self._metric = next(iter(RANKING_METRICS))
+        self._previous: TableStatsSnapshot | None = None
+        self._snapshot: TableStatsSnapshot | None = None
+        self._rates: dict[str, TableRates] = {}
+        self._rows: dict[str, tuple[str, ...]] = {}
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static(f"Hot tables in {self._schema_name}", classes="panel-title"),
+            DataTable(id="table-stats", cursor_type="row"),
+            Static("Loading...", id="table-stats-status"),
+            id="table-stats-container",
+        )
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#table-stats", DataTable)
+        for column in TABLE_STATS_COLUMNS:
+            table.add_column(column, key=column)
+        table.focus()
+        self.action_refresh()
+        self.set_interval(REFRESH_INTERVAL, self.action_refresh)
+
+    def action_refresh(self) -> None:
+        self.run_worker(self._load(), exclusive=True)
+
+    async def _load(self) -> None:
+        try:
+            snapshot = await self._database_provider.table_stats(self._schema_name)
+        except Exception as e:  # noqa: BLE001
+            self.query_one("#table-stats-status", Static).update(f"Error: {e!s}")
+            return
+        self._previous, self._snapshot = self._snapshot, snapshot
+        if self._previous is not None:
+            self._rates = snapshot.rates_since(self._previous)
+        self._show()
+
+    def _show(self) -> None:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        table = self.query_one("#table-stats", DataTable)
+        rows = {
+            name: format_table_stats_row(stats, self._rates.get(name))
+            for name, stats in snapshot.tables.items()
+        }
+        sync_data_table(table, self._rows, rows)
+        self._rows = rows
+        rank = {
+            name: position
+            for position, name in enumerate(
+                rank_tables(snapshot, self._metric, self._rates)
+            )
+        }
+        table.sort("table", key=rank.__getitem__)
+        status = f"Ranked by {RANKING_METRICS[self._metric].label} (s to change)"
+        if self._previous is None:
+            status += f" · rates after the next refresh in {REFRESH_INTERVAL:g}s"
+        else:
+            elapsed = snapshot.taken_at - self._previous.taken_at
+            status += f" · rates over the last {elapsed:.0f}s"
+        self.query_one("#table-stats-status", Static).update(status)
+
+    def action_next_metric(self) -> None:
+        metrics = list(RANKING_METRICS)
+        self._metric = metrics[(metrics.index(self._metric) + 1) % len(metrics)]
+        self._show()
+
+    def action_back(self) -> None:
+        self.app.pop_screen()
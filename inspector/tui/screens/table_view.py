@@ -1,32 +1,71 @@
+from collections.abc import Mapping
+from typing import Any
+
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.screen import Screen
-from textual.widgets import DataTable, Footer, Static
+from textual.widgets import Footer, Static
 
 from inspector.db.database import DatabaseProvider
+from inspector.db.formats import format_for_path
+from inspector.db.lookup import advise_lookup, parse_lookup
+from inspector.db.metadata import ForeignKeyInfo, TableConstraints, TableInfo
+from inspector.db.paging import PAGE_SIZE, PageCache, TablePager
+from inspector.db.result import QueryResult
+from inspector.tui.screens.prompt import PromptScreen
 from inspector.tui.screens.query_runner import QueryRunnerScreen
-from inspector.tui.widgets.table_helpers import populate_data_table
-
-PAGE_SIZE = 100
-
-
-def _quote_identifier(identifier: str) -> str:
-    escaped = identifier.replace('"', '""')
-    return f'"{escaped}"'
+from inspector.tui.widgets.table_helpers import format_table_stats, populate_data_table
+from inspector.tui.widgets.virtual_table import VirtualDataTable
 
 
-def _format_status(offset: int, loaded_rows: int) -> str:
+def _format_status(offset: int, loaded_rows: int, mode: str) -> str:
     if loaded_rows == 0:
-        return f"Rows 0 (offset {offset}, limit {PAGE_SIZE})"
+        return f"Rows 0 (offset {offset}, limit {PAGE_SIZE}, {mode})"
     start = offset + 1
     end = offset + loaded_rows
-    return f"Rows {start}-{end} (limit {PAGE_SIZE})"
+    return f"Rows {start}-{end} (limit {PAGE_SIZE}, {mode})"
+
+
+def _format_cache_status(cache: PageCache) -> str:
+    return f"cache {cache.hits} hit / {cache.misses} miss"
+
+
+def _format_page_position(page_index: int, page_count: int | None) -> str:
+    if page_count is None:
+        return f"page {page_index + 1}"
+    return f"page {page_index + 1} of ~{max(page_count, page_index + 1)}"
+
+
+def format_foreign_key(foreign_key: ForeignKeyInfo) -> str:
+    return (
+        f"({', '.join(foreign_key.columns)}) -> {foreign_key.referenced_schema}."
+        f"{foreign_key.referenced_table}({', '.join(foreign_key.referenced_columns)})"
+    )
+
+
+def _format_conditions(conditions: Mapping[str, Any]) -> str:
+    return " and ".join(f"{column} = {value!r}" for column, value in conditions.items())
+
+
+def parse_jump_target(value: str) -> tuple[str, float] | None:
+    value = value.strip()
+    try:
+        if value.endswith("%"):
+            return "fraction", float(value[:-1]) / 100
+        return "page", float(int(value))
+    except ValueError:
+        return None
 
 
 class TableViewScreen(Screen[None]):
     BINDINGS = [
         ("n", "next_page", "Next page"),
         ("p", "prev_page", "Prev page"),
+        ("g", "jump", "Jump"),
+        ("f", "find_rows", "Find"),
+        ("k", "follow_key", "Follow FK"),
+        ("r", "all_rows", "All rows"),
+        ("x", "export", "Export"),
         ("q", "query", "Query"),
         ("escape", "back", "Back"),
     ]
@@ -36,18 +75,24 @@ class TableViewScreen(Screen[None]):
         schema_name: str,
         table_name: str,
         database_provider: DatabaseProvider,
+        table_info: TableInfo | None = None,
+        lookup: Mapping[str, Any] | None = None,
     ) -> None:
         super().__init__()
         self._schema_name = schema_name
         self._table_name = table_name
         self._database_provider = database_provider
-        self._offset = 0
+        self._table_info = table_info
+        self._pager = TablePager(database_provider, schema_name, table_name, PAGE_SIZE)
         self._total_loaded = 0
+        self._lookup = lookup
+        self._constraints = TableConstraints()
+        self._column_names: tuple[str, ...] = ()
 
     def compose(self) -> ComposeResult:
         yield Vertical(
             Static(f"Table: {self._schema_name}.{self._table_name}", id="table-header"),
-            DataTable(id="table-data", cursor_type="row"),
+            VirtualDataTable(id="table-data"),
             Static("", id="table-status"),
             id="table-container",
         )
@@ -59,34 +104,259 @@ class TableViewScreen(Screen[None]):
     async def _load_initial_view(self) -> None:
         status = self.query_one("#table-status", Static)
         status.update("Loading...")
-        await self._database_provider.list_columns(self._schema_name, self._table_name)
-        await self._load_page()
-
-    def _build_page_query(self) -> str:
-        quoted_schema = _quote_identifier(self._schema_name)
-        quoted_table = _quote_identifier(self._table_name)
-        return (
-            f"SELECT * FROM {quoted_schema}.{quoted_table} "
-            f"LIMIT {PAGE_SIZE} OFFSET {self._offset}"
+        await self._load_table_metadata()
+        if self._lookup is not None:
+            await self._run_lookup(self._lookup)
+        else:
+            self._show_page(await self._pager.first_page())
+
+    async def _load_table_metadata(self) -> None:
+        # Screens opened from the object finder or a foreign key get no
+        # TableInfo; the row estimate drives both paging and lookup advice.
+        if self._table_info is None:
+            self._table_info = await self._database_provider.get_table(
+                self._schema_name, self._table_name
+            )
+        if self._table_info is not None:
+            self._pager.estimated_rows = self._table_info.estimated_rows
+            self._update_header()
+        columns = await self._database_provider.list_columns(
+            self._schema_name, self._table_name
+        )
+        self._column_names = tuple(c.column_name for c in columns)
+        self._constraints = await self._database_provider.list_constraints(
+            self._schema_name, self._table_name
         )
 
+    def _update_header(self) -> None:
+        header = f"Table: {self._schema_name}.{self._table_name}"
+        stats = format_table_stats(self._table_info) if self._table_info else ""
+        if stats:
+            header = f"{header} ({stats})"
+        self.query_one("#table-header", Static).update(header)
+
     def action_next_page(self) -> None:
-        self._offset += PAGE_SIZE
-        self.run_worker(self._load_page(), exclusive=True)
+        self.run_worker(self._load_next_page(), exclusive=True)
 
     def action_prev_page(self) -> None:
-        if self._offset > 0:
-            self._offset = max(0, self._offset - PAGE_SIZE)
-            self.run_worker(self._load_page(), exclusive=True)
-
-    async def _load_page(self) -> None:
-        sql = self._build_page_query()
-        cols, rows = await self._database_provider.run_query(sql)
-        self._total_loaded = len(rows)
-        table = self.query_one("#table-data", DataTable)
-        populate_data_table(table, cols, rows)
+        if self._pager.page_index > 0:
+            self.run_worker(self._load_prev_page(), exclusive=True)
+
+    async def _load_next_page(self) -> None:
+        result = await self._pager.next_page()
+        if result is None:
+            self._update_status(suffix=" - end of table")
+            return
+        self._show_page(result)
+
+    async def _load_prev_page(self) -> None:
+        result = await self._pager.prev_page()
+        if result is not None:
+            self._show_page(result)
+
+    def action_jump(self) -> None:
+        self.app.push_screen(
+            PromptScreen("Jump to page number or percentage", placeholder="e.g. 120 or 50%"),
+            self._on_jump_target,
+        )
+
+    def _on_jump_target(self, value: str | None) -> None:
+        if value is None:
+            return
+        target = parse_jump_target(value)
+        if target is None:
+            self._update_status(suffix=f" - invalid jump target {value!r}")
+            return
+        self._cancel_prefetch()
+        self.run_worker(self._jump(*target), exclusive=True)
+
+    async def _jump(self, kind: str, amount: float) -> None:
+        self._update_status(suffix=" - seeking...")
+        try:
+            if kind == "fraction":
+                result = await self._pager.jump_to_fraction(amount)
+            else:
+                result = await self._pager.jump_to_page(int(amount))
+        except ValueError as e:
+            self._update_status(suffix=f" - {e!s}")
+            return
+        if result is None:
+            self._update_status(suffix=" - jump target not found")
+            return
+        self._show_page(result)
+
+    def action_find_rows(self) -> None:
+        indexed = self._constraints.indexed_columns()
+        label = "Find rows where column = value"
+        label += f" (indexed: {', '.join(indexed)})" if indexed else " (no indexes)"
+        self.app.push_screen(
+            PromptScreen(
+                label,
+                placeholder="column = value",
+                value=f"{indexed[0]} = " if indexed else "",
+            ),
+            self._on_find_target,
+        )
+
+    def _on_find_target(self, value: str | None) -> None:
+        if value is None:
+            return
+        try:
+            column, target = parse_lookup(value)
+        except ValueError as e:
+            self._update_status(suffix=f" - {e!s}")
+            return
+        self.run_worker(self._find(column, target), exclusive=True)
+
+    async def _find(self, column: str, target: str | None) -> None:
+        # Cache hits once the screen has loaded; covers a find started earlier.
+        await self._load_table_metadata()
+        if column not in self._column_names:
+            self._update_status(suffix=f" - no column {column!r}")
+            return
+        estimated_rows = self._table_info.estimated_rows if self._table_info else None
+        advice = advise_lookup(self._constraints, [column], estimated_rows)
+        if advice.warning is None:
+            await self._run_lookup({column: target})
+            return
+        self.app.push_screen(
+            PromptScreen(f"{advice.warning}. Type yes to run it anyway."),
+            lambda answer: self._on_scan_confirmed(answer, {column: target}),
+        )
+
+    def _on_scan_confirmed(self, answer: str | None, conditions: dict[str, Any]) -> None:
+        if answer is not None and answer.lower() in ("y", "yes"):
+            self.run_worker(self._run_lookup(conditions), exclusive=True)
+
+    async def _run_lookup(self, conditions: Mapping[str, Any]) -> None:
         status = self.query_one("#table-status", Static)
-        status.update(_format_status(self._offset, self._total_loaded))
+        status.update(f"Looking up {_format_conditions(conditions)}...")
+        try:
+            result = await self._database_provider.lookup_rows(
+                self._schema_name, self._table_name, conditions
+            )
+        except Exception as e:  # noqa: BLE001
+            status.update(f"Lookup failed: {e!s}")
+            return
+        populate_data_table(self.query_one("#table-data", VirtualDataTable), result)
+        index = self._constraints.lookup_index(conditions)
+        access = f"index {index.index_name}" if index else "no index"
+        hints = " · r: all rows"
+        if self._constraints.foreign_keys:
+            hints += " · k: follow a foreign key"
+        status.update(
+            f"{len(result)} rows where {_format_conditions(conditions)} ({access}){hints}"
+        )
+
+    def action_all_rows(self) -> None:
+        self._cancel_prefetch()
+        self.run_worker(self._load_first_page(), exclusive=True)
+
+    async def _load_first_page(self) -> None:
+        self._show_page(await self._pager.first_page())
+
+    def action_follow_key(self) -> None:
+        foreign_keys = self._constraints.foreign_keys
+        if not foreign_keys:
+            self._update_status(suffix=" - table has no foreign keys")
+            return
+        if len(foreign_keys) == 1:
+            self._follow(foreign_keys[0])
+            return
+        choices = " ".join(
+            f"{number}: {format_foreign_key(fk)}"
+            for number, fk in enumerate(foreign_keys, start=1)
+        )
+        self.app.push_screen(
+            PromptScreen(f"Follow which foreign key? {choices}", value="1"),
+            self._on_key_chosen,
+        )
+
+    def _on_key_chosen(self, value: str | None) -> None:
+        if value is None:
+            return
+        foreign_keys = self._constraints.foreign_keys
+        try:
+            foreign_key = foreign_keys[int(value) - 1]
+        except (ValueError, IndexError):
+            self._update_status(suffix=f" - no foreign key {value!r}")
+            return
+        self._follow(foreign_key)
+
+    def _follow(self, foreign_key: ForeignKeyInfo) -> None:
+        table = self.query_one("#table-data", VirtualDataTable)
+        if table.row_count == 0:
+            return
+        row = table.store.row(table.cursor_row)
+        try:
+            values = [row[table.columns.index(c)] for c in foreign_key.columns]
+        except ValueError:
+            self._update_status(suffix=f" - {format_foreign_key(foreign_key)} not shown")
+            return
+        if any(value is None for value in values):
+            self._update_status(suffix=" - foreign key is NULL in this row")
+            return
+        self.app.push_screen(
+            TableViewScreen(
+                schema_name=foreign_key.referenced_schema,
+                table_name=foreign_key.referenced_table,
+                database_provider=self._database_provider,
+                lookup=dict(zip(foreign_key.referenced_columns, values)),
+            )
+        )
+
+    def action_export(self) -> None:
+        self.app.push_screen(
+            PromptScreen(
+                "Export table to file (.csv, .jsonl or .parquet)",
+                value=f"{self._schema_name}.{self._table_name}.csv",
+            ),
+            self._on_export_target,
+        )
+
+    def _on_export_target(self, path: str | None) -> None:
+        if path is not None:
+            self.run_worker(self._export(path), group="export", exclusive=True)
+
+    async def _export(self, path: str) -> None:
+        self._update_status(suffix=f" - exporting to {path}...")
+        try:
+            result = await self._database_provider.export_table(
+                self._schema_name, self._table_name, format_for_path(path) or "csv", path
+            )
+        except Exception as e:  # noqa: BLE001
+            self._update_status(suffix=f" - export failed: {e!s}")
+            return
+        self._update_status(suffix=f" - exported {result.rows} rows to {path}")
+
+    def _show_page(self, result: QueryResult) -> None:
+        self._total_loaded = len(result)
+        table = self.query_one("#table-data", VirtualDataTable)
+        populate_data_table(table, result)
+        self._update_status()
+        self.run_worker(self._prefetch_neighbours(), group="prefetch", exclusive=True)
+
+    def _cancel_prefetch(self) -> None:
+        self.workers.cancel_group(self, "prefetch")
+
+    async def _prefetch_neighbours(self) -> None:
+        try:
+            await self._pager.prefetch()
+        except Exception as e:  # noqa: BLE001
+            self._update_status(suffix=f" - prefetch failed: {e!s}")
+            return
+        self._update_status()
+
+    def _update_status(self, suffix: str = "") -> None:
+        mode = "ctid scan" if self._pager.uses_ctid else "keyset"
+        status = self.query_one("#table-status", Static)
+        page = _format_page_position(
+            self._pager.page_index, self._pager.estimated_page_count
+        )
+        status.update(
+            f"{_format_status(self._pager.offset, self._total_loaded, mode)} · {page} · "
+            f"{_format_cache_status(self._pager.cache)}{suffix}"
+        )
 
     def action_query(self) -> None:
         self.app.push_screen(QueryRunnerScreen(database_provider=self._database_provider))
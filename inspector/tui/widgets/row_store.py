@@ -0,0 +1,67 @@
+from bisect import bisect_right
+from typing import Any
+
+from inspector.db.result import QueryResult, QueryRow
+
+
+def cell_to_text(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+class ColumnarRowStore:
+    __slots__ = ("_columns", "_chunks", "_starts", "_row_count")
+
+    def __init__(self) -> None:
+        self._columns: list[str] = []
+        self._chunks: list[QueryResult] = []
+        self._starts: list[int] = []
+        self._row_count = 0
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def reset(self, result: QueryResult) -> None:
+        self._columns = result.columns
+        self._chunks = []
+        self._starts = []
+        self._row_count = 0
+        self.append(result)
+
+    def append(self, result: QueryResult) -> int:
+        if not result:
+            return 0
+        self._chunks.append(result)
+        self._starts.append(self._row_count)
+        self._row_count += len(result)
+        return len(result)
+
+    def _locate(self, row_index: int) -> tuple[QueryResult, int]:
+        chunk = bisect_right(self._starts, row_index) - 1
+        return self._chunks[chunk], row_index - self._starts[chunk]
+
+    def value(self, row_index: int, column_index: int) -> Any:
+        chunk, offset = self._locate(row_index)
+        return chunk.value(offset, column_index)
+
+    def row(self, row_index: int) -> QueryRow:
+        chunk, offset = self._locate(row_index)
+        return chunk.row(offset)
+
+    def cell_text(self, row_index: int, column_index: int) -> str:
+        return cell_to_text(self.value(row_index, column_index))
+
+    def measure_column(self, column_index: int, start: int, stop: int) -> int:
+        return max(
+            (len(self.cell_text(i, column_index)) for i in range(start, stop)),
+            default=0,
+        )
@@ -0,0 +1,113 @@
+from typing import Any, ClassVar
+
+from rich.text import Text
+from textual.actions import SkipAction
+from textual.binding import Binding, BindingType
+from textual.message import Message
+from textual.widgets import OptionList, TextArea
+from textual.widgets.option_list import Option
+
+from inspector.db.completion import Completion, CompletionItem
+
+_KIND_MARKERS = {"schema": "S", "table": "T", "column": "C", "alias": "A"}
+
+
+def _option_prompt(item: CompletionItem) -> Text:
+    prompt = Text(f"{_KIND_MARKERS.get(item.kind, ' ')}  {item.name}")
+    if item.detail:
+        prompt.append(f"  {item.detail}", style="dim")
+    return prompt
+
+
+# While the completion list is open Tab accepts, Up/Down move and Escape closes it.
+class SqlEditor(TextArea):
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("tab", "accept_completion", "Complete", show=False),
+        Binding("up", "completion_up", "Cursor up", show=False),
+        Binding("down", "completion_down", "Cursor down", show=False),
+        Binding("escape", "dismiss_completions", "Close", show=False),
+        Binding("ctrl+space", "request_completion", "Complete", show=False),
+    ]
+
+    class CompletionRequested(Message):
+        def __init__(self, editor: "SqlEditor") -> None:
+            super().__init__()
+            self.editor = editor
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.completion_list: OptionList | None = None
+        self._items: list[CompletionItem] = []
+        self._replace_length = 0
+        self._completion_offset: int | None = None
+        self._accepted_text: str | None = None
+
+    @property
+    def cursor_offset(self) -> int:
+        return self.document.get_index_from_location(self.cursor_location)
+
+    @property
+    def completing(self) -> bool:
+        return bool(self._items) and self._completion_offset is not None
+
+    @property
+    def completion_offset(self) -> int | None:
+        return self._completion_offset
+
+    @property
+    def just_completed(self) -> bool:
+        return self._accepted_text is not None and self._accepted_text == self.text
+
+    def show_completions(self, completion: Completion) -> None:
+        items = completion.items
+        offset = self.cursor_offset
+        typed = self.text[offset - completion.replace_length : offset]
+        # Nothing left to complete once the only match is fully typed.
+        if len(items) == 1 and items[0].text == typed:
+            items = []
+        options = self.completion_list
+        if not items or options is None:
+            self.hide_completions()
+            return
+        self._items = items
+        self._replace_length = completion.replace_length
+        self._completion_offset = offset
+        options.set_options(Option(_option_prompt(item)) for item in items)
+        options.highlighted = 0
+        options.display = True
+
+    def hide_completions(self) -> None:
+        self._items = []
+        self._completion_offset = None
+        if self.completion_list is not None:
+            self.completion_list.display = False
+            self.completion_list.clear_options()
+
+    def action_accept_completion(self) -> None:
+        if not self.completing or self.completion_list is None:
+            raise SkipAction()
+        item = self._items[self.completion_list.highlighted or 0]
+        row, column = self.cursor_location
+        self.replace(item.text, (row, column - self._replace_length), (row, column))
+        self._accepted_text = self.text
+        self.hide_completions()
+
+    def action_completion_up(self) -> None:
+        if self.completing and self.completion_list is not None:
+            self.completion_list.action_cursor_up()
+        else:
+            self.action_cursor_up()
+
+    def action_completion_down(self) -> None:
+        if self.completing and self.completion_list is not None:
+            self.completion_list.action_cursor_down()
+        else:
+            self.action_cursor_down()
+
+    def action_dismiss_completions(self) -> None:
+        if not self.completing:
+            raise SkipAction()
+        self.hide_completions()
+
+    def action_request_completion(self) -> None:
+        self.post_message(self.CompletionRequested(self))
@@ -1,20 +1,103 @@
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple
+
 from textual.widgets import DataTable
 
-from inspector.db.database import QueryRow
+from inspector.db.metadata import TableInfo
+from inspector.db.result import QueryResult
+from inspector.tui.widgets.row_store import cell_to_text
+from inspector.tui.widgets.virtual_table import VirtualDataTable
+
+__all__ = [
+    "RowDiff",
+    "append_data_table_rows",
+    "cell_to_text",
+    "diff_rows",
+    "format_bytes",
+    "format_row_estimate",
+    "format_table_stats",
+    "populate_data_table",
+    "sync_data_table",
+]
+
+_BYTE_UNITS = ("B", "kB", "MB", "GB", "TB", "PB")
+_COUNT_UNITS = ("", "k", "M", "B", "T")
+
+
+def format_bytes(value: int) -> str:
+    size = float(value)
+    for unit in _BYTE_UNITS:
+        if size < 1024 or unit == _BYTE_UNITS[-1]:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{value} B"
+
+
+def format_row_estimate(value: int) -> str:
+    count = float(value)
+    for unit in _COUNT_UNITS:
+        if abs(count) < 1000 or unit == _COUNT_UNITS[-1]:
+            return f"~{count:.0f}" if not unit else f"~{count:.1f}{unit}"
+        count /= 1000
+    return f"~{value}"
+
 
+def format_table_stats(table: TableInfo) -> str:
+    parts: list[str] = []
+    if table.estimated_rows is not None:
+        parts.append(f"{format_row_estimate(table.estimated_rows)} rows")
+    if table.total_bytes is not None:
+        parts.append(format_bytes(table.total_bytes))
+    if table.last_analyzed is not None:
+        parts.append(f"analyzed {table.last_analyzed:%Y-%m-%d %H:%M}")
+    return ", ".join(parts)
 
-def cell_to_text(value: object) -> str:
-    if value is None:
-        return ""
-    return str(value)
 
+def populate_data_table(table: VirtualDataTable, result: QueryResult) -> None:
+    table.set_data(result)
 
-def populate_data_table(
-    table: DataTable, columns: list[str], rows: list[QueryRow]
-) -> None:
-    table.clear(columns=True)
-    if not columns:
+
+def append_data_table_rows(table: VirtualDataTable, result: QueryResult) -> None:
+    if result.columns != table.columns:
+        table.set_data(result)
         return
-    table.add_columns(*columns)
-    for row in rows:
-        table.add_row(*[cell_to_text(row.get(column)) for column in columns])
+    table.append_rows(result)
+
+
+class RowDiff(NamedTuple):
+    added: list[str]
+    removed: list[str]
+    # (row key, column index, new text) for rows present in both.
+    changed: list[tuple[str, int, str]]
+
+
+def diff_rows(
+    old: Mapping[str, Sequence[str]], new: Mapping[str, Sequence[str]]
+) -> RowDiff:
+    return RowDiff(
+        added=[key for key in new if key not in old],
+        removed=[key for key in old if key not in new],
+        changed=[
+            (key, index, value)
+            for key, cells in new.items()
+            if key in old
+            for index, (before, value) in enumerate(zip(old[key], cells))
+            if before != value
+        ],
+    )
+
+
+def sync_data_table(
+    table: DataTable,
+    old: Mapping[str, Sequence[str]],
+    new: Mapping[str, Sequence[str]],
+) -> RowDiff:
+    diff = diff_rows(old, new)
+    columns = table.ordered_columns
+    for key in diff.removed:
+        table.remove_row(key)
+    for key, index, value in diff.changed:
+        table.update_cell(key, columns[index].key, value)
+    for key in diff.added:
+        table.add_row(*new[key], key=key)
+    return diff
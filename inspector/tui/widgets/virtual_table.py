@@ -0,0 +1,221 @@
+from typing import ClassVar
+
+from rich.segment import Segment
+from rich.style import Style
+from textual import events
+from textual.binding import Binding, BindingType
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from inspector.db.result import QueryResult
+from inspector.tui.widgets.row_store import ColumnarRowStore
+
+MAX_COLUMN_WIDTH = 40
+WIDTH_SAMPLE_ROWS = 200
+COLUMN_SEPARATOR = " │ "
+
+
+def _fit(text: str, width: int) -> str:
+    text = text.replace("\n", "↵").replace("\t", " ")
+    if len(text) > width:
+        return text[: max(width - 1, 0)] + "…"
+    return text.ljust(width)
+
+
+class VirtualDataTable(ScrollView, can_focus=True):
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "cursor_home", "Top", show=False),
+        Binding("end", "cursor_end", "Bottom", show=False),
+        Binding("left", "scroll_left", "Left", show=False),
+        Binding("right", "scroll_right", "Right", show=False),
+    ]
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "virtual-table--header",
+        "virtual-table--cursor",
+    }
+
+    DEFAULT_CSS = """
+    VirtualDataTable {
+        height: 1fr;
+        background: $surface;
+    }
+    VirtualDataTable > .virtual-table--header {
+        text-style: bold;
+        background: $panel;
+    }
+    VirtualDataTable > .virtual-table--cursor {
+        background: $accent;
+    }
+    """
+
+    cursor_row: reactive[int] = reactive(0)
+
+    class RowHighlighted(Message):
+        def __init__(self, virtual_table: "VirtualDataTable", cursor_row: int) -> None:
+            super().__init__()
+            self.virtual_table = virtual_table
+            self.cursor_row = cursor_row
+
+        @property
+        def control(self) -> "VirtualDataTable":
+            return self.virtual_table
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+    ) -> None:
+        super().__init__(name=name, id=id, classes=classes)
+        self._store = ColumnarRowStore()
+        self._widths: list[int] = []
+        self._line_cache: LRUCache[int, Strip] = LRUCache(1024)
+
+    @property
+    def store(self) -> ColumnarRowStore:
+        return self._store
+
+    @property
+    def row_count(self) -> int:
+        return self._store.row_count
+
+    @property
+    def columns(self) -> list[str]:
+        return self._store.columns
+
+    def set_data(self, result: QueryResult) -> None:
+        self._store.reset(QueryResult.empty(result.columns))
+        self._widths = [min(len(c), MAX_COLUMN_WIDTH) for c in result.columns]
+        self.cursor_row = 0
+        self.scroll_to(0, 0, animate=False)
+        self.append_rows(result)
+
+    def append_rows(self, result: QueryResult) -> None:
+        start = self._store.row_count
+        self._store.append(result)
+        sample_stop = min(self._store.row_count, start + WIDTH_SAMPLE_ROWS)
+        for index in range(len(self._widths)):
+            measured = self._store.measure_column(index, start, sample_stop)
+            self._widths[index] = min(
+                max(self._widths[index], measured), MAX_COLUMN_WIDTH
+            )
+        self._line_cache.clear()
+        self._update_virtual_size()
+        self.refresh()
+
+    def clear(self) -> None:
+        self.set_data(QueryResult.empty())
+
+    def _update_virtual_size(self) -> None:
+        width = sum(self._widths) + len(COLUMN_SEPARATOR) * max(len(self._widths) - 1, 0)
+        self.virtual_size = Size(width, self._store.row_count + 1)
+
+    def _render_row_text(self, row_index: int) -> str:
+        store = self._store
+        texts = [store.cell_text(row_index, i) for i in range(len(self._widths))]
+        self._widen_columns(texts)
+        return COLUMN_SEPARATOR.join(_fit(t, w) for t, w in zip(texts, self._widths))
+
+    def _widen_columns(self, texts: list[str]) -> None:
+        widened = False
+        for index, text in enumerate(texts):
+            width = min(len(text), MAX_COLUMN_WIDTH)
+            if width > self._widths[index]:
+                self._widths[index] = width
+                widened = True
+        if widened:
+            self._line_cache.clear()
+            self._update_virtual_size()
+            self.refresh()
+
+    def _row_strip(self, row_index: int) -> Strip:
+        strip = self._line_cache.get(row_index)
+        if strip is None:
+            strip = Strip([Segment(self._render_row_text(row_index))])
+            self._line_cache[row_index] = strip
+        return strip
+
+    def _header_strip(self) -> Strip:
+        text = COLUMN_SEPARATOR.join(
+            _fit(c, w) for c, w in zip(self._store.columns, self._widths)
+        )
+        return Strip([Segment(text)])
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        scroll_x, scroll_y = self.scroll_offset
+        base_style = self.rich_style
+        if y == 0:
+            strip = self._header_strip()
+            style: Style = base_style + self.get_component_rich_style(
+                "virtual-table--header"
+            )
+        else:
+            row_index = scroll_y + y - 1
+            if row_index >= self._store.row_count:
+                return Strip.blank(width, base_style)
+            strip = self._row_strip(row_index)
+            style = base_style
+            if row_index == self.cursor_row and self.has_focus:
+                style = base_style + self.get_component_rich_style(
+                    "virtual-table--cursor"
+                )
+        return strip.crop_extend(scroll_x, scroll_x + width, style).apply_style(style)
+
+    def watch_cursor_row(self, old_row: int, new_row: int) -> None:
+        self._scroll_cursor_into_view()
+        self.refresh()
+        self.post_message(self.RowHighlighted(self, new_row))
+
+    def _on_focus(self, event: events.Focus) -> None:
+        self.refresh()
+
+    def _on_blur(self, event: events.Blur) -> None:
+        self.refresh()
+
+    def _scroll_cursor_into_view(self) -> None:
+        visible_rows = max(self.scrollable_content_region.height - 1, 1)
+        if self.cursor_row < self.scroll_y:
+            self.scroll_to(y=self.cursor_row, animate=False)
+        elif self.cursor_row >= self.scroll_y + visible_rows:
+            self.scroll_to(y=self.cursor_row - visible_rows + 1, animate=False)
+
+    def _move_cursor(self, delta: int) -> None:
+        if self._store.row_count == 0:
+            return
+        self.cursor_row = max(0, min(self.cursor_row + delta, self._store.row_count - 1))
+
+    def action_cursor_up(self) -> None:
+        self._move_cursor(-1)
+
+    def action_cursor_down(self) -> None:
+        self._move_cursor(1)
+
+    def action_page_up(self) -> None:
+        self._move_cursor(-max(self.scrollable_content_region.height - 1, 1))
+
+    def action_page_down(self) -> None:
+        self._move_cursor(max(self.scrollable_content_region.height - 1, 1))
+
+    def action_cursor_home(self) -> None:
+        self._move_cursor(-self.cursor_row)
+
+    def action_cursor_end(self) -> None:
+        self._move_cursor(self._store.row_count)
+
+    async def _on_click(self, event: events.Click) -> None:
+        if event.y == 0:
+            return
+        row_index = int(self.scroll_y) + event.y - 1
+        if 0 <= row_index < self._store.row_count:
+            self.cursor_row = row_index
@@ -27,14 +27,20 @@ def mock_result() -> MagicMock:
     mappings = MagicMock()
     mappings.all.return_value = []
     result.mappings.return_value = mappings
+    result.all.return_value = []
     return result
 
 
 @pytest.fixture
 def mock_session(mock_result: MagicMock) -> AsyncMock:
+    raw_connection = MagicMock()
+    raw_connection.driver_connection.get_server_pid.return_value = 4242
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw_connection)
     session = AsyncMock()
     session.execute = AsyncMock(return_value=mock_result)
     session.commit = AsyncMock()
+    session.connection = AsyncMock(return_value=connection)
     return session
 
 
@@ -54,7 +60,7 @@ class MockSessionProvider(SessionProvider):
         return self._mock_engine
 
     @asynccontextmanager
-    async def open(self) -> AsyncIterator[object]:
+    async def open(self, read_only: bool = False) -> AsyncIterator[object]:
         if self._mock_engine is None:
             raise RuntimeError("Database engine is not initialized.")
         yield self._mock_session
@@ -75,22 +81,48 @@ def sample_schema_rows() -> list[dict[str, Any]]:
 @pytest.fixture
 def sample_table_rows() -> list[dict[str, Any]]:
     return [
-        {"schema_name": "public", "table_name": "users"},
-        {"schema_name": "public", "table_name": "posts"},
+        {
+            "relid": 16384,
+            "schema_name": "public",
+            "table_name": "users",
+            "estimated_rows": 1_500_000,
+            "total_bytes": 268_435_456,
+            "last_analyzed": None,
+            "partition_of": None,
+        },
+        {
+            "relid": 16390,
+            "schema_name": "public",
+            "table_name": "posts",
+            "estimated_rows": None,
+            "total_bytes": 8192,
+            "last_analyzed": None,
+            "partition_of": None,
+        },
     ]
 
 
 @pytest.fixture
 def sample_column_rows() -> list[dict[str, Any]]:
     return [
-        {"column_name": "id", "data_type": "integer", "is_nullable": "NO"},
-        {"column_name": "name", "data_type": "text", "is_nullable": "YES"},
+        {
+            "table_name": "users",
+            "column_name": "id",
+            "data_type": "integer",
+            "is_nullable": "NO",
+        },
+        {
+            "table_name": "users",
+            "column_name": "name",
+            "data_type": "character varying(64)",
+            "is_nullable": "YES",
+        },
     ]
 
 
 @pytest.fixture
-def sample_query_rows() -> list[dict[str, Any]]:
+def sample_query_rows() -> list[tuple[Any, ...]]:
     return [
-        {"id": 1, "name": "a"},
-        {"id": 2, "name": "b"},
+        (1, "a"),
+        (2, "b"),
     ]
@@ -55,3 +55,12 @@ class TestPgInspectorSettings:
         monkeypatch.setenv("DATABASE_URL", url)
         settings = PgInspectorSettings()
         assert settings.database_url == url
+
+    def test_pool_settings_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("INSPECTOR_POOL_SIZE", "10")
+        monkeypatch.setenv("INSPECTOR_POOL_WARMUP", "2")
+        monkeypatch.setenv("INSPECTOR_POOL_PRE_PING_IDLE", "5.5")
+        settings = PgInspectorSettings()
+        assert settings.pool_size == 10
+        assert settings.pool_warmup == 2
+        assert settings.pool_pre_ping_idle_s == 5.5
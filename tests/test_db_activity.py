@@ -0,0 +1,87 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.db.activity import (
+    MAX_POLL_DUTY,
+    Backend,
+    backend_from_row,
+    blocked_counts,
+    monitor_activity,
+    next_poll_delay,
+)
+from inspector.tui.widgets.table_helpers import diff_rows
+
+
+def _row(pid: int, blocked_by: list[int] | None = None, **values: Any) -> dict:
+    row = {
+        "pid": pid,
+        "username": "app",
+        "application_name": None,
+        "client": "10.0.0.5",
+        "state": "active",
+        "wait": "Lock:transactionid" if blocked_by else "",
+        "xact_seconds": 12.5,
+        "query_seconds": 3.0,
+        "blocked_by": blocked_by,
+        "locks_held": 3,
+        "locks_waiting": 1 if blocked_by else 0,
+        "query": "UPDATE jobs\n   SET state = 'done'",
+    }
+    row.update(values)
+    return row
+
+
+def _backends(*rows: dict) -> dict[int, Backend]:
+    return {row["pid"]: backend_from_row(row) for row in rows}
+
+
+class TestBackends:
+    def test_from_row(self) -> None:
+        backend = backend_from_row(_row(7, [3]))
+        assert backend.blocked_by == (3,)
+        assert backend.application == ""
+        assert backend.query == "UPDATE jobs SET state = 'done'"
+
+    def test_blocked_counts_follow_chains(self) -> None:
+        backends = _backends(
+            _row(1), _row(2, [1]), _row(3, [2]), _row(4, [1]), _row(5, [6]), _row(6, [5])
+        )
+        assert blocked_counts(backends) == {1: 3, 2: 1, 5: 1, 6: 1}
+
+
+class TestPolling:
+    def test_delay_backs_off_for_slow_polls(self) -> None:
+        assert next_poll_delay(2.0, 0.01) == 2.0
+        delay = next_poll_delay(2.0, 1.0)
+        assert 1.0 / (1.0 + delay) == pytest.approx(MAX_POLL_DUTY)
+
+    @pytest.mark.asyncio
+    async def test_each_poll_is_a_bounded_transaction(self) -> None:
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = [_row(1), _row(2), _row(3)]
+        connection = MagicMock()
+        connection.execute = AsyncMock(return_value=result)
+        connection.begin.return_value.__aenter__ = AsyncMock()
+        connection.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+        snapshots = monitor_activity(connection, statement_timeout_ms=500, max_rows=2)
+        snapshot = await anext(snapshots)
+        await snapshots.aclose()
+        assert list(snapshot.backends) == [1, 2]
+        assert snapshot.truncated
+        timeout_call, poll_call = connection.execute.await_args_list
+        assert "statement_timeout" in str(timeout_call.args[0])
+        assert timeout_call.args[1] == {"timeout": "500ms"}
+        assert poll_call.args[1]["limit"] == 3
+        connection.begin.return_value.__aexit__.assert_awaited_once()
+
+
+class TestDiffRows:
+    def test_reports_only_changed_cells(self) -> None:
+        old = {"1": ("1", "active", "3s"), "2": ("2", "idle", "")}
+        new = {"1": ("1", "active", "5s"), "3": ("3", "active", "0s")}
+        diff = diff_rows(old, new)
+        assert diff.added == ["3"]
+        assert diff.removed == ["2"]
+        assert diff.changed == [("1", 2, "5s")]
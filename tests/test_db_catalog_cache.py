@@ -0,0 +1,170 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.config import ConnectionConfig
+from inspector.db.catalog_cache import (
+    CatalogCacheStore,
+    CatalogSnapshot,
+    SchemaSnapshot,
+    build_snapshot,
+    connection_cache_key,
+    restore_snapshot,
+)
+from inspector.db.database import DatabaseProvider
+from inspector.db.metadata import (
+    ColumnInfo,
+    IndexInfo,
+    MetadataProvider,
+    TableConstraints,
+    TableInfo,
+)
+from tests.conftest import MockSessionProvider
+
+_USERS = TableInfo(schema_name="public", table_name="users")
+_ID = ColumnInfo(column_name="id", data_type="integer", is_nullable="NO")
+
+
+def _snapshot(fingerprint: str = "abc") -> CatalogSnapshot:
+    return CatalogSnapshot(
+        schemas={
+            "public": SchemaSnapshot(
+                fingerprint=fingerprint, tables=[_USERS], columns={"users": [_ID]}
+            )
+        }
+    )
+
+
+class TestConnectionCacheKey:
+    def test_ignores_credentials(self) -> None:
+        first = connection_cache_key("postgresql+asyncpg://a:secret@db:5432/app")
+        second = connection_cache_key("postgresql+asyncpg://b:other@db:5432/app")
+        assert first == second
+        assert "secret" not in first
+
+    def test_distinguishes_databases(self) -> None:
+        first = connection_cache_key("postgresql+asyncpg://db:5432/app")
+        second = connection_cache_key("postgresql+asyncpg://db:5432/other")
+        assert first != second
+
+
+class TestCatalogCacheStore:
+    def test_round_trips_snapshot(self, tmp_path: Path) -> None:
+        store = CatalogCacheStore(tmp_path)
+        url = "postgresql+asyncpg://u:p@db/app"
+        store.save(url, _snapshot())
+        assert store.load(url) == _snapshot()
+        assert "p@" not in store.path_for(url).read_text()
+
+    def test_missing_or_corrupt_file_loads_as_none(self, tmp_path: Path) -> None:
+        store = CatalogCacheStore(tmp_path)
+        url = "postgresql+asyncpg://db/app"
+        assert store.load(url) is None
+        store.path_for(url).write_text("{not json")
+        assert store.load(url) is None
+
+
+class TestRestoreSnapshot:
+    def test_restores_only_schemas_with_matching_fingerprint(self) -> None:
+        provider = MetadataProvider()
+        snapshot = _snapshot()
+        snapshot.schemas["stale"] = SchemaSnapshot(fingerprint="old")
+        restored = restore_snapshot(
+            provider, snapshot, {"public": "abc", "stale": "new"}
+        )
+        assert restored == ["public"]
+        assert provider.cached_tables("public") == (_USERS,)
+        assert provider.cached_columns("public", "users") == (_ID,)
+        assert provider.cached_tables("stale") is None
+
+    def test_build_snapshot_exports_cached_schemas(self) -> None:
+        provider = MetadataProvider()
+        provider.prime_tables("public", [_USERS])
+        provider.prime_columns("public", "users", [_ID])
+        assert build_snapshot(provider, {"public": "abc", "other": "x"}) == _snapshot()
+
+    def test_table_stats_are_not_persisted(self) -> None:
+        provider = MetadataProvider()
+        stale = _USERS.model_copy(update={"estimated_rows": 10, "total_bytes": 8192})
+        provider.prime_tables("public", [stale])
+        provider.prime_columns("public", "users", [_ID])
+        assert build_snapshot(provider, {"public": "abc"}) == _snapshot()
+
+    def test_restore_applies_fresh_table_stats(self) -> None:
+        provider = MetadataProvider()
+        stats = {("public", "users"): {"estimated_rows": 42, "total_bytes": 16384}}
+        restore_snapshot(provider, _snapshot(), {"public": "abc"}, stats)
+        (users,) = provider.cached_tables("public")
+        assert (users.estimated_rows, users.total_bytes) == (42, 16384)
+
+    def test_round_trips_constraints(self, tmp_path: Path) -> None:
+        constraints = TableConstraints(
+            indexes=(
+                IndexInfo(
+                    index_name="users_pkey",
+                    columns=("id",),
+                    is_unique=True,
+                    is_primary=True,
+                ),
+            )
+        )
+        provider = MetadataProvider()
+        provider.prime_tables("public", [_USERS])
+        provider.prime_constraints("public", "users", constraints)
+        store = CatalogCacheStore(tmp_path)
+        store.save("postgresql://db/app", build_snapshot(provider, {"public": "abc"}))
+        loaded = store.load("postgresql://db/app")
+        assert loaded is not None
+        restored = MetadataProvider()
+        restore_snapshot(restored, loaded, {"public": "abc"})
+        assert restored.cached_constraints("public", "users") == constraints
+
+
+class TestDatabaseProviderCatalogCache:
+    @pytest.mark.asyncio
+    async def test_persist_skips_schemas_changed_since_restore(
+        self,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        connection_config: ConnectionConfig,
+    ) -> None:
+        startup = MagicMock()
+        startup.mappings.return_value.all.return_value = [
+            {"schema_name": "public", "fingerprint": "abc"},
+            {"schema_name": "sales", "fingerprint": "s1"},
+        ]
+        stats = MagicMock()
+        stats.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "estimated_rows": 5_000,
+                "total_bytes": 1 << 20,
+                "last_analyzed": None,
+            },
+        ]
+        shutdown = MagicMock()
+        shutdown.mappings.return_value.all.return_value = [
+            {"schema_name": "public", "fingerprint": "abc"},
+            {"schema_name": "sales", "fingerprint": "s2"},
+        ]
+        mock_session.execute.side_effect = [startup, stats, shutdown]
+        session_provider = MockSessionProvider(object(), mock_session)
+        session_provider._config = connection_config
+        store = CatalogCacheStore(tmp_path)
+        store.save(connection_config.url, _snapshot())
+        metadata = MetadataProvider()
+        provider = DatabaseProvider(session_provider, metadata)
+
+        assert await provider.restore_catalog(store) == ["public"]
+        assert metadata.cached_tables("public")[0].estimated_rows == 5_000
+        assert mock_session.execute.await_args_list[1].args[1] == {
+            "schema_names": ["public"]
+        }
+        metadata.prime_tables("sales", [TableInfo(schema_name="sales", table_name="o")])
+        await provider.persist_catalog(store)
+
+        saved = store.load(connection_config.url)
+        assert saved is not None
+        assert list(saved.schemas) == ["public"]
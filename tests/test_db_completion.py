@@ -0,0 +1,171 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.db.completion import (
+    MAX_COMPLETIONS,
+    Completion,
+    MetadataRequest,
+    PrefixIndex,
+    SqlCompleter,
+    sql_identifier,
+    statement_tables,
+    tokenize,
+)
+from inspector.db.database import DatabaseProvider
+from inspector.db.metadata import ColumnInfo, MetadataProvider, SchemaInfo, TableInfo
+
+
+def _columns(*names: str) -> list[ColumnInfo]:
+    return [ColumnInfo(column_name=n, data_type="integer", is_nullable="NO") for n in names]
+
+
+@pytest.fixture
+def metadata() -> MetadataProvider:
+    provider = MetadataProvider()
+    provider.prime_schemas([SchemaInfo(name="public"), SchemaInfo(name="sales")])
+    provider.prime_tables(
+        "public",
+        [
+            TableInfo(schema_name="public", table_name=name)
+            for name in ["orders", "order_items", "users", "Audit Log"]
+        ],
+    )
+    provider.prime_columns("public", "orders", _columns("id", "user_id", "total"))
+    provider.prime_columns("public", "users", _columns("id", "email"))
+    return provider
+
+
+def _complete(completer: SqlCompleter, sql: str, force: bool = False) -> Completion:
+    cursor = sql.index("|")
+    return completer.complete(sql.replace("|", ""), cursor, force)
+
+
+def _names(completion: Completion) -> list[str]:
+    return [item.name for item in completion.items]
+
+
+class TestPrefixIndex:
+    def test_case_insensitive_prefix_lookup(self) -> None:
+        index = PrefixIndex(["orders", "Order_Notes", "users", "ord"])
+        assert index.lookup("ORD") == ["ord", "Order_Notes", "orders"]
+        assert index.lookup("ord", limit=1) == ["ord"]
+        assert index.lookup("x") == []
+
+
+class TestStatementTables:
+    def test_maps_aliases_and_names(self) -> None:
+        tokens = tokenize(
+            'SELECT 1 FROM public.orders AS o, users u JOIN "Audit Log" a ON true '
+            "WHERE o.id = 1"
+        )
+        tables = statement_tables(tokens)
+        assert tables["o"] == ("public", "orders")
+        assert tables["orders"] == ("public", "orders")
+        assert tables["u"] == (None, "users")
+        assert tables["a"] == (None, "Audit Log")
+        assert "where" not in tables
+
+    def test_ignores_strings_and_comments(self) -> None:
+        tokens = tokenize("SELECT 'FROM fake f' -- FROM other\nFROM real r")
+        assert set(statement_tables(tokens)) == {"real", "r"}
+
+
+class TestSqlCompleter:
+    def test_tables_after_from(self, metadata: MetadataProvider) -> None:
+        completion = _complete(SqlCompleter(metadata), "SELECT * FROM ord|")
+        assert _names(completion) == ["order_items", "orders"]
+        assert completion.replace_length == 3
+
+    def test_schemas_and_qualified_tables(self, metadata: MetadataProvider) -> None:
+        completer = SqlCompleter(metadata)
+        assert "sales" in _names(_complete(completer, "SELECT * FROM s|"))
+        assert _names(_complete(completer, "SELECT * FROM public.u|")) == ["users"]
+
+    def test_columns_for_alias_declared_later(self, metadata: MetadataProvider) -> None:
+        completion = _complete(
+            SqlCompleter(metadata), "SELECT o.| FROM orders o JOIN users u ON true"
+        )
+        assert _names(completion) == ["id", "total", "user_id"]
+
+    def test_unqualified_columns_cover_all_tables(self, metadata: MetadataProvider) -> None:
+        completion = _complete(
+            SqlCompleter(metadata), "SELECT * FROM orders o JOIN users u ON u.| "
+        )
+        assert _names(completion) == ["email", "id"]
+        completion = _complete(SqlCompleter(metadata), "SELECT e| FROM orders, users")
+        assert _names(completion) == ["email"]
+
+    def test_quotes_names_that_need_it(self, metadata: MetadataProvider) -> None:
+        completion = _complete(SqlCompleter(metadata), 'SELECT * FROM "Aud|')
+        assert [item.text for item in completion.items] == ['"Audit Log"']
+        assert completion.replace_length == 4
+        assert sql_identifier('a"b') == '"a""b"'
+
+    def test_reports_missing_metadata(self, metadata: MetadataProvider) -> None:
+        completer = SqlCompleter(metadata)
+        completion = _complete(completer, "SELECT * FROM sales.|")
+        assert completion.items == []
+        assert completion.missing == [MetadataRequest("sales")]
+        completion = _complete(completer, "SELECT a.| FROM order_items a")
+        assert completion.missing == [MetadataRequest("public", "order_items")]
+
+    def test_index_follows_cache_updates(self, metadata: MetadataProvider) -> None:
+        completer = SqlCompleter(metadata)
+        assert _names(_complete(completer, "SELECT * FROM sales.o|")) == []
+        metadata.prime_tables("sales", [TableInfo(schema_name="sales", table_name="orders")])
+        assert _names(_complete(completer, "SELECT * FROM sales.o|")) == ["orders"]
+
+    def test_only_the_current_statement_counts(self, metadata: MetadataProvider) -> None:
+        completion = _complete(
+            SqlCompleter(metadata), "SELECT * FROM users u; SELECT u.| FROM orders"
+        )
+        assert completion.items == []
+
+    def test_needs_a_prefix_unless_forced(self, metadata: MetadataProvider) -> None:
+        completer = SqlCompleter(metadata)
+        assert _complete(completer, "SELECT * FROM |").items == []
+        assert _complete(completer, "SELECT * FROM |", force=True).items
+
+    def test_keystrokes_reuse_indexes_on_large_catalog(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        provider = MetadataProvider()
+        provider.prime_schemas([SchemaInfo(name="public")])
+        provider.prime_tables(
+            "public",
+            [TableInfo(schema_name="public", table_name=f"table_{i}") for i in range(50_000)],
+        )
+        provider.prime_columns("public", "table_7", _columns(*(f"c{i}" for i in range(500))))
+        completer = SqlCompleter(provider)
+        sql = "SELECT t.c1 FROM table_7 t WHERE " + " AND ".join(["t.c2 = 1"] * 200)
+        cases = [("SELECT * FROM table_1", 21), (sql + " AND t.c4", len(sql) + 10)]
+        for text, cursor in cases:
+            completer.complete(text, cursor)
+        built: list[object] = []
+        monkeypatch.setattr("inspector.db.completion.PrefixIndex", built.append)
+        for _ in range(50):
+            for text, cursor in cases:
+                items = completer.complete(text, cursor).items
+                assert 0 < len(items) <= MAX_COMPLETIONS
+        assert built == []
+
+
+class TestCompletionMetadataLoading:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("request_", "method", "args"),
+        [
+            (MetadataRequest(), "list_schemas", ()),
+            (MetadataRequest("sales"), "list_tables", ("sales",)),
+            (MetadataRequest("sales", "orders"), "list_columns", ("sales", "orders")),
+        ],
+    )
+    async def test_routes_requests(
+        self, request_: MetadataRequest, method: str, args: tuple[str, ...]
+    ) -> None:
+        provider = DatabaseProvider(MagicMock())
+        loader = AsyncMock()
+        setattr(provider, method, loader)
+        await provider.load_completion_metadata(request_)
+        loader.assert_awaited_once_with(*args)
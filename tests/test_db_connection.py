@@ -1,9 +1,15 @@
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from inspector.config import ConnectionConfig
-from inspector.db.connection import SessionProvider
+from inspector.db.connection import _LAST_CHECKIN, SessionProvider
+from inspector.db.database import DatabaseProvider
 from tests.conftest import MockSessionProvider
 
 
@@ -83,6 +89,38 @@ class TestSessionProvider:
             ):
                 async with provider.open() as session:
                     assert session is mock_session
+        mock_session.connection.assert_awaited_once_with(execution_options=None)
+
+    @pytest.mark.asyncio
+    async def test_open_read_only_sets_transaction_characteristic(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        mock_session = AsyncMock()
+        session_context = MagicMock()
+        session_context.__aenter__ = AsyncMock(return_value=mock_session)
+        session_context.__aexit__ = AsyncMock(return_value=False)
+        provider = SessionProvider(config=connection_config)
+        provider._session_factory = MagicMock(return_value=session_context)
+        async with provider.open(read_only=True):
+            pass
+        mock_session.connection.assert_awaited_once_with(
+            execution_options={"postgresql_readonly": True}
+        )
+
+    @pytest.mark.asyncio
+    async def test_dedicated_holds_a_read_only_connection(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        connection = MagicMock(spec=AsyncConnection)
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=connection)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+        provider = SessionProvider(config=connection_config)
+        provider._engine = engine
+        async with provider.dedicated(read_only=True) as held:
+            assert held is connection
+        connection.execution_options.assert_awaited_once_with(postgresql_readonly=True)
+        engine.connect.return_value.__aexit__.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_open_yields_session(
@@ -91,3 +129,170 @@ class TestSessionProvider:
         provider = MockSessionProvider(mock_engine, mock_session)
         async with provider.open() as session:
             assert session is mock_session
+
+
+class TestStatementTimeouts:
+    @pytest.mark.asyncio
+    async def test_passes_timeouts_as_server_settings(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        config = connection_config.model_copy(
+            update={"statement_timeout_ms": 30_000, "lock_timeout_ms": 2_000}
+        )
+        with patch("inspector.db.connection.create_async_engine") as create_engine_mock:
+            with patch("inspector.db.connection.async_sessionmaker"):
+                await SessionProvider(config=config).create_engine()
+        assert create_engine_mock.call_args.kwargs["connect_args"] == {
+            "server_settings": {"statement_timeout": "30000", "lock_timeout": "2000"}
+        }
+
+    @pytest.mark.asyncio
+    async def test_omits_server_settings_by_default(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        with patch("inspector.db.connection.create_async_engine") as create_engine_mock:
+            with patch("inspector.db.connection.async_sessionmaker"):
+                await SessionProvider(config=connection_config).create_engine()
+        assert create_engine_mock.call_args.kwargs["connect_args"] == {}
+
+
+class TestQueryCancellation:
+    @pytest.mark.asyncio
+    async def test_tracks_backend_while_running(
+        self, mock_engine: MagicMock, mock_session: AsyncMock
+    ) -> None:
+        provider = MockSessionProvider(mock_engine, mock_session)
+        async with provider.cancellable(mock_session):
+            assert provider.active_backends == {4242}
+        assert provider.active_backends == frozenset()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_task_cancels_backend(
+        self, mock_engine: MagicMock, mock_session: AsyncMock
+    ) -> None:
+        started = asyncio.Event()
+
+        async def slow_execute(*args: object, **kwargs: object) -> None:
+            if "pg_cancel_backend" in str(args[0]):
+                return None
+            started.set()
+            await asyncio.sleep(60)
+
+        mock_session.execute.side_effect = slow_execute
+        provider = DatabaseProvider(MockSessionProvider(mock_engine, mock_session))
+        task = asyncio.create_task(provider.run_query("SELECT pg_sleep(60)"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        cancel_sql, cancel_params = mock_session.execute.await_args.args
+        assert "pg_cancel_backend" in str(cancel_sql)
+        assert cancel_params == {"pids": [4242]}
+
+    @pytest.mark.asyncio
+    async def test_cancel_without_backends_is_noop(
+        self, mock_engine: MagicMock, mock_session: AsyncMock
+    ) -> None:
+        provider = MockSessionProvider(mock_engine, mock_session)
+        assert await provider.cancel_backends([]) == 0
+        mock_session.execute.assert_not_called()
+
+
+class TestPoolTuning:
+    @pytest.mark.asyncio
+    async def test_passes_pool_settings_to_engine(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        config = connection_config.model_copy(
+            update={"pool_size": 2, "max_overflow": 1, "pool_recycle_s": None}
+        )
+        with patch("inspector.db.connection.create_async_engine") as create_engine_mock:
+            with patch("inspector.db.connection.async_sessionmaker"):
+                await SessionProvider(config=config).create_engine()
+        kwargs = create_engine_mock.call_args.kwargs
+        assert kwargs["pool_size"] == 2
+        assert kwargs["max_overflow"] == 1
+        assert kwargs["pool_recycle"] == -1
+        assert "pool_pre_ping" not in kwargs
+
+    @pytest.mark.asyncio
+    async def test_real_pool_gets_checkout_hooks_and_stats(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        provider = SessionProvider(config=connection_config)
+        assert provider.pool_stats() is None
+        engine = await provider.create_engine()
+        try:
+            pool = engine.sync_engine.pool
+            assert event.contains(pool, "checkout", provider._on_checkout)
+            stats = provider.pool_stats()
+            assert stats is not None
+            assert (stats.size, stats.checked_out, stats.overflow) == (4, 0, 0)
+            assert stats.mean_wait == 0.0
+        finally:
+            await provider.close_engine()
+
+    @pytest.mark.asyncio
+    async def test_warmup_runs_on_create_engine(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        config = connection_config.model_copy(update={"pool_warmup": 3})
+        provider = SessionProvider(config=config)
+        with patch("inspector.db.connection.create_async_engine"):
+            with patch("inspector.db.connection.async_sessionmaker"):
+                with patch.object(provider, "warm_up", AsyncMock()) as warm_up:
+                    await provider.create_engine()
+        warm_up.assert_awaited_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_warmup_is_capped_and_tolerates_failures(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        config = connection_config.model_copy(update={"pool_size": 3})
+        connection = MagicMock(spec=AsyncConnection)
+        connection.close = AsyncMock()
+        engine = MagicMock()
+        engine.connect.return_value.start = AsyncMock(
+            side_effect=[connection, OSError("refused"), connection]
+        )
+        provider = SessionProvider(config=config)
+        provider._engine = engine
+        assert await provider.warm_up(10) == 2
+        assert engine.connect.call_count == 3
+        assert connection.close.await_count == 2
+
+    def _checkout(self, provider: SessionProvider, idle_for: float | None) -> MagicMock:
+        record = MagicMock()
+        record.info = {}
+        if idle_for is not None:
+            record.info[_LAST_CHECKIN] = time.monotonic() - idle_for
+        provider._on_checkout(MagicMock(), record, MagicMock())
+        return record
+
+    def test_pre_ping_only_after_idle_threshold(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        provider = SessionProvider(config=connection_config)
+        provider._engine = MagicMock()
+        self._checkout(provider, None)
+        self._checkout(provider, 1.0)
+        provider._engine.dialect.do_ping.assert_not_called()
+        self._checkout(provider, 120.0)
+        provider._engine.dialect.do_ping.assert_called_once()
+        assert provider._pings == 1
+
+    def test_failed_pre_ping_invalidates_connection(
+        self, connection_config: ConnectionConfig
+    ) -> None:
+        provider = SessionProvider(config=connection_config)
+        provider._engine = MagicMock()
+        provider._engine.dialect.do_ping.side_effect = OSError("gone")
+        with pytest.raises(DisconnectionError):
+            self._checkout(provider, 120.0)
+
+    def test_pre_ping_disabled(self, connection_config: ConnectionConfig) -> None:
+        config = connection_config.model_copy(update={"pool_pre_ping_idle_s": None})
+        provider = SessionProvider(config=config)
+        provider._engine = MagicMock()
+        self._checkout(provider, 3600.0)
+        provider._engine.dialect.do_ping.assert_not_called()
@@ -0,0 +1,422 @@
+import asyncio
+import io
+import json
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import date
+from decimal import Decimal
+from ipaddress import IPv4Address
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.config import ConnectionConfig
+from inspector.db.database import DatabaseProvider
+from inspector.db.export import (
+    ColumnType,
+    ExportError,
+    ExportRange,
+    copy_table_to,
+    copy_to,
+    describe_query,
+    plan_ctid_ranges,
+    plan_key_ranges,
+    range_path,
+    range_query,
+    write_parquet,
+    write_rows,
+)
+from inspector.db.formats import format_for_path
+from inspector.db.result import QueryResult
+from tests.conftest import MockSessionProvider
+
+
+def _copy_emitting(
+    chunks: list[bytes], status: str
+) -> Callable[..., Awaitable[str]]:
+    async def copy(*args: Any, output: Callable[[bytes], Awaitable[None]], **kwargs: Any) -> str:
+        for chunk in chunks:
+            await output(chunk)
+        return status
+
+    return copy
+
+
+@pytest.fixture
+def driver(mock_session: AsyncMock) -> MagicMock:
+    raw_connection = mock_session.connection.return_value.get_raw_connection.return_value
+    return raw_connection.driver_connection
+
+
+class TestFormatForPath:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("out.csv", "csv"),
+            ("OUT.JSONL", "jsonl"),
+            ("dump.ndjson", "jsonl"),
+            ("t.parquet", "parquet"),
+            ("notes.txt", None),
+        ],
+    )
+    def test_maps_extensions(self, path: str, expected: str | None) -> None:
+        assert format_for_path(path) == expected
+
+
+class TestCopyExport:
+    @pytest.mark.asyncio
+    async def test_csv_streams_copy_output(
+        self, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        driver.copy_from_query = AsyncMock(
+            side_effect=_copy_emitting([b"id,name\n", b"1,a\n2,b\n"], "COPY 2")
+        )
+        target = io.BytesIO()
+        result = await copy_to(mock_session, "SELECT * FROM t", "csv", target)
+        assert target.getvalue() == b"id,name\n1,a\n2,b\n"
+        assert (result.rows, result.bytes_written) == (2, 16)
+        args, kwargs = driver.copy_from_query.await_args
+        assert args == ("SELECT * FROM t",)
+        assert kwargs["format"] == "csv" and kwargs["header"] is True
+
+    @pytest.mark.asyncio
+    async def test_jsonl_serializes_rows_on_the_server(
+        self, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        line = json.dumps({"id": 1, "note": 'say "hi", ok'}).encode() + b"\n"
+        driver.copy_from_query = AsyncMock(side_effect=_copy_emitting([line], "COPY 1"))
+        target = io.BytesIO()
+        await copy_to(mock_session, "SELECT 1", "jsonl", target)
+        assert json.loads(target.getvalue()) == {"id": 1, "note": 'say "hi", ok'}
+        args, kwargs = driver.copy_from_query.await_args
+        assert args == ("SELECT to_json(q)::text FROM (SELECT 1) AS q",)
+        assert (kwargs["delimiter"], kwargs["quote"]) == ("\x02", "\x01")
+
+    @pytest.mark.asyncio
+    async def test_table_csv_uses_copy_from_table(
+        self, mock_session: AsyncMock, driver: MagicMock, tmp_path: Path
+    ) -> None:
+        driver.copy_from_table = AsyncMock(side_effect=_copy_emitting([b"id\n"], "COPY 0"))
+        target = tmp_path / "users.csv"
+        await copy_table_to(mock_session, "app", "users", target)
+        assert target.read_bytes() == b"id\n"
+        args, kwargs = driver.copy_from_table.await_args
+        assert args == ("users",)
+        assert kwargs["schema_name"] == "app"
+
+    @pytest.mark.asyncio
+    async def test_memory_stays_flat_for_large_exports(
+        self, mock_session: AsyncMock, driver: MagicMock, tmp_path: Path
+    ) -> None:
+        chunk = b"x" * (64 * 1024)
+
+        async def copy(*args: Any, output: Callable[[bytes], Awaitable[None]], **kwargs: Any) -> str:
+            for _ in range(1024):
+                await output(chunk)
+            return "COPY 1024"
+
+        driver.copy_from_query = AsyncMock(side_effect=copy)
+        tracemalloc.start()
+        try:
+            result = await copy_to(mock_session, "SELECT 1", "csv", tmp_path / "big.csv")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert result.bytes_written == 64 * 1024 * 1024
+        assert peak < 1024 * 1024, peak
+
+    @pytest.mark.asyncio
+    async def test_strips_trailing_semicolon(
+        self, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        driver.copy_from_query = AsyncMock(side_effect=_copy_emitting([], "COPY 0"))
+        await copy_to(mock_session, "SELECT 1;\n", "csv", io.BytesIO())
+        await copy_to(mock_session, "SELECT 1 ;", "jsonl", io.BytesIO())
+        queries = [c.args[0] for c in driver.copy_from_query.await_args_list]
+        assert queries == ["SELECT 1", "SELECT to_json(q)::text FROM (SELECT 1 ) AS q"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_parquet(self, mock_session: AsyncMock) -> None:
+        with pytest.raises(ExportError):
+            await copy_to(mock_session, "SELECT 1", "parquet", io.BytesIO())
+
+
+class TestDatabaseProviderExport:
+    @pytest.mark.asyncio
+    async def test_rejects_mutating_sql(
+        self, mock_engine: MagicMock, mock_session: AsyncMock
+    ) -> None:
+        provider = DatabaseProvider(MockSessionProvider(mock_engine, mock_session))
+        with pytest.raises(ValueError, match="read-only"):
+            await provider.export_query("DELETE FROM t", "csv", io.BytesIO())
+
+    @pytest.mark.asyncio
+    async def test_table_jsonl_goes_through_query(
+        self, mock_engine: MagicMock, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        driver.copy_from_query = AsyncMock(side_effect=_copy_emitting([], "COPY 0"))
+        provider = DatabaseProvider(MockSessionProvider(mock_engine, mock_session))
+        await provider.export_table('my"schema', "t", "jsonl", io.BytesIO())
+        (sql,) = driver.copy_from_query.await_args.args
+        assert 'FROM "my""schema"."t"' in sql
+
+
+class TestRangePlanning:
+    def test_ctid_ranges_are_open_at_both_ends(self) -> None:
+        ranges = plan_ctid_ranges(1000, 4)
+        assert [r.args for r in ranges] == [
+            ("(250,0)",),
+            ("(250,0)", "(500,0)"),
+            ("(500,0)", "(750,0)"),
+            ("(750,0)",),
+        ]
+        assert ranges[0].where == "ctid < CAST($1::text AS tid)"
+        assert ranges[-1].where == "ctid >= CAST($1::text AS tid)"
+
+    def test_small_tables_collapse_to_fewer_ranges(self) -> None:
+        assert plan_ctid_ranges(0, 8) == [ExportRange(0)]
+        assert len(plan_ctid_ranges(2, 8)) == 2
+
+    def test_key_ranges_use_histogram_bounds(self) -> None:
+        bounds = [str(n) for n in range(0, 100, 10)]
+        ranges = plan_key_ranges("id", "bigint", bounds, 2)
+        assert [r.args for r in ranges] == [("50",), ("50",)]
+        assert ranges[0].where == '"id" < CAST($1::text AS bigint)'
+        assert ranges[1].where == (
+            '("id" >= CAST($1::text AS bigint) OR "id" IS NULL)'
+        )
+
+    def test_key_ranges_skip_duplicate_bounds(self) -> None:
+        ranges = plan_key_ranges("k", "text", ["a", "a", "a", "b"], 4)
+        assert [r.index for r in ranges] == [0, 1, 2]
+
+    def test_range_query(self) -> None:
+        sql = range_query("s", "t", ExportRange(1, "ctid < $1"), ("id",))
+        assert sql == 'SELECT * FROM "s"."t" WHERE ctid < $1 ORDER BY "id"'
+
+    def test_range_path(self) -> None:
+        assert range_path("out/orders.csv", 3) == Path("out/orders.003.csv")
+
+
+def _executed(session: AsyncMock) -> list[str]:
+    return [str(c.args[0]) for c in session.execute.await_args_list]
+
+
+class TestParallelExport:
+    @pytest.fixture
+    def provider(
+        self, mock_engine: MagicMock, mock_session: AsyncMock, mock_result: MagicMock
+    ) -> DatabaseProvider:
+        mock_result.scalar_one.return_value = "00000003-0000001B-1"
+        mock_result.scalar.return_value = 300
+        session_provider = MockSessionProvider(mock_engine, mock_session)
+        session_provider._config = ConnectionConfig(
+            url="postgresql+asyncpg://u:p@localhost/db", export_jobs=3
+        )
+        return DatabaseProvider(session_provider)
+
+    @staticmethod
+    def _copy_by_range() -> Callable[..., Awaitable[str]]:
+        async def copy(
+            sql: str, *args: Any, output: Callable[[bytes], Awaitable[None]], **kwargs: Any
+        ) -> str:
+            # Later ranges finish first; the merged output must not care.
+            lower = args[0] if args else "start"
+            await asyncio.sleep(0.01 if "<" in sql and ">=" not in sql else 0)
+            if kwargs["header"]:
+                await output(b"id\n")
+            await output(f"{lower}\n".encode())
+            return "COPY 1"
+
+        return copy
+
+    @pytest.mark.asyncio
+    async def test_merges_ranges_in_order_under_one_snapshot(
+        self, provider: DatabaseProvider, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        driver.copy_from_query = AsyncMock(side_effect=self._copy_by_range())
+        target = io.BytesIO()
+        result = await provider.export_table_parallel(
+            "public", "events", "csv", target, split="ctid"
+        )
+        assert target.getvalue() == b"id\n(100,0)\n(100,0)\n(200,0)\n"
+        assert (result.rows, result.bytes_written) == (3, len(target.getvalue()))
+        executed = _executed(mock_session)
+        assert executed.count("SELECT pg_export_snapshot()") == 1
+        assert executed.count("SET TRANSACTION SNAPSHOT '00000003-0000001B-1'") == 3
+        assert all(
+            "REPEATABLE READ" in executed[i - 1]
+            for i, sql in enumerate(executed)
+            if sql.startswith("SET TRANSACTION SNAPSHOT")
+        )
+
+    @pytest.mark.asyncio
+    async def test_writes_per_range_files(
+        self, provider: DatabaseProvider, driver: MagicMock, tmp_path: Path
+    ) -> None:
+        driver.copy_from_query = AsyncMock(side_effect=self._copy_by_range())
+        await provider.export_table_parallel(
+            "public", "events", "csv", tmp_path / "events.csv", split="ctid", merge=False
+        )
+        parts = sorted(p.name for p in tmp_path.iterdir())
+        assert parts == ["events.000.csv", "events.001.csv", "events.002.csv"]
+        assert (tmp_path / "events.002.csv").read_bytes() == b"id\n(200,0)\n"
+
+    def test_jobs_are_capped_by_the_pool(self, provider: DatabaseProvider) -> None:
+        assert provider._export_jobs(64) == 4 + 8 - 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_parquet(self, provider: DatabaseProvider) -> None:
+        with pytest.raises(ExportError):
+            await provider.export_table_parallel("s", "t", "parquet", io.BytesIO())
+
+
+async def _batches(*results: QueryResult):
+    for result in results:
+        yield result
+
+
+class TestWriteRows:
+    @pytest.mark.asyncio
+    async def test_tsv_escapes_like_copy_text(self) -> None:
+        batch = QueryResult.from_rows(
+            ["id", "note", "ok"], [(1, "a\tb\nc\\d", True), (2, None, False)]
+        )
+        target = io.BytesIO()
+        result = await write_rows(_batches(batch), "tsv", target)
+        assert target.getvalue() == (
+            b"id\tnote\tok\n1\ta\\tb\\nc\\\\d\tt\n2\t\\N\tf\n"
+        )
+        assert result.rows == 2
+
+    @pytest.mark.asyncio
+    async def test_jsonl_rows(self) -> None:
+        first = QueryResult.from_rows(["id", "at"], [(1, date(2024, 1, 2))])
+        second = QueryResult.from_rows(["id", "at"], [(2, None)])
+        target = io.BytesIO()
+        await write_rows(_batches(first, second), "jsonl", target)
+        lines = [json.loads(line) for line in target.getvalue().splitlines()]
+        assert lines == [{"id": 1, "at": "2024-01-02"}, {"id": 2, "at": None}]
+
+    @pytest.mark.asyncio
+    async def test_flushes_each_batch(self) -> None:
+        flushed: list[bytes] = []
+
+        class Target(io.BytesIO):
+            def flush(self) -> None:
+                flushed.append(self.getvalue())
+
+        batch = QueryResult.from_rows(["id"], [(1,)])
+        await write_rows(_batches(batch, batch), "tsv", Target(), header=False)
+        assert flushed == [b"1\n", b"1\n1\n"]
+
+
+class TestParquetExport:
+    @pytest.mark.asyncio
+    async def test_writes_row_groups(self, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        target = tmp_path / "out.parquet"
+        result = await write_parquet(
+            _batches(
+                QueryResult.from_rows(["id", "note"], [(1, None), (2, None)]),
+                QueryResult.from_rows(["id", "note"], [(3, "c")]),
+            ),
+            target,
+            [ColumnType("id", "int4"), ColumnType("note", "text")],
+        )
+        table = pq.read_table(target)
+        assert result.rows == 3
+        assert table.column("id").to_pylist() == [1, 2, 3]
+        assert table.column("note").to_pylist() == [None, None, "c"]
+        assert pq.ParquetFile(target).metadata.num_row_groups == 2
+
+    @pytest.mark.asyncio
+    async def test_schema_comes_from_column_types(self, tmp_path: Path) -> None:
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        key = uuid.UUID("12345678-1234-5678-1234-567812345678")
+        columns = [
+            ColumnType("qty", "int8"),
+            ColumnType("day", "date"),
+            ColumnType("key", "uuid"),
+            ColumnType("addr", "inet"),
+            ColumnType("price", "numeric"),
+            ColumnType("tags", "_int4"),
+        ]
+        names = [c.name for c in columns]
+        target = tmp_path / "out.parquet"
+        await write_parquet(
+            _batches(
+                QueryResult.from_rows(names, [(None, None, None, None, None, None)]),
+                QueryResult.from_rows(
+                    names,
+                    [(7, date(2024, 1, 2), key, IPv4Address("10.0.0.1"),
+                      Decimal("1.50"), [1, 2])],
+                ),
+            ),
+            target,
+            columns,
+        )
+        table = pq.read_table(target)
+        assert table.schema.field("qty").type == pa.int64()
+        assert table.schema.field("day").type == pa.date32()
+        assert table.to_pylist()[1] == {
+            "qty": 7,
+            "day": date(2024, 1, 2),
+            "key": str(key),
+            "addr": "10.0.0.1",
+            "price": "1.50",
+            "tags": "[1, 2]",
+        }
+
+    @pytest.mark.asyncio
+    async def test_duplicate_column_names_keep_their_own_values(
+        self, tmp_path: Path
+    ) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        target = tmp_path / "out.parquet"
+        await write_parquet(
+            _batches(QueryResult.from_rows(["id", "id"], [(1, "a"), (2, "b")])),
+            target,
+            [ColumnType("id", "int4"), ColumnType("id", "text")],
+        )
+        table = pq.ParquetFile(target).read()
+        assert [column.to_pylist() for column in table.columns] == [[1, 2], ["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_empty_result_keeps_schema(self, tmp_path: Path) -> None:
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        target = tmp_path / "out.parquet"
+        result = await write_parquet(_batches(), target, [ColumnType("id", "int4")])
+        assert result.rows == 0
+        assert pq.read_table(target).schema.field("id").type == pa.int32()
+
+    @pytest.mark.asyncio
+    async def test_describe_query_reads_driver_attributes(
+        self, mock_session: AsyncMock, driver: MagicMock
+    ) -> None:
+        statement = MagicMock()
+        statement.get_attributes.return_value = [
+            SimpleNamespace(name="id", type=SimpleNamespace(name="int4")),
+            SimpleNamespace(name="key", type=SimpleNamespace(name="uuid")),
+        ]
+        driver.prepare = AsyncMock(return_value=statement)
+        columns = await describe_query(mock_session, "SELECT id, key FROM t")
+        assert columns == [ColumnType("id", "int4"), ColumnType("key", "uuid")]
+        driver.prepare.assert_awaited_once_with("SELECT id, key FROM t")
+
+    @pytest.mark.asyncio
+    async def test_reports_missing_pyarrow(self, tmp_path: Path) -> None:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            pytest.skip("pyarrow is installed")
+        with pytest.raises(ExportError, match="pyarrow"):
+            await write_parquet(_batches(), tmp_path / "out.parquet", [])
@@ -0,0 +1,68 @@
+import pytest
+
+from inspector.db.lookup import (
+    SEQ_SCAN_WARNING_ROWS,
+    advise_lookup,
+    build_lookup_query,
+    parse_lookup,
+)
+from inspector.db.metadata import IndexInfo, TableConstraints
+
+_CONSTRAINTS = TableConstraints(
+    indexes=(
+        IndexInfo(index_name="orders_email_idx", columns=("email",)),
+        IndexInfo(
+            index_name="orders_pkey", columns=("id",), is_unique=True, is_primary=True
+        ),
+    )
+)
+
+
+class TestParseLookup:
+    def test_plain_and_quoted_values(self) -> None:
+        assert parse_lookup("id = 42") == ("id", "42")
+        assert parse_lookup("name='O''Brien'") == ("name", "O'Brien")
+        assert parse_lookup('"Mixed Case" = a=b') == ("Mixed Case", "a=b")
+
+    def test_null(self) -> None:
+        assert parse_lookup("deleted_at = null") == ("deleted_at", None)
+        assert parse_lookup("note = 'NULL'") == ("note", "NULL")
+
+    @pytest.mark.parametrize("value", ["id", "= 3", ""])
+    def test_rejects_missing_parts(self, value: str) -> None:
+        with pytest.raises(ValueError, match="column = value"):
+            parse_lookup(value)
+
+
+class TestAdviseLookup:
+    def test_uses_index_on_leading_column(self) -> None:
+        advice = advise_lookup(_CONSTRAINTS, ["id"], 10 * SEQ_SCAN_WARNING_ROWS)
+        assert advice.index is not None
+        assert advice.index.index_name == "orders_pkey"
+        assert advice.warning is None
+
+    def test_small_table_scans_without_warning(self) -> None:
+        assert advise_lookup(_CONSTRAINTS, ["status"], 50) == (None, None)
+
+    def test_warns_before_scanning_large_table(self) -> None:
+        advice = advise_lookup(_CONSTRAINTS, ["status"], 2_000_000)
+        assert advice.index is None
+        assert advice.warning == (
+            "No index on status; this scans ~2,000,000 rows (indexed: id, email)"
+        )
+
+
+class TestBuildLookupQuery:
+    def test_inlines_text_and_binds_other_values(self) -> None:
+        sql, params = build_lookup_query(
+            "sales", "orders", {"note": "at 10:30 it's", "id": 7, "closed": None}, 20
+        )
+        assert sql == (
+            'SELECT * FROM "sales"."orders" WHERE "note" = \'at 10\\:30 it\'\'s\' '
+            'AND "id" = :v1 AND "closed" IS NULL LIMIT :limit'
+        )
+        assert params == {"limit": 20, "v1": 7}
+
+    def test_requires_a_condition(self) -> None:
+        with pytest.raises(ValueError):
+            build_lookup_query("public", "t", {})
@@ -1,8 +1,22 @@
+import asyncio
+import tracemalloc
 from unittest.mock import MagicMock
 
 import pytest
+from pydantic import ValidationError
 
-from inspector.db.metadata import ColumnInfo, MetadataProvider, SchemaInfo, TableInfo
+from inspector.db.connection import SessionProvider
+from inspector.db.database import DatabaseProvider
+from inspector.db.metadata import (
+    ColumnInfo,
+    IndexInfo,
+    MetadataProvider,
+    SchemaInfo,
+    TableConstraints,
+    TableInfo,
+    group_partitions,
+)
+from tests.conftest import MockSessionProvider
 
 
 @pytest.fixture
@@ -21,7 +35,7 @@ class TestListSchemas:
     ) -> None:
         mock_result.mappings.return_value.all.return_value = sample_schema_rows
         result = await metadata_provider.list_schemas(mock_session)
-        assert result == [SchemaInfo.model_validate(r) for r in sample_schema_rows]
+        assert result == tuple(SchemaInfo.model_validate(r) for r in sample_schema_rows)
         mock_session.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -50,7 +64,7 @@ class TestListTables:
     ) -> None:
         mock_result.mappings.return_value.all.return_value = sample_table_rows
         result = await metadata_provider.list_tables(mock_session, "public")
-        assert result == [TableInfo.model_validate(r) for r in sample_table_rows]
+        assert result == tuple(TableInfo.model_validate(r) for r in sample_table_rows)
         mock_session.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -79,8 +93,11 @@ class TestListColumns:
     ) -> None:
         mock_result.mappings.return_value.all.return_value = sample_column_rows
         result = await metadata_provider.list_columns(mock_session, "public", "users")
-        assert result == [ColumnInfo.model_validate(r) for r in sample_column_rows]
+        assert result == tuple(ColumnInfo.model_validate(r) for r in sample_column_rows)
         mock_session.execute.assert_awaited_once()
+        sql, params = mock_session.execute.await_args.args
+        assert "format_type" in str(sql)
+        assert params == {"schema_name": "public", "table_names": ["users"]}
 
     @pytest.mark.asyncio
     async def test_uses_table_scoped_cache(
@@ -95,3 +112,428 @@ class TestListColumns:
         second = await metadata_provider.list_columns(mock_session, "public", "users")
         assert first == second
         mock_session.execute.assert_awaited_once()
+
+
+class TestListKeyColumns:
+    def test_prefers_primary_then_fewest_not_null_columns(self) -> None:
+        columns = [
+            ColumnInfo(column_name=name, data_type="integer", is_nullable=nullable)
+            for name, nullable in [
+                ("id", "NO"),
+                ("tenant", "NO"),
+                ("slot", "NO"),
+                ("email", "YES"),
+            ]
+        ]
+        wide = IndexInfo(
+            index_name="by_tenant_slot", columns=("tenant", "slot"), is_unique=True
+        )
+        narrow = IndexInfo(index_name="by_id", columns=("id",), is_unique=True)
+        unusable = (
+            IndexInfo(index_name="by_email", columns=("email",), is_unique=True),
+            IndexInfo(index_name="by_lower", columns=("lower(email)",), is_unique=True),
+            IndexInfo(
+                index_name="by_slot", columns=("slot",), is_unique=True, is_partial=True
+            ),
+            IndexInfo(
+                index_name="by_tenant",
+                columns=("tenant",),
+                is_unique=True,
+                is_valid=False,
+            ),
+            IndexInfo(index_name="plain", columns=("id",)),
+        )
+        primary = IndexInfo(
+            index_name="pkey", columns=("tenant", "id"), is_unique=True, is_primary=True
+        )
+        assert TableConstraints(indexes=unusable).key_columns(columns) == ()
+        candidates = TableConstraints(indexes=(*unusable, wide, narrow))
+        with_primary = TableConstraints(indexes=(wide, narrow, primary))
+        assert candidates.key_columns(columns) == ("id",)
+        assert with_primary.key_columns(columns) == ("tenant", "id")
+
+    @pytest.mark.asyncio
+    async def test_derives_from_cached_constraints_and_columns(
+        self,
+        metadata_provider: MetadataProvider,
+        mock_session: object,
+        sample_column_rows: list[dict],
+    ) -> None:
+        indexes = MagicMock()
+        indexes.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "index_name": "users_pkey",
+                "columns": ["id"],
+                "method": "btree",
+                "is_unique": True,
+                "is_primary": True,
+                "is_partial": False,
+                "is_valid": True,
+            },
+        ]
+        foreign_keys = MagicMock()
+        foreign_keys.mappings.return_value.all.return_value = []
+        columns = MagicMock()
+        columns.mappings.return_value.all.return_value = sample_column_rows
+        mock_session.execute.side_effect = [indexes, foreign_keys, columns]
+        provider = metadata_provider
+        first = await provider.list_key_columns(mock_session, "public", "users")
+        second = await provider.list_key_columns(mock_session, "public", "users")
+        assert first == second == ("id",)
+        assert mock_session.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_database_provider_hit_skips_session(
+        self, metadata_provider: MetadataProvider
+    ) -> None:
+        column = ColumnInfo(column_name="id", data_type="integer", is_nullable="NO")
+        index = IndexInfo(index_name="users_pkey", columns=("id",), is_unique=True)
+        metadata_provider.prime_columns("public", "users", [column])
+        metadata_provider.prime_constraints(
+            "public", "users", TableConstraints(indexes=(index,))
+        )
+        session_provider = MagicMock(spec=SessionProvider)
+        session_provider.open.side_effect = AssertionError("session opened")
+        provider = DatabaseProvider(session_provider, metadata_provider)
+        assert await provider.list_key_columns("public", "users") == ("id",)
+        session_provider.open.assert_not_called()
+
+
+class TestListConstraints:
+    @pytest.mark.asyncio
+    async def test_batch_groups_rows_in_two_queries(
+        self, metadata_provider: MetadataProvider, mock_session: object
+    ) -> None:
+        indexes = MagicMock()
+        indexes.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "sales",
+                "table_name": "orders",
+                "index_name": "orders_pkey",
+                "columns": ["id"],
+                "method": "btree",
+                "is_unique": True,
+                "is_primary": True,
+                "is_partial": False,
+                "is_valid": True,
+            },
+        ]
+        foreign_keys = MagicMock()
+        foreign_keys.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "sales",
+                "table_name": "orders",
+                "constraint_name": "orders_customer_fk",
+                "columns": ["customer_id"],
+                "referenced_schema": "crm",
+                "referenced_table": "customers",
+                "referenced_columns": ["id"],
+            },
+        ]
+        mock_session.execute.side_effect = [indexes, foreign_keys]
+        found = await metadata_provider.list_constraints_batch(
+            mock_session, "sales", ["orders", "notes"]
+        )
+        assert found["orders"].primary_key == ("id",)
+        assert found["orders"].foreign_keys[0].referenced_table == "customers"
+        assert found["notes"] == TableConstraints()
+        assert mock_session.execute.await_args.args[1] == {
+            "schema_name": "sales",
+            "table_names": ["orders", "notes"],
+        }
+        again = await metadata_provider.list_constraints(mock_session, "sales", "notes")
+        assert again is found["notes"]
+        assert mock_session.execute.await_count == 2
+
+    def test_lookup_index_prefers_wider_then_unique(self) -> None:
+        constraints = TableConstraints(
+            indexes=(
+                IndexInfo(index_name="by_a", columns=("a",)),
+                IndexInfo(index_name="by_a_b", columns=("a", "b")),
+                IndexInfo(index_name="uniq_a", columns=("a",), is_unique=True),
+                IndexInfo(index_name="by_c", columns=("c",), is_partial=True),
+                IndexInfo(index_name="gin_d", columns=("d",), method="gin"),
+            )
+        )
+        assert constraints.lookup_index(["a", "b"]).index_name == "by_a_b"
+        assert constraints.lookup_index(["a"]).index_name == "uniq_a"
+        assert constraints.lookup_index(["b"]) is None
+        assert constraints.lookup_index(["c", "d"]) is None
+        assert constraints.indexed_columns() == ("a",)
+
+
+class TestLoadCatalog:
+    @pytest.fixture
+    def snapshot_session(self, mock_session: object) -> object:
+        schemas = MagicMock()
+        schemas.mappings.return_value.all.return_value = [
+            {"name": "empty"},
+            {"name": "public"},
+        ]
+        columns = MagicMock()
+        table_stats = {
+            "estimated_rows": 1200,
+            "total_bytes": 65536,
+            "last_analyzed": None,
+            "partition_of": None,
+        }
+        columns.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "public",
+                "table_name": "posts",
+                "column_name": None,
+                "data_type": None,
+                "is_nullable": None,
+                **table_stats,
+            },
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "column_name": "id",
+                "data_type": "integer",
+                "is_nullable": "NO",
+                **table_stats,
+            },
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "column_name": "name",
+                "data_type": "character varying(64)",
+                "is_nullable": "YES",
+                **table_stats,
+            },
+        ]
+        indexes = MagicMock()
+        indexes.mappings.return_value.all.return_value = [
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "index_name": "users_pkey",
+                "columns": ["id"],
+                "method": "btree",
+                "is_unique": True,
+                "is_primary": True,
+                "is_partial": False,
+                "is_valid": True,
+            }
+        ]
+        foreign_keys = MagicMock()
+        foreign_keys.mappings.return_value.all.return_value = []
+        mock_session.execute.side_effect = [schemas, columns, indexes, foreign_keys]
+        return mock_session
+
+    @pytest.mark.asyncio
+    async def test_fills_all_caches_in_four_queries(
+        self, snapshot_session: object
+    ) -> None:
+        provider = MetadataProvider(catalog_snapshot=True)
+        schemas = await provider.list_schemas(snapshot_session)
+        tables = await provider.list_tables(snapshot_session, "public")
+        empty = await provider.list_tables(snapshot_session, "empty")
+        columns = await provider.list_columns(snapshot_session, "public", "users")
+        no_columns = await provider.list_columns(snapshot_session, "public", "posts")
+        assert [s.name for s in schemas] == ["empty", "public"]
+        assert [t.table_name for t in tables] == ["posts", "users"]
+        assert tables[1].estimated_rows == 1200
+        assert empty == ()
+        assert [(c.column_name, c.is_nullable) for c in columns] == [
+            ("id", "NO"),
+            ("name", "YES"),
+        ]
+        assert no_columns == ()
+        users = await provider.list_constraints(snapshot_session, "public", "users")
+        posts = await provider.list_constraints(snapshot_session, "public", "posts")
+        assert users.primary_key == ("id",)
+        assert posts == TableConstraints()
+        assert snapshot_session.execute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_clear_cache_reloads_snapshot(self, snapshot_session: object) -> None:
+        provider = MetadataProvider(catalog_snapshot=True)
+        await provider.list_schemas(snapshot_session)
+        provider.clear_cache()
+        snapshot_session.execute.side_effect = None
+        snapshot_session.execute.return_value.mappings.return_value.all.return_value = []
+        await provider.list_schemas(snapshot_session)
+        assert snapshot_session.execute.await_count == 8
+
+
+class TestCacheHits:
+    @pytest.fixture
+    def large_schema_provider(self) -> MetadataProvider:
+        provider = MetadataProvider()
+        provider.prime_tables(
+            "warehouse",
+            [
+                TableInfo(schema_name="warehouse", table_name=f"t_{i:05d}")
+                for i in range(5_000)
+            ],
+        )
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_hits_return_the_cached_records(
+        self,
+        metadata_provider: MetadataProvider,
+        mock_session: object,
+        mock_result: MagicMock,
+        sample_table_rows: list[dict],
+    ) -> None:
+        mock_result.mappings.return_value.all.return_value = sample_table_rows
+        first = await metadata_provider.list_tables(mock_session, "public")
+        second = await metadata_provider.list_tables(mock_session, "public")
+        assert first is second
+
+    def test_cached_records_are_immutable(self) -> None:
+        table = TableInfo(schema_name="public", table_name="users")
+        with pytest.raises(ValidationError):
+            table.table_name = "other"
+
+    @staticmethod
+    async def _hit_peak(provider: MetadataProvider, session: object, schema: str) -> int:
+        await provider.list_tables(session, schema)
+        tracemalloc.start()
+        try:
+            for _ in range(100):
+                await provider.list_tables(session, schema)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    @pytest.mark.asyncio
+    async def test_hit_allocations_do_not_scale_with_schema_size(
+        self, large_schema_provider: MetadataProvider, mock_session: object
+    ) -> None:
+        small_schema_provider = MetadataProvider()
+        small_schema_provider.prime_tables(
+            "warehouse", [TableInfo(schema_name="warehouse", table_name="t")]
+        )
+        large_peak = await self._hit_peak(large_schema_provider, mock_session, "warehouse")
+        small_peak = await self._hit_peak(small_schema_provider, mock_session, "warehouse")
+        mock_session.execute.assert_not_called()
+        # A copy of the 5,000 cached records alone would take 40 KB.
+        assert large_peak - small_peak < 4 * 1024, (large_peak, small_peak)
+        first = await large_schema_provider.list_tables(mock_session, "warehouse")
+        assert await large_schema_provider.list_tables(mock_session, "warehouse") is first
+
+    @pytest.mark.asyncio
+    async def test_database_provider_hit_skips_session(
+        self, large_schema_provider: MetadataProvider
+    ) -> None:
+        session_provider = MagicMock(spec=SessionProvider)
+        session_provider.open.side_effect = AssertionError("session opened")
+        provider = DatabaseProvider(session_provider, large_schema_provider)
+        tables = await provider.list_tables("warehouse")
+        assert len(tables) == 5_000
+        session_provider.open.assert_not_called()
+
+
+class TestBatchedMetadata:
+    @pytest.mark.asyncio
+    async def test_tables_batch_groups_rows_and_primes_cache(
+        self,
+        metadata_provider: MetadataProvider,
+        mock_session: object,
+        mock_result: MagicMock,
+        sample_table_rows: list[dict],
+    ) -> None:
+        metadata_provider.prime_tables("cached", [])
+        mock_result.mappings.return_value.all.return_value = sample_table_rows
+        found = await metadata_provider.list_tables_batch(
+            mock_session, ["public", "empty", "cached"]
+        )
+        assert [t.table_name for t in found["public"]] == ["users", "posts"]
+        assert found["empty"] == ()
+        assert found["cached"] == ()
+        sql, params = mock_session.execute.await_args.args
+        assert "= ANY" in str(sql)
+        assert params == {"schema_names": ["public", "empty"]}
+        assert metadata_provider.cached_tables("empty") == ()
+
+    @pytest.mark.asyncio
+    async def test_columns_batch_groups_rows_by_table(
+        self,
+        metadata_provider: MetadataProvider,
+        mock_session: object,
+        mock_result: MagicMock,
+        sample_column_rows: list[dict],
+    ) -> None:
+        mock_result.mappings.return_value.all.return_value = sample_column_rows
+        found = await metadata_provider.list_columns_batch(
+            mock_session, "public", ["users", "posts"]
+        )
+        assert [c.column_name for c in found["users"]] == ["id", "name"]
+        assert found["posts"] == ()
+        assert metadata_provider.cached_columns("public", "users") == found["users"]
+
+    @pytest.mark.asyncio
+    async def test_iter_tables_bounds_concurrency_and_yields_everything(
+        self, metadata_provider: MetadataProvider, mock_session: MagicMock
+    ) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def execute(sql: object, params: dict) -> MagicMock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            result = MagicMock()
+            result.mappings.return_value.all.return_value = [
+                {"schema_name": name, "table_name": f"{name}_t"}
+                for name in params["schema_names"]
+            ]
+            return result
+
+        mock_session.execute.side_effect = execute
+        metadata_provider.prime_tables("s0", [])
+        provider = DatabaseProvider(
+            MockSessionProvider(object(), mock_session), metadata_provider
+        )
+        schemas = [f"s{i}" for i in range(9)]
+        seen = [
+            name
+            async for name, _ in provider.iter_tables(schemas, batch_size=2, concurrency=2)
+        ]
+        assert seen[0] == "s0"
+        assert sorted(seen) == schemas
+        assert mock_session.execute.await_count == 4
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_iter_columns_batches_per_schema(
+        self, metadata_provider: MetadataProvider, mock_session: MagicMock
+    ) -> None:
+        provider = DatabaseProvider(
+            MockSessionProvider(object(), mock_session), metadata_provider
+        )
+        tables = [("a", "t1"), ("a", "t2"), ("b", "t1")]
+        seen = [(s, t) async for s, t, _ in provider.iter_columns(tables)]
+        assert sorted(seen) == tables
+        batches = sorted(
+            (call.args[1]["schema_name"], call.args[1]["table_names"])
+            for call in mock_session.execute.await_args_list
+        )
+        assert batches == [("a", ["t1", "t2"]), ("b", ["t1"])]
+
+
+class TestGroupPartitions:
+    def test_groups_partitions_under_listed_parents(self) -> None:
+        tables = (
+            TableInfo(schema_name="public", table_name="events"),
+            TableInfo(schema_name="public", table_name="events_2024", partition_of="events"),
+            TableInfo(schema_name="public", table_name="events_2025", partition_of="events"),
+            TableInfo(schema_name="public", table_name="orphan_1", partition_of="hidden"),
+            TableInfo(schema_name="public", table_name="users"),
+        )
+        top_level, partitions = group_partitions(tables)
+        assert [t.table_name for t in top_level] == ["events", "users", "orphan_1"]
+        assert [t.table_name for t in partitions["events"]] == [
+            "events_2024",
+            "events_2025",
+        ]
+        assert "hidden" not in partitions
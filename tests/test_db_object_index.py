@@ -0,0 +1,115 @@
+import pytest
+
+from inspector.db.metadata import ColumnInfo, MetadataProvider, SchemaInfo, TableInfo
+from inspector.db.object_index import (
+    SCAN_BUDGET,
+    CatalogObject,
+    ObjectIndex,
+    _query_trigrams,
+)
+
+
+@pytest.fixture
+def index() -> ObjectIndex:
+    index = ObjectIndex()
+    index.add_schemas(["public", "sales"])
+    index.add_tables("public", ["users", "user_sessions", "audit_users", "invoices"])
+    index.add_tables("sales", ["orders", "order_items"])
+    index.add_columns("sales", "orders", ["id", "user_id", "ordered_at"])
+    return index
+
+
+def _names(results: list[CatalogObject]) -> list[str]:
+    return [obj.qualified_name for obj in results]
+
+
+class TestObjectIndex:
+    def test_ranks_exact_then_word_then_fuzzy(self, index: ObjectIndex) -> None:
+        assert _names(index.search("users")) == [
+            "public.users",
+            "public.audit_users",
+            "sales.orders.user_id",
+            "public.user_sessions",
+        ]
+
+    def test_prefix_matches_prefer_shorter_names(self, index: ObjectIndex) -> None:
+        assert _names(index.search("user")) == [
+            "public.users",
+            "sales.orders.user_id",
+            "public.user_sessions",
+            "public.audit_users",
+        ]
+
+    def test_short_queries_match_prefixes(self, index: ObjectIndex) -> None:
+        assert _names(index.search("or")) == [
+            "sales.orders",
+            "sales.order_items",
+            "sales.orders.ordered_at",
+        ]
+
+    def test_tolerates_typos(self, index: ObjectIndex) -> None:
+        assert _names(index.search("invoces")) == ["public.invoices"]
+
+    def test_qualified_query_filters_by_parent(self, index: ObjectIndex) -> None:
+        assert _names(index.search("orders.id")) == ["sales.orders.id"]
+        assert _names(index.search("public.order")) == []
+
+    def test_case_insensitive_and_empty_query(self, index: ObjectIndex) -> None:
+        assert _names(index.search("ORDERS"))[0] == "sales.orders"
+        assert index.search("   ") == []
+
+    def test_deduplicates_and_clears(self, index: ObjectIndex) -> None:
+        size = len(index)
+        index.add_tables("public", ["users"])
+        assert len(index) == size
+        assert CatalogObject("table", "public", "users") in index
+        index.clear()
+        assert len(index) == 0
+        assert index.search("users") == []
+
+    def test_lookups_stay_within_scan_budget(self) -> None:
+        words = ["user", "order", "item", "invoice", "payment", "account", "event"]
+        columns = ["id", "created_at", "updated_at", "name", "status", "user_id"]
+        index = ObjectIndex()
+        for s in range(20):
+            schema = f"schema_{s}"
+            index.add_schemas([schema])
+            tables = [f"{words[i % 7]}_{words[(i // 7) % 7]}_{i}" for i in range(800)]
+            index.add_tables(schema, tables)
+            for table in tables:
+                index.add_columns(schema, table, columns)
+        assert len(index) > 100_000
+        queries = ["ord", "order_item_12", "paymnt", "created", "id", "u", "schema_3.inv"]
+        for query in queries:
+            assert index.search(query)
+            grams = _query_trigrams(query.rpartition(".")[2])
+            for trigrams in (index._relations, index._columns):
+                counts, _ = trigrams.candidates(grams)
+                assert sum(counts.values()) <= SCAN_BUDGET, query
+
+
+    def test_finds_exact_match_inserted_after_the_budget(self) -> None:
+        index = ObjectIndex()
+        index.add_schemas(["archive", "public"])
+        index.add_tables("archive", [f"events_{i:05d}" for i in range(SCAN_BUDGET + 1000)])
+        index.add_tables("public", ["events"])
+        assert _names(index.search("events"))[0] == "public.events"
+        assert _names(index.search("public.events")) == ["public.events"]
+        assert _names(index.search("archive.events_02999"))[0] == "archive.events_02999"
+
+
+class TestMetadataProviderIndexing:
+    @pytest.mark.asyncio
+    async def test_index_follows_cache_writes(self) -> None:
+        provider = MetadataProvider()
+        provider.prime_schemas([SchemaInfo(name="public")])
+        provider.prime_tables("public", [TableInfo(schema_name="public", table_name="users")])
+        provider.prime_columns(
+            "public",
+            "users",
+            [ColumnInfo(column_name="email", data_type="text", is_nullable="YES")],
+        )
+        assert _names(provider.object_index.search("email")) == ["public.users.email"]
+        assert _names(provider.object_index.search("users")) == ["public.users"]
+        provider.clear_cache()
+        assert len(provider.object_index) == 0
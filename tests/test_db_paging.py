@@ -0,0 +1,400 @@
+import asyncio
+import re
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.db.metadata import ColumnInfo
+from inspector.db.paging import (
+    CTID_COLUMN,
+    CachedPage,
+    PageCache,
+    TablePager,
+    build_ctid_query,
+    build_keyset_query,
+)
+from inspector.db.result import QueryResult
+from inspector.db.sql import HEAP_BLOCKS_SQL
+
+
+def _page(ids: range | list[int]) -> QueryResult:
+    return QueryResult.from_rows(["id", "name"], [(i, f"n{i}") for i in ids])
+
+
+def _tid(value: str) -> tuple[int, int]:
+    block, offset = value.strip("()").split(",")
+    return int(block), int(offset)
+
+
+def _heap_provider(
+    heaps: dict[str, dict[int, int]], provider: MagicMock
+) -> list[dict[str, Any]]:
+    """Serve ctid queries from ``heaps``: table name -> {block: tuple count}."""
+    calls: list[dict[str, Any]] = []
+
+    async def run_query(sql: str, params: dict[str, Any]) -> QueryResult:
+        if sql == HEAP_BLOCKS_SQL:
+            rows = [
+                ("public", name, max(blocks, default=-1) + 1)
+                for name, blocks in heaps.items()
+            ]
+            return QueryResult.from_rows(["schema_name", "table_name", "blocks"], rows)
+        table = re.search(r'FROM "public"\."(\w+)"', sql).group(1)
+        calls.append({"table": table, **params})
+        tids = sorted(
+            (block, offset)
+            for block, count in heaps[table].items()
+            for offset in range(1, count + 1)
+        )
+        tids = [t for t in tids if t >= _tid(params["lo"])]
+        if "hi" in params:
+            tids = [t for t in tids if t < _tid(params["hi"])]
+        descending = "DESC" in sql
+        if "k0" in params:
+            bookmark = _tid(params["k0"])
+            tids = [t for t in tids if (t < bookmark if descending else t > bookmark)]
+        if descending:
+            tids.reverse()
+        limit = int(re.search(r"LIMIT (\d+)", sql).group(1))
+        rows = [(f"({b},{o})", f"{table}:{b}:{o}") for b, o in tids[:limit]]
+        return QueryResult.from_rows([CTID_COLUMN, "msg"], rows)
+
+    provider.list_key_columns.return_value = []
+    provider.run_query.side_effect = run_query
+    return calls
+
+
+@pytest.fixture
+def database_provider() -> MagicMock:
+    provider = MagicMock()
+    provider.list_key_columns = AsyncMock(return_value=["id"])
+    provider.run_query = AsyncMock()
+    return provider
+
+
+class TestBuildKeysetQuery:
+    def test_first_page_has_no_predicate(self) -> None:
+        sql, params = build_keyset_query("public", "users", ["id"], 100)
+        assert sql == 'SELECT * FROM "public"."users" ORDER BY "id" LIMIT 100'
+        assert params == {}
+
+    def test_forward_uses_row_comparison_with_bookmark(self) -> None:
+        sql, params = build_keyset_query(
+            "public", "events", ["tenant", "id"], 50, "forward", (7, 42)
+        )
+        assert 'WHERE ("tenant", "id") > (:k0, :k1)' in sql
+        assert sql.endswith('ORDER BY "tenant", "id" LIMIT 50')
+        assert params == {"k0": 7, "k1": 42}
+
+    def test_backward_reverses_comparison_and_order(self) -> None:
+        sql, params = build_keyset_query(
+            "public", "users", ["id"], 100, "backward", (10,)
+        )
+        assert 'WHERE ("id") < (:k0)' in sql
+        assert sql.endswith('ORDER BY "id" DESC LIMIT 100')
+        assert params == {"k0": 10}
+
+    def test_quotes_identifiers(self) -> None:
+        sql, _ = build_keyset_query('we"ird', "t", ['c"ol'], 1)
+        assert '"we""ird"."t"' in sql
+        assert 'ORDER BY "c""ol"' in sql
+
+
+class TestBuildCtidQuery:
+    def test_bounds_a_block_window_after_the_bookmark(self) -> None:
+        sql, params = build_ctid_query(
+            "public", "logs", 100, "forward", "(3,7)", (3, 67)
+        )
+        assert f'ctid::text AS "{CTID_COLUMN}", *' in sql
+        assert (
+            "WHERE ctid >= CAST(:lo AS tid) AND ctid < CAST(:hi AS tid) "
+            "AND ctid > CAST(:k0 AS tid)"
+        ) in sql
+        assert sql.endswith("ORDER BY ctid LIMIT 100")
+        assert params == {"lo": "(3,0)", "hi": "(67,0)", "k0": "(3,7)"}
+
+    def test_last_window_is_open_ended_and_lists_columns(self) -> None:
+        sql, params = build_ctid_query(
+            "public", "logs_2024", 10, "backward", None, (128, None), ["msg"]
+        )
+        assert '"msg" FROM "public"."logs_2024" WHERE ctid >= CAST(:lo AS tid) ' in sql
+        assert sql.endswith("ORDER BY ctid DESC LIMIT 10")
+        assert params == {"lo": "(128,0)"}
+
+
+class TestTablePager:
+    @pytest.mark.asyncio
+    async def test_next_page_seeks_past_last_key(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.side_effect = [
+            _page(range(1, 4)),
+            _page(range(4, 7)),
+        ]
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        result = await pager.next_page()
+        assert result.column("id") == [4, 5, 6]
+        assert pager.page_index == 1
+        assert pager.offset == 3
+        sql, params = database_provider.run_query.await_args.args
+        assert "OFFSET" not in sql
+        assert params == {"k0": 3}
+
+    @pytest.mark.asyncio
+    async def test_prev_page_seeks_before_first_key_and_restores_order(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.side_effect = [
+            _page(range(1, 4)),
+            _page(range(4, 7)),
+            _page([3, 2, 1]),
+        ]
+        pager = TablePager(
+            database_provider, "public", "users", page_size=3, cache_size=1
+        )
+        await pager.first_page()
+        await pager.next_page()
+        result = await pager.prev_page()
+        assert result.column("id") == [1, 2, 3]
+        assert pager.page_index == 0
+        sql, params = database_provider.run_query.await_args.args
+        assert "<" in sql and params == {"k0": 4}
+
+    @pytest.mark.asyncio
+    async def test_next_page_at_end_keeps_position(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.side_effect = [
+            _page(range(1, 3)),
+            QueryResult.empty(["id", "name"]),
+        ]
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        assert await pager.next_page() is None
+        assert pager.page_index == 0
+
+    @pytest.mark.asyncio
+    async def test_prev_page_on_first_page_does_not_query(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.return_value = _page([1])
+        pager = TablePager(database_provider, "public", "users")
+        await pager.first_page()
+        assert await pager.prev_page() is None
+        database_provider.run_query.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_ctid_and_hides_bookmark_column(
+        self, database_provider: MagicMock
+    ) -> None:
+        _heap_provider({"logs": {0: 2}}, database_provider)
+        pager = TablePager(database_provider, "public", "logs", page_size=1)
+        result = await pager.first_page()
+        assert pager.uses_ctid
+        assert result.columns == ["msg"]
+        assert list(result) == [("logs:0:1",)]
+        result = await pager.next_page()
+        assert list(result) == [("logs:0:2",)]
+        database_provider.list_columns.assert_not_called()
+
+
+class TestTablePagerCtidWindows:
+    @pytest.mark.asyncio
+    async def test_pages_walk_growing_windows_across_partitions(
+        self, database_provider: MagicMock
+    ) -> None:
+        calls = _heap_provider(
+            {"logs_a": {0: 2, 500: 1}, "logs_b": {3: 2}}, database_provider
+        )
+        msg = ColumnInfo(column_name="msg", data_type="text", is_nullable="YES")
+        database_provider.list_columns = AsyncMock(return_value=(msg,))
+        pager = TablePager(
+            database_provider, "public", "logs", page_size=2, cache_size=1
+        )
+        pages = [await pager.first_page()]
+        while (page := await pager.next_page()) is not None:
+            pages.append(page)
+        assert [page.column("msg") for page in pages] == [
+            ["logs_a:0:1", "logs_a:0:2"],
+            ["logs_a:500:1", "logs_b:3:1"],
+            ["logs_b:3:2"],
+        ]
+        second_page = calls[1:6]
+        assert [(c["table"], c["lo"], c.get("hi")) for c in second_page] == [
+            ("logs_a", "(0,0)", "(64,0)"),
+            ("logs_a", "(64,0)", "(192,0)"),
+            ("logs_a", "(192,0)", "(448,0)"),
+            ("logs_a", "(448,0)", None),
+            ("logs_b", "(0,0)", None),
+        ]
+        backward = [await pager.prev_page(), await pager.prev_page()]
+        assert [page.column("msg") for page in backward] == [
+            ["logs_a:500:1", "logs_b:3:1"],
+            ["logs_a:0:1", "logs_a:0:2"],
+        ]
+        assert pager.page_index == 0
+
+
+class TestPageCache:
+    def test_evicts_least_recently_used(self) -> None:
+        cache = PageCache(capacity=2)
+        for index in range(3):
+            cache.put(index, CachedPage(_page([index]), (index,), (index,)))
+            if index == 1:
+                cache.get(0)
+        assert 0 in cache and 2 in cache
+        assert 1 not in cache
+
+    def test_counts_hits_and_misses(self) -> None:
+        cache = PageCache()
+        cache.put(0, CachedPage(_page([1]), (1,), (1,)))
+        cache.get(0)
+        cache.get(1)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestTablePagerPrefetch:
+    @pytest.mark.asyncio
+    async def test_prefetched_next_page_is_served_from_cache(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.side_effect = [
+            _page(range(1, 4)),
+            _page(range(4, 7)),
+        ]
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        await pager.prefetch()
+        assert database_provider.run_query.await_count == 2
+        result = await pager.next_page()
+        assert result.column("id") == [4, 5, 6]
+        assert database_provider.run_query.await_count == 2
+        assert pager.cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_back_and_forth_browsing_does_not_refetch(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.side_effect = [
+            _page(range(1, 4)),
+            _page(range(4, 7)),
+        ]
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        await pager.next_page()
+        await pager.prev_page()
+        result = await pager.next_page()
+        assert result.column("id") == [4, 5, 6]
+        assert database_provider.run_query.await_count == 2
+        assert (pager.cache.hits, pager.cache.misses) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_next_page_waits_for_inflight_prefetch(
+        self, database_provider: MagicMock
+    ) -> None:
+        release = asyncio.Event()
+
+        async def run_query(sql: str, params: dict) -> QueryResult:
+            if not params:
+                return _page(range(1, 4))
+            await release.wait()
+            return _page(range(4, 7))
+
+        database_provider.run_query.side_effect = run_query
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        prefetch = asyncio.create_task(pager.prefetch())
+        await asyncio.sleep(0)
+        next_page = asyncio.create_task(pager.next_page())
+        await asyncio.sleep(0)
+        release.set()
+        result = await next_page
+        await prefetch
+        assert result.column("id") == [4, 5, 6]
+        assert database_provider.run_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reset_drops_stale_prefetch(self, database_provider: MagicMock) -> None:
+        release = asyncio.Event()
+        first_pages = [range(1, 4), range(10, 13)]
+
+        async def run_query(sql: str, params: dict) -> QueryResult:
+            if not params:
+                return _page(first_pages.pop(0))
+            if params["k0"] == 3:
+                await release.wait()
+                return _page(range(4, 7))
+            return _page(range(params["k0"] + 1, params["k0"] + 4))
+
+        database_provider.run_query.side_effect = run_query
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        await pager.first_page()
+        prefetch = asyncio.create_task(pager.prefetch())
+        await asyncio.sleep(0)
+        await pager.first_page()
+        release.set()
+        await prefetch
+        result = await pager.next_page()
+        assert result.column("id") == [13, 14, 15]
+
+
+class TestTablePagerJump:
+    def test_estimated_page_count_rounds_up(self, database_provider: MagicMock) -> None:
+        pager = TablePager(database_provider, "public", "users", page_size=100)
+        assert pager.estimated_page_count is None
+        pager.estimated_rows = 1_001
+        assert pager.estimated_page_count == 11
+
+    @pytest.mark.asyncio
+    async def test_jump_seeks_from_histogram_bound(
+        self, database_provider: MagicMock
+    ) -> None:
+        bounds = [str(i * 1_000) for i in range(101)]
+        database_provider.run_query.side_effect = [
+            QueryResult.from_rows(["bounds", "type_name"], [(bounds, "bigint")]),
+            _page(range(50_000, 50_003)),
+        ]
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        pager.estimated_rows = 100_000
+        result = await pager.jump_to_fraction(0.5)
+        assert result.column("id") == [50_000, 50_001, 50_002]
+        assert pager.page_index == 16_667
+        sql, params = database_provider.run_query.await_args.args
+        assert '"id" >= CAST(:k0 AS bigint)' in sql
+        assert params == {"k0": "50000"}
+
+    @pytest.mark.asyncio
+    async def test_jump_without_key_seeks_by_block(
+        self, database_provider: MagicMock
+    ) -> None:
+        calls = _heap_provider({"logs": {10: 1, 250: 1, 999: 1}}, database_provider)
+        pager = TablePager(database_provider, "public", "logs", page_size=1)
+        pager.estimated_rows = 40
+        result = await pager.jump_to_page(11)
+        assert list(result) == [("logs:250:1",)]
+        assert pager.page_index == 10
+        assert calls[0]["k0"] == "(250,0)"
+
+    @pytest.mark.asyncio
+    async def test_jump_without_estimate_is_refused(
+        self, database_provider: MagicMock
+    ) -> None:
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        with pytest.raises(ValueError, match="ANALYZE"):
+            await pager.jump_to_page(5)
+        with pytest.raises(ValueError, match="ANALYZE"):
+            await pager.jump_to_fraction(0.5)
+        database_provider.run_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_jump_to_first_page_reads_from_start(
+        self, database_provider: MagicMock
+    ) -> None:
+        database_provider.run_query.return_value = _page(range(1, 4))
+        pager = TablePager(database_provider, "public", "users", page_size=3)
+        pager.estimated_rows = 30
+        await pager.jump_to_page(1)
+        sql, params = database_provider.run_query.await_args.args
+        assert "WHERE" not in sql and params == {}
@@ -0,0 +1,126 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.plan import explain_sql, parse_plan
+from tests.conftest import MockSessionProvider
+
+ANALYZED = [
+    {
+        "Plan": {
+            "Node Type": "Hash Join",
+            "Join Type": "Inner",
+            "Startup Cost": 10.0,
+            "Total Cost": 120.0,
+            "Plan Rows": 10,
+            "Actual Total Time": 50.0,
+            "Actual Rows": 1200,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": 30,
+            "Shared Read Blocks": 5,
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Parent Relationship": "Outer",
+                    "Relation Name": "orders",
+                    "Schema": "public",
+                    "Alias": "o",
+                    "Startup Cost": 0.0,
+                    "Total Cost": 80.0,
+                    "Plan Rows": 1000,
+                    "Actual Total Time": 40.0,
+                    "Actual Rows": 1000,
+                    "Actual Loops": 1,
+                    "Shared Hit Blocks": 20,
+                    "Shared Read Blocks": 5,
+                },
+                {
+                    "Node Type": "Index Scan",
+                    "Parent Relationship": "Inner",
+                    "Scan Direction": "Forward",
+                    "Index Name": "users_pkey",
+                    "Relation Name": "users",
+                    "Schema": "public",
+                    "Alias": "users",
+                    "Startup Cost": 0.3,
+                    "Total Cost": 8.0,
+                    "Plan Rows": 1,
+                    "Actual Total Time": 0.002,
+                    "Actual Rows": 1,
+                    "Actual Loops": 1000,
+                    "Shared Hit Blocks": 10,
+                    "Shared Read Blocks": 0,
+                },
+            ],
+        },
+        "Planning Time": 0.4,
+        "Execution Time": 50.5,
+    }
+]
+
+
+class TestParsePlan:
+    def test_self_time_and_loops(self) -> None:
+        plan = parse_plan(json.dumps(ANALYZED))
+        join, scan, probe = plan.root.walk()
+        assert plan.analyzed
+        assert plan.execution_ms == 50.5
+        assert probe.total_ms == pytest.approx(2.0)
+        assert join.self_ms == pytest.approx(8.0)
+        assert scan.self_ms == pytest.approx(40.0)
+        assert scan.target == "on public.orders o"
+        assert probe.target == "on public.users using users_pkey"
+        assert join.detail == "Inner"
+        assert (join.shared_hit, join.shared_read) == (30, 5)
+
+    def test_row_estimate_factor(self) -> None:
+        join, scan, probe = parse_plan(ANALYZED).root.walk()
+        assert join.row_estimate_factor == pytest.approx(120.0)
+        assert scan.row_estimate_factor == pytest.approx(1.0)
+        assert probe.row_estimate_factor == pytest.approx(1.0)
+
+    def test_hot_nodes_rank_by_self_time(self) -> None:
+        plan = parse_plan(ANALYZED)
+        assert [n.node_type for n in plan.hot_nodes()] == ["Seq Scan", "Hash Join"]
+
+    def test_estimated_plan_ranks_by_self_cost(self) -> None:
+        raw = json.loads(json.dumps(ANALYZED[0]))
+        for node in [raw["Plan"], *raw["Plan"]["Plans"]]:
+            for key in ("Actual Total Time", "Actual Rows", "Actual Loops"):
+                del node[key]
+        plan = parse_plan(raw)
+        join, scan, _ = plan.root.walk()
+        assert not plan.analyzed
+        assert join.row_estimate_factor is None
+        assert join.self_cost == pytest.approx(32.0)
+        assert plan.hot_nodes()[0] is scan
+
+
+class TestExplainSql:
+    def test_wraps_statement(self) -> None:
+        assert explain_sql("SELECT 1;") == "EXPLAIN (FORMAT JSON, BUFFERS) SELECT 1"
+        assert explain_sql("SELECT 1", analyze=True).startswith(
+            "EXPLAIN (FORMAT JSON, BUFFERS, ANALYZE)"
+        )
+
+    @pytest.mark.parametrize("sql", ["SELECT 1; SELECT 2", "DELETE FROM t"])
+    def test_rejects(self, sql: str) -> None:
+        with pytest.raises(ValueError):
+            explain_sql(sql)
+
+
+class TestExplainQuery:
+    @pytest.mark.asyncio
+    async def test_analyze_rolls_back(
+        self, mock_engine: MagicMock, mock_session: AsyncMock
+    ) -> None:
+        mock_session.execute.return_value.scalar_one.return_value = ANALYZED
+        provider = DatabaseProvider(MockSessionProvider(mock_engine, mock_session))
+        plan = await provider.explain_query("SELECT 1", analyze=True)
+        assert plan.root.node_type == "Hash Join"
+        statement = mock_session.execute.await_args_list[-1].args[0]
+        assert "ANALYZE" in str(statement)
+        mock_session.rollback.assert_awaited_once()
+        mock_session.commit.assert_not_called()
@@ -1,6 +1,41 @@
+import sys
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock
+
 import pytest
 
-from inspector.db.database import run_query
+from inspector.config import ConnectionConfig
+from inspector.db.database import DatabaseProvider, QueryStream, run_query
+from inspector.db.query_cache import QueryCache
+from tests.conftest import MockSessionProvider
+
+
+class _FakeStreamResult:
+    def __init__(self, columns: list[str], rows: list[tuple[Any, ...]]) -> None:
+        self._columns = columns
+        self._rows = rows
+        self.closed = False
+        self.partitions_pulled = 0
+
+    def keys(self) -> list[str]:
+        return self._columns
+
+    async def partitions(self, size: int) -> AsyncIterator[list[tuple[Any, ...]]]:
+        for start in range(0, len(self._rows), size):
+            self.partitions_pulled += 1
+            yield self._rows[start : start + size]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _stream_provider(
+    mock_session: AsyncMock, rows: list[tuple[Any, ...]]
+) -> tuple[MockSessionProvider, _FakeStreamResult]:
+    fake = _FakeStreamResult(["id"], rows)
+    mock_session.stream = AsyncMock(return_value=fake)
+    return MockSessionProvider(object(), mock_session), fake
 
 
 class TestRunQuery:
@@ -9,14 +44,14 @@ class TestRunQuery:
         self,
         mock_session: object,
         mock_result: object,
-        sample_query_rows: list[dict],
+        sample_query_rows: list[tuple],
     ) -> None:
         mock_result.keys.return_value = ["id", "name"]
         mock_result.returns_rows = True
-        mock_result.mappings.return_value.all.return_value = sample_query_rows
-        columns, data = await run_query(mock_session, "SELECT id, name FROM t")
-        assert columns == ["id", "name"]
-        assert data == sample_query_rows
+        mock_result.all.return_value = sample_query_rows
+        result = await run_query(mock_session, "SELECT id, name FROM t")
+        assert result.columns == ["id", "name"]
+        assert list(result) == sample_query_rows
         mock_session.execute.assert_awaited_once()
         mock_session.commit.assert_not_called()
 
@@ -28,10 +63,22 @@ class TestRunQuery:
     ) -> None:
         mock_result.keys.return_value = ["id"]
         mock_result.returns_rows = True
-        mock_result.mappings.return_value.all.return_value = []
-        columns, data = await run_query(mock_session, "SELECT 1 WHERE FALSE")
-        assert columns == ["id"]
-        assert data == []
+        mock_result.all.return_value = []
+        result = await run_query(mock_session, "SELECT 1 WHERE FALSE")
+        assert result.columns == ["id"]
+        assert len(result) == 0
+
+    @pytest.mark.asyncio
+    async def test_passes_bind_parameters(
+        self,
+        mock_session: object,
+        mock_result: object,
+    ) -> None:
+        mock_result.keys.return_value = ["id"]
+        mock_result.all.return_value = [(4,)]
+        await run_query(mock_session, "SELECT id FROM t WHERE id > :k0", {"k0": 3})
+        _, params = mock_session.execute.await_args.args
+        assert params == {"k0": 3}
 
     @pytest.mark.asyncio
     async def test_raises_for_mutating_statement(
@@ -41,3 +88,170 @@ class TestRunQuery:
         with pytest.raises(ValueError, match="read-only"):
             await run_query(mock_session, "CREATE TABLE t(id int)")
         mock_session.execute.assert_not_called()
+
+
+class TestQueryStream:
+    @pytest.mark.asyncio
+    async def test_yields_fixed_size_batches(self, mock_session: AsyncMock) -> None:
+        provider, fake = _stream_provider(mock_session, [(i,) for i in range(5)])
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=2)
+        batches = [batch async for batch in stream]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert stream.columns == ["id"]
+        assert stream.row_count == 5
+        assert stream.exhausted
+        assert not stream.truncated
+        assert fake.closed
+
+    @pytest.mark.asyncio
+    async def test_stops_at_row_ceiling(self, mock_session: AsyncMock) -> None:
+        provider, fake = _stream_provider(mock_session, [(i,) for i in range(10)])
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=4, max_rows=6)
+        batches = [batch async for batch in stream]
+        assert [len(b) for b in batches] == [4, 2]
+        assert stream.truncated
+        assert fake.partitions_pulled == 2
+        assert fake.closed
+
+    @pytest.mark.asyncio
+    async def test_result_of_exactly_max_rows_is_complete(
+        self, mock_session: AsyncMock
+    ) -> None:
+        provider, _ = _stream_provider(mock_session, [(i,) for i in range(8)])
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=4, max_rows=8)
+        batches = [batch async for batch in stream]
+        assert [len(b) for b in batches] == [4, 4]
+        assert stream.exhausted
+        assert not stream.truncated
+
+    @pytest.mark.asyncio
+    async def test_stops_at_byte_ceiling(self, mock_session: AsyncMock) -> None:
+        rows = [("x" * 1000,) for _ in range(10)]
+        provider, _ = _stream_provider(mock_session, rows)
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=10, max_bytes=2500)
+        batches = [batch async for batch in stream]
+        assert len(batches[0]) == 3
+        assert stream.truncated
+
+    @pytest.mark.asyncio
+    async def test_result_ending_at_byte_ceiling_is_complete(
+        self, mock_session: AsyncMock
+    ) -> None:
+        rows = [("x" * 1000,) for _ in range(4)]
+        limit = sum(sys.getsizeof(value) for row in rows for value in row)
+        provider, _ = _stream_provider(mock_session, rows)
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=2, max_bytes=limit)
+        batches = [batch async for batch in stream]
+        assert [len(b) for b in batches] == [2, 2]
+        assert stream.exhausted
+        assert not stream.truncated
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_fetching(self, mock_session: AsyncMock) -> None:
+        provider, fake = _stream_provider(mock_session, [(i,) for i in range(10)])
+        stream = QueryStream(provider, "SELECT id FROM t", batch_size=2)
+        received = 0
+        async for batch in stream:
+            received += len(batch)
+            stream.cancel()
+        assert received == 2
+        assert stream.cancelled
+        assert not stream.exhausted
+        assert fake.closed
+
+    @pytest.mark.asyncio
+    async def test_raises_for_mutating_statement(self, mock_session: AsyncMock) -> None:
+        provider, _ = _stream_provider(mock_session, [])
+        with pytest.raises(ValueError, match="read-only"):
+            async for _ in QueryStream(provider, "DELETE FROM t"):
+                pass
+        mock_session.stream.assert_not_called()
+
+    def test_provider_applies_config_limits(
+        self, mock_session: AsyncMock, connection_config: ConnectionConfig
+    ) -> None:
+        provider, _ = _stream_provider(mock_session, [])
+        provider._config = connection_config.model_copy(
+            update={"stream_batch_size": 7, "max_result_rows": 20}
+        )
+        stream = DatabaseProvider(provider).stream_query("SELECT 1")
+        assert stream.batch_size == 7
+        assert stream._max_rows == 20
+
+
+class TestQueryStreamCache:
+    @pytest.mark.asyncio
+    async def test_replays_complete_results_without_querying(
+        self, mock_session: AsyncMock, mock_result: AsyncMock
+    ) -> None:
+        mock_result.scalar_one.return_value = '"$user", public'
+        provider, fake = _stream_provider(mock_session, [(i,) for i in range(5)])
+        cache = QueryCache(ttl=60)
+        first = QueryStream(provider, "SELECT id FROM t", batch_size=2, cache=cache)
+        assert sum([len(b) async for b in first]) == 5
+        assert first.cached_at is None
+        assert len(cache) == 1
+
+        again = QueryStream(provider, "select id  from t;", batch_size=2, cache=cache)
+        batches = [batch async for batch in again]
+        assert [list(b) for b in batches] == [[(0,), (1,)], [(2,), (3,)], [(4,)]]
+        assert again.cached_at is not None
+        assert again.exhausted
+        assert mock_session.stream.await_count == 1
+        # The search_path is read once per cache.
+        assert mock_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_partial_results_go_to_the_server(
+        self, mock_session: AsyncMock, mock_result: AsyncMock
+    ) -> None:
+        mock_result.scalar_one.return_value = "public"
+        provider, _ = _stream_provider(mock_session, [(i,) for i in range(10)])
+        cache = QueryCache(ttl=60)
+        limited = QueryStream(
+            provider, "SELECT id FROM t", batch_size=4, max_rows=6, cache=cache
+        )
+        _ = [batch async for batch in limited]
+        assert len(cache) == 0
+
+        _ = [batch async for batch in QueryStream(provider, "SELECT id FROM t", cache=cache)]
+        refreshed = QueryStream(provider, "SELECT id FROM t", cache=cache, refresh=True)
+        _ = [batch async for batch in refreshed]
+        assert refreshed.cached_at is None
+        assert mock_session.stream.await_count == 3
+
+        capped = QueryStream(provider, "SELECT id FROM t", max_rows=3, cache=cache)
+        assert sum([len(b) async for b in capped]) == 3
+        assert capped.truncated
+        assert mock_session.stream.await_count == 3
+
+
+class TestProviderRunQueryCache:
+    @pytest.mark.asyncio
+    async def test_caches_only_when_asked_and_enabled(
+        self,
+        mock_session: AsyncMock,
+        mock_result: AsyncMock,
+        connection_config: ConnectionConfig,
+    ) -> None:
+        mock_result.scalar_one.return_value = "public"
+        mock_result.keys.return_value = ["id"]
+        mock_result.all.return_value = [(1,)]
+        session_provider = MockSessionProvider(object(), mock_session)
+        session_provider._config = connection_config.model_copy(
+            update={"query_cache_ttl_s": 30.0}
+        )
+        provider = DatabaseProvider(session_provider)
+
+        await provider.run_query("SELECT id FROM t")
+        await provider.run_query("SELECT id FROM t")
+        assert mock_session.execute.await_count == 2
+
+        first = await provider.run_query("SELECT id FROM t", cache=True)
+        cached = await provider.run_query("SELECT id FROM t", cache=True)
+        assert cached is first
+        # search_path lookup plus one query.
+        assert mock_session.execute.await_count == 4
+
+        await provider.run_query("SELECT id FROM t", cache=True, refresh=True)
+        assert mock_session.execute.await_count == 5
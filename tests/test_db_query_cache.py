@@ -0,0 +1,84 @@
+import sys
+
+from inspector.db.query_cache import QueryCache
+from inspector.db.result import QueryResult
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(rows: int) -> QueryResult:
+    return QueryResult.from_rows(["id", "name"], [(i, f"row {i}") for i in range(rows)])
+
+
+def _cache(ttl: float = 60.0, max_bytes: int = 10**9) -> tuple[QueryCache, _Clock]:
+    clock = _Clock()
+    cache = QueryCache(ttl, max_bytes, clock=clock)
+    cache.search_path = '"$user", public'
+    return cache, clock
+
+
+class TestQueryCacheKeys:
+    def test_equivalent_spellings_share_a_key(self) -> None:
+        cache, _ = _cache()
+        assert cache.key("select *\n  from t -- latest\n;") == cache.key("SELECT * FROM t")
+        assert cache.key("SELECT 'a'") != cache.key("SELECT 'A'")
+
+    def test_search_path_and_params_are_part_of_the_key(self) -> None:
+        cache, _ = _cache()
+        key = cache.key("SELECT 1", {"a": 1})
+        assert key != cache.key("SELECT 1", {"a": 2})
+        cache.search_path = "audit"
+        assert key != cache.key("SELECT 1", {"a": 1})
+
+    def test_no_key_without_search_path_or_hashable_params(self) -> None:
+        cache = QueryCache(60.0)
+        assert cache.key("SELECT 1") is None
+        cache.search_path = "public"
+        assert cache.key("SELECT 1", {"ids": [1, 2]}) is None
+
+
+class TestQueryCacheEntries:
+    def test_entries_expire_after_their_ttl(self) -> None:
+        cache, clock = _cache(ttl=30.0)
+        key, short = cache.key("SELECT 1"), cache.key("SELECT 2")
+        assert key is not None and short is not None
+        cache.put(key, _result(3))
+        cache.put(short, _result(3), ttl=5.0)
+        clock.now += 10
+        assert cache.get(short) is None
+        entry = cache.get(key)
+        assert entry is not None and entry.age(clock.now) == 10
+        clock.now += 20
+        assert cache.get(key) is None
+        assert len(cache) == 0 and cache.bytes == 0
+
+    def test_evicts_least_recently_used_to_stay_under_bytes(self) -> None:
+        size = sys.getsizeof(_result(100))
+        cache, _ = _cache(max_bytes=size * 2 + size // 2)
+        keys = [cache.key(f"SELECT {i}") for i in range(3)]
+        assert all(k is not None for k in keys)
+        cache.put(keys[0], _result(100))
+        cache.put(keys[1], _result(100))
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], _result(100))
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.bytes <= cache.max_bytes
+
+    def test_skips_results_larger_than_the_cache(self) -> None:
+        cache, _ = _cache(max_bytes=1024)
+        key = cache.key("SELECT big")
+        assert key is not None
+        assert cache.put(key, _result(1000)) is None
+        assert len(cache) == 0
+
+    def test_packed_columns_keep_entries_small(self) -> None:
+        numbers = QueryResult.from_rows(["n"], [(i,) for i in range(10_000)])
+        objects = QueryResult.from_rows(["n"], [(str(i),) for i in range(10_000)])
+        assert sys.getsizeof(numbers) * 4 < sys.getsizeof(objects)
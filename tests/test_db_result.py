@@ -0,0 +1,96 @@
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from inspector.db.result import QueryResult, TypedColumn
+
+
+def _measure(build: Any) -> tuple[Any, int]:
+    tracemalloc.start()
+    try:
+        value = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+class TestQueryResult:
+    def test_from_rows_exposes_tuple_rows_and_columns(self) -> None:
+        result = QueryResult.from_rows(["id", "name"], [(1, "a"), (2, "b")])
+        assert result.columns == ["id", "name"]
+        assert len(result) == 2
+        assert result[0] == (1, "a")
+        assert result[-1] == (2, "b")
+        assert list(result) == [(1, "a"), (2, "b")]
+        assert result.column_index == {"id": 0, "name": 1}
+        assert result.to_dicts() == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    @pytest.mark.parametrize(
+        ("values", "typecode"),
+        [([1, 2, 3], "q"), ([1.5, None, 2.5], "d"), ([None, 7], "q")],
+    )
+    def test_packs_numeric_columns_into_typed_arrays(
+        self, values: list[Any], typecode: str
+    ) -> None:
+        result = QueryResult.from_rows(["v"], [(v,) for v in values])
+        column = result._data[0]
+        assert isinstance(column, TypedColumn)
+        assert column.typecode == typecode
+        assert result.column("v") == values
+
+    @pytest.mark.parametrize(
+        "values",
+        [[True, False], [1, "a"], [1, 2.5], [2**70], [None, None]],
+    )
+    def test_keeps_mixed_or_unsupported_columns_as_objects(
+        self, values: list[Any]
+    ) -> None:
+        result = QueryResult.from_rows(["v"], [(v,) for v in values])
+        assert isinstance(result._data[0], list)
+        assert result.column("v") == values
+
+    def test_slicing_shares_buffers(self) -> None:
+        result = QueryResult.from_rows(["id"], [(i,) for i in range(10)])
+        page = result[3:6]
+        assert page._data is result._data
+        assert list(page) == [(3,), (4,), (5,)]
+        assert list(page[1:]) == [(4,), (5,)]
+        assert page[0] == (3,)
+
+    def test_slice_with_step_raises(self) -> None:
+        result = QueryResult.from_rows(["id"], [(1,), (2,)])
+        with pytest.raises(ValueError, match="step"):
+            result[::2]
+
+    def test_without_columns_projects_shared_buffers(self) -> None:
+        result = QueryResult.from_rows(["a", "b", "c"], [(1, 2, 3)])
+        projected = result.without_columns("b")
+        assert projected.columns == ["a", "c"]
+        assert list(projected) == [(1, 3)]
+        assert projected._data[0] is result._data[0]
+
+    def test_reversed(self) -> None:
+        result = QueryResult.from_rows(["id"], [(1,), (2,), (3,)])
+        assert list(result.reversed()) == [(3,), (2,), (1,)]
+
+    def test_empty(self) -> None:
+        result = QueryResult.empty(["id"])
+        assert result.columns == ["id"]
+        assert not result
+        assert list(result) == []
+
+
+class TestQueryResultMemory:
+    def test_columnar_form_is_smaller_than_dict_per_row(self) -> None:
+        columns = [f"col_{i}" for i in range(12)]
+        rows = [
+            tuple(n * 1000 + i if i % 3 else f"value-{i}" for i in range(12))
+            for n in range(20_000)
+        ]
+
+        _, dict_bytes = _measure(lambda: [dict(zip(columns, row)) for row in rows])
+        _, columnar_bytes = _measure(lambda: QueryResult.from_rows(columns, rows))
+
+        assert columnar_bytes * 3 < dict_bytes, (columnar_bytes, dict_bytes)
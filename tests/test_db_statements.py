@@ -0,0 +1,127 @@
+import re
+from collections.abc import Iterator
+
+import pytest
+
+from inspector.db import statements
+from inspector.db.statements import (
+    _LEXEME_RE,
+    classify_statement,
+    ensure_read_only,
+    lex,
+    normalize_sql,
+    split_statements,
+    write_reason,
+)
+
+
+class TestLex:
+    def test_skips_literals_and_comments(self) -> None:
+        sql = (
+            "SELECT 'a;b' AS \"Odd\"\"Name\", $q$ DELETE; $$ $q$, E'it\\'s', $1 "
+            "-- DROP TABLE t\n/* outer /* inner */ still comment */ FROM t"
+        )
+        assert lex(sql) == ["SELECT", "AS", '"ODD""NAME"', "FROM", "T"]
+
+    def test_splits_on_top_level_semicolons(self) -> None:
+        statements = split_statements(lex("SELECT 1; ; select ';' ;SHOW x"))
+        assert statements == [["SELECT"], ["SELECT"], ["SHOW", "X"]]
+
+
+class TestWriteReason:
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT * FROM users",
+            "  -- leading comment\nselect 1",
+            "/* DELETE */ (SELECT 1) UNION (SELECT 2)",
+            "WITH RECURSIVE t(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM t) "
+            "SELECT n FROM t",
+            "VALUES (1), (2)",
+            "TABLE users",
+            "SHOW search_path",
+            "EXPLAIN (ANALYZE, BUFFERS) SELECT 1",
+            "SELECT $$; DELETE FROM t$$",
+            "SELECT 'x''; DROP TABLE t; --'",
+            'SELECT "update", "delete" FROM "for"',
+            "SELECT substring(name FOR 3) FROM t",
+            "SELECT 1;",
+            "",
+        ],
+    )
+    def test_read_only(self, sql: str) -> None:
+        assert write_reason(sql) is None
+
+    @pytest.mark.parametrize(
+        ("sql", "reason"),
+        [
+            ("DELETE FROM t", "DELETE statement"),
+            ("-- harmless\n/* really */ TRUNCATE t", "TRUNCATE statement"),
+            ("SELECT 1; DROP TABLE t", "DROP statement"),
+            ("SET search_path = x", "SET statement"),
+            (
+                "WITH gone AS (DELETE FROM t RETURNING *) SELECT * FROM gone",
+                "DELETE inside a WITH query",
+            ),
+            (
+                "WITH src AS MATERIALIZED (SELECT 1) UPDATE t SET a = 1",
+                "UPDATE inside a WITH query",
+            ),
+            ("SELECT * FROM t FOR UPDATE", "row-locking FOR UPDATE/SHARE clause"),
+            ("SELECT * FROM t FOR NO KEY UPDATE SKIP LOCKED", "row-locking"),
+            ("SELECT * FROM t FOR SHARE", "row-locking"),
+            ("SELECT * INTO backup FROM t", "SELECT INTO"),
+            ("EXPLAIN ANALYZE DELETE FROM t", "DELETE statement"),
+            ("SELECT E'\\''; DELETE FROM t", "DELETE statement"),
+            ("SELECT 1 /* a /* b */ c */; DELETE FROM t", "DELETE statement"),
+        ],
+    )
+    def test_writes(self, sql: str, reason: str) -> None:
+        found = write_reason(sql)
+        assert found is not None and found.startswith(reason)
+
+    def test_classifies_leading_keyword(self) -> None:
+        result = classify_statement(lex("with x as (select 1) select * from x"))
+        assert result.keyword == "WITH"
+        assert result.read_only
+
+    def test_ensure_read_only_names_the_reason(self) -> None:
+        with pytest.raises(ValueError, match=r"read-only .*FOR UPDATE"):
+            ensure_read_only("SELECT * FROM jobs FOR UPDATE")
+
+    def test_lexes_in_one_pass(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        passes: list[str] = []
+
+        class CountingPattern:
+            def findall(self, sql: str) -> list[tuple[str, str]]:
+                passes.append(sql)
+                return _LEXEME_RE.findall(sql)
+
+            def finditer(self, sql: str) -> Iterator[re.Match[str]]:
+                return _LEXEME_RE.finditer(sql)
+
+        monkeypatch.setattr(statements, "_LEXEME_RE", CountingPattern())
+        typical = (
+            "SELECT o.id, o.total, u.email FROM orders o JOIN users u ON u.id = o.user_id "
+            "WHERE o.created_at > now() - interval '1 day' ORDER BY o.id LIMIT 500"
+        )
+        large = "SELECT * FROM t WHERE " + " AND ".join(
+            f"col_{i} = 'value {i}'" for i in range(400)
+        )
+        for sql in (typical, large):
+            passes.clear()
+            assert write_reason(sql) is None
+            assert len(passes) == 1
+        # Only nested comments are cut out and lexed again.
+        passes.clear()
+        assert write_reason("SELECT /* a /* b */ c */ 1") is None
+        assert len(passes) == 2
+
+
+class TestNormalizeSql:
+    def test_collapses_code_but_keeps_literals(self) -> None:
+        assert (
+            normalize_sql("select  *\n from t -- note\n where a = 'Ab  c' /* x /* y */ */;")
+            == "SELECT * FROM T WHERE A = 'Ab  c'"
+        )
+        assert normalize_sql('SELECT "Mixed" , $$ Q $$') == 'SELECT "Mixed" , $$ Q $$'
@@ -0,0 +1,99 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from inspector.db.database import DatabaseProvider
+from inspector.db.table_stats import (
+    TableStatsSnapshot,
+    rank_tables,
+    table_stats_from_row,
+)
+from tests.conftest import MockSessionProvider
+
+
+def _row(name: str, **values: Any) -> dict[str, Any]:
+    row = {
+        "table_name": name,
+        "seq_scan": 10,
+        "seq_tup_read": 1000,
+        "idx_scan": 90,
+        "tup_written": 500,
+        "n_live_tup": 900,
+        "n_dead_tup": 100,
+        "blks_hit": 990,
+        "blks_read": 10,
+        "table_bytes": 8192 * 100,
+        "index_count": 3,
+        "unused_indexes": None,
+        "unused_index_bytes": 0,
+    }
+    row.update(values)
+    return row
+
+
+def _snapshot(taken_at: float, *rows: dict[str, Any]) -> TableStatsSnapshot:
+    tables = {row["table_name"]: table_stats_from_row(row) for row in rows}
+    return TableStatsSnapshot("public", tables, taken_at)
+
+
+class TestTableStats:
+    def test_ratios(self) -> None:
+        stats = table_stats_from_row(_row("orders"))
+        assert stats.seq_scan_ratio == pytest.approx(0.1)
+        assert stats.cache_hit_ratio == pytest.approx(0.99)
+        assert stats.dead_ratio == pytest.approx(0.1)
+        assert stats.bloat_bytes == 8192 * 10
+
+    def test_ratios_without_activity(self) -> None:
+        empty = _row(
+            "empty",
+            seq_scan=0,
+            idx_scan=0,
+            blks_hit=0,
+            blks_read=0,
+            n_live_tup=0,
+            n_dead_tup=0,
+        )
+        stats = table_stats_from_row(empty)
+        assert stats.seq_scan_ratio is None
+        assert stats.cache_hit_ratio is None
+        assert stats.bloat_bytes == 0
+
+    def test_rates_between_snapshots(self) -> None:
+        before = _snapshot(100.0, _row("a"), _row("b"), _row("gone"))
+        after = _snapshot(
+            110.0,
+            _row("a", seq_scan=30, tup_written=1500, blks_read=110),
+            _row("b", seq_scan=0),
+            _row("new"),
+        )
+        rates = after.rates_since(before)
+        assert set(rates) == {"a"}
+        assert rates["a"].seq_scan == pytest.approx(2.0)
+        assert rates["a"].idx_scan == 0.0
+        assert rates["a"].tup_written == pytest.approx(100.0)
+        assert rates["a"].blks_read == pytest.approx(10.0)
+
+    def test_rank_tables(self) -> None:
+        snapshot = _snapshot(
+            0.0,
+            _row("small", seq_tup_read=10),
+            _row("hot", seq_tup_read=10_000, unused_indexes=["ix"], unused_index_bytes=1),
+            _row("idle", seq_scan=0, seq_tup_read=0, idx_scan=0),
+        )
+        assert rank_tables(snapshot, "seq_scan") == ["hot", "small", "idle"]
+        assert rank_tables(snapshot, "seq_scan_ratio") == ["hot", "small", "idle"]
+        assert rank_tables(snapshot, "unused_indexes")[0] == "hot"
+        assert rank_tables(snapshot, "write_rate") == ["hot", "idle", "small"]
+
+    @pytest.mark.asyncio
+    async def test_provider_runs_one_query_per_schema(
+        self, mock_engine: MagicMock, mock_session: AsyncMock, mock_result: MagicMock
+    ) -> None:
+        mock_result.mappings.return_value.all.return_value = [_row("a"), _row("b")]
+        provider = DatabaseProvider(MockSessionProvider(mock_engine, mock_session))
+        snapshot = await provider.table_stats("sales")
+        assert list(snapshot.tables) == ["a", "b"]
+        mock_session.execute.assert_awaited_once()
+        assert mock_session.execute.await_args.args[1] == {"schema_name": "sales"}
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from typer.testing import CliRunner
+
+from inspector.main import app
+from inspector.startup import (
+    PROBES,
+    StartupProbe,
+    heavy_imports,
+    parse_importtime,
+    trace_imports,
+)
+
+runner = CliRunner()
+
+
+# Wall-clock budgets are checked on demand with ``inspector --profile-startup``;
+# the suite only pins down which modules each path imports.
+@pytest.mark.parametrize("probe", PROBES, ids=lambda p: p.label)
+def test_startup_skips_heavy_imports(probe: StartupProbe) -> None:
+    imports = trace_imports(probe)
+    assert any(t.name == "inspector" for t in imports)
+    assert heavy_imports(probe, imports) == []
+
+
+def test_parse_importtime() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   typing\n"
+        "import time:      2500 |       2620 | inspector.main\n"
+    )
+    assert [(t.name, t.depth, t.cumulative_ms) for t in parse_importtime(output)] == [
+        ("typing", 1, 0.12),
+        ("inspector.main", 0, 2.62),
+    ]
+
+
+def test_query_rejects_mutating_sql() -> None:
+    result = runner.invoke(
+        app,
+        ["query", "DELETE FROM t", "-c", "postgresql+asyncpg://u:p@localhost/db"],
+    )
+    assert result.exit_code == 1
+    assert "read-only" in result.output
+
+
+def test_root_options_reach_subcommands(monkeypatch: pytest.MonkeyPatch) -> None:
+    from inspector import commands
+
+    run_query = AsyncMock()
+    monkeypatch.setattr(commands, "run_query", run_query)
+    result = runner.invoke(
+        app,
+        [
+            "-c",
+            "postgresql+asyncpg://u:p@localhost/db",
+            "--statement-timeout",
+            "1500",
+            "--pool-size",
+            "2",
+            "query",
+            "SELECT 1",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    config = run_query.await_args.args[0]
+    assert config.url == "postgresql+asyncpg://u:p@localhost/db"
+    assert (config.statement_timeout_ms, config.pool_size) == (1500, 2)
+
+
+def test_query_rejects_unknown_format() -> None:
+    result = runner.invoke(app, ["query", "SELECT 1", "-f", "xml"])
+    assert result.exit_code == 1